@@ -6,7 +6,9 @@ Features:
 - Reads tournament IDs from 2025.json
 - Filters tournaments by date (only scrapes tournaments < current_date - 1)
 - Skips already scraped tournaments (unless --force flag is used)
+- Refresh mode re-extracts scraped tournaments only if their pages changed (--refresh)
 - Uses multiprocessing for concurrent tournament scraping
+- In-process mode shares one browser across all tournaments (--in-process)
 - Organized output by gender/division directories
 
 Usage: 
@@ -15,24 +17,56 @@ Usage:
     python batch_scraper.py --force            # Force re-scrape existing tournaments
     python batch_scraper.py --max-workers 4   # Control number of concurrent processes
     python batch_scraper.py --date-filter 7   # Only scrape tournaments older than 7 days
+    python batch_scraper.py --in-process      # One shared browser, tournaments as asyncio tasks
+    python batch_scraper.py --backend http    # Replay recorded API requests, browser as fallback
+    python batch_scraper.py --refresh         # Re-extract scraped tournaments whose fingerprint changed
+    python batch_scraper.py --jsonl           # Also stream games/players to {id}.jsonl (see output_writer)
 """
 
 import json
 import sys
 import os
 import argparse
+import asyncio
 import subprocess
+import time
 import multiprocessing
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Any
 import concurrent.futures
 
+from playwright.async_api import async_playwright, Browser
+
+from browser_pool import PagePool, SCRAPE_BLOCKED_TYPES
+from cbva_scraper import (
+    CBVATournamentScraper, BACKENDS, UNCHANGED_EXIT_CODE,
+    setup_log_file, save_tournament_output, output_path, load_fingerprint
+)
+from page_cache import PageCache
+from page_readiness import PageReadiness
+from scrape_metrics import ScrapeMetrics
+
+TOURNAMENT_TIMEOUT = 300  # 5 minute timeout per tournament
+
 
 class BatchTournamentScraper:
-    def __init__(self, force_rescrape: bool = False, max_workers: int = 5, date_filter_days: int = 1, year: int = 2025):
+    def __init__(self, force_rescrape: bool = False, max_workers: int = 5, date_filter_days: int = 1, year: int = 2025,
+                 in_process: bool = False, page_concurrency: int = 10, backend: str = 'browser',
+                 block_resources: bool = True, use_cache: bool = True, refresh: bool = False,
+                 stream_jsonl: bool = False):
         self.force_rescrape = force_rescrape
         self.max_workers = max_workers
+        self.in_process = in_process
+        self.page_concurrency = page_concurrency
+        self.backend = backend
+        self.block_resources = block_resources
+        self.use_cache = use_cache
+        self.refresh = refresh
+        self.stream_jsonl = stream_jsonl
+        self.cache = None  # Opened for in-process runs; subprocesses open the same file
+        self.readiness = PageReadiness()  # Page timings across in-process tournaments
+        self.metrics = ScrapeMetrics()  # Page operation records across all tournaments
         self.date_filter_days = date_filter_days
         self.year = year
         self.base_dir = Path(__file__).parent
@@ -77,6 +111,8 @@ class BatchTournamentScraper:
             if not self.force_rescrape:
                 output_file = self.base_dir / "data" / gender / division / f"{tournament_id}.json"
                 if output_file.exists():
+                    if self.refresh:
+                        return True, "Refresh (fingerprint check)"
                     return False, f"Already scraped (file exists: {output_file.name})"
             
             return True, "Ready to scrape"
@@ -89,6 +125,7 @@ class BatchTournamentScraper:
         print(f"\n🔍 Filtering tournaments...")
         print(f"   Date filter: tournaments older than {self.date_filter_days} day(s)")
         print(f"   Force rescrape: {'Yes' if self.force_rescrape else 'No'}")
+        print(f"   Refresh changed: {'Yes' if self.refresh else 'No'}")
         
         valid_tournaments = []
         skipped_reasons = {}
@@ -128,16 +165,29 @@ class BatchTournamentScraper:
         try:
             # Run the scraper script
             result = subprocess.run(
-                [sys.executable, str(self.scraper_script), tournament_id],
+                [sys.executable, str(self.scraper_script), tournament_id, '--backend', self.backend]
+                + ([] if self.block_resources else ['--load-all-resources'])
+                + ([] if self.use_cache else ['--no-cache'])
+                + (['--refresh'] if self.refresh else [])
+                + (['--jsonl'] if self.stream_jsonl else []),
                 capture_output=True,
                 text=True,
-                timeout=300  # 5 minute timeout per tournament
+                timeout=TOURNAMENT_TIMEOUT
             )
             
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
             
-            if result.returncode == 0:
+            if result.returncode == UNCHANGED_EXIT_CODE:
+                print(f"⏭️  Unchanged: {tournament_id} ({duration:.1f}s fingerprint check)")
+                return {
+                    'tournament_id': tournament_id,
+                    'status': 'unchanged',
+                    'duration': duration,
+                    'output': result.stdout,
+                    'error': None
+                }
+            elif result.returncode == 0:
                 print(f"✅ Completed: {tournament_id} in {duration:.1f}s")
                 return {
                     'tournament_id': tournament_id,
@@ -176,6 +226,111 @@ class BatchTournamentScraper:
                 'error': str(e)
             }
 
+    async def scrape_tournament_async(self, browser: Browser, tournament: Dict[str, Any],
+                                      page_pool: PagePool) -> Dict[str, Any]:
+        """Scrape a single tournament in-process using the shared browser"""
+        tournament_id = tournament['id']
+        tournament_name = f"{tournament.get('gender', 'Unknown')}'s {tournament.get('division', 'Unknown')}"
+        location = tournament.get('location', 'Unknown')
+        date = tournament.get('date', 'Unknown')
+        
+        print(f"🏐 Starting: {tournament_id} ({tournament_name}) at {location} on {date}")
+        
+        start_time = datetime.now()
+        scraper = None
+        
+        try:
+            previous_fingerprint = None
+            if self.refresh:
+                previous_fingerprint = load_fingerprint(output_path(tournament, str(self.base_dir)))
+            
+            scraper = CBVATournamentScraper(tournament_id, backend=self.backend, block_resources=self.block_resources,
+                                            cache=self.cache, previous_fingerprint=previous_fingerprint,
+                                            stream_jsonl=self.stream_jsonl)
+            scraper.log_file = setup_log_file(tournament_id)
+            
+            result = await asyncio.wait_for(
+                scraper.run(browser=browser, page_pool=page_pool),
+                timeout=TOURNAMENT_TIMEOUT
+            )
+            
+            if scraper.is_unchanged():
+                duration = (datetime.now() - start_time).total_seconds()
+                print(f"⏭️  Unchanged: {tournament_id} ({duration:.1f}s fingerprint check)")
+                return {
+                    'tournament_id': tournament_id,
+                    'status': 'unchanged',
+                    'duration': duration,
+                    'output': '',
+                    'error': None
+                }
+
+            json_file = save_tournament_output(result, scraper.log_file)
+            
+            duration = (datetime.now() - start_time).total_seconds()
+            print(f"✅ Completed: {tournament_id} in {duration:.1f}s")
+            return {
+                'tournament_id': tournament_id,
+                'status': 'success',
+                'duration': duration,
+                'output': json_file,
+                'error': None
+            }
+            
+        except asyncio.TimeoutError:
+            print(f"⏰ Timeout: {tournament_id} (exceeded 5 minutes)")
+            return {
+                'tournament_id': tournament_id,
+                'status': 'timeout',
+                'duration': TOURNAMENT_TIMEOUT,
+                'output': '',
+                'error': 'Scrape timed out after 5 minutes'
+            }
+        except Exception as e:
+            print(f"💥 Exception: {tournament_id} - {str(e)}")
+            return {
+                'tournament_id': tournament_id,
+                'status': 'exception',
+                'duration': (datetime.now() - start_time).total_seconds(),
+                'output': '',
+                'error': str(e)
+            }
+        finally:
+            # Failed and timed-out runs count in the readiness and page operation summaries too
+            if scraper is not None:
+                self.readiness.merge(scraper.readiness)
+                self.metrics.merge(scraper.metrics)
+
+    async def run_batch_scraping_in_process(self, tournaments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Scrape tournaments as asyncio tasks sharing one browser.
+        
+        max_workers caps tournaments in flight and page_concurrency sizes the
+        pool of reusable pool/team pages shared by all of them, so Chromium
+        start-up and the Playwright import are paid once per batch instead of
+        per tournament.
+        """
+        tournament_limit = asyncio.Semaphore(self.max_workers)
+        if self.use_cache:
+            self.cache = PageCache()
+        
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page_pool = PagePool(browser, self.page_concurrency,
+                                 SCRAPE_BLOCKED_TYPES if self.block_resources else ())
+            
+            async def scrape_with_limit(tournament):
+                async with tournament_limit:
+                    return await self.scrape_tournament_async(browser, tournament, page_pool)
+            
+            try:
+                return await asyncio.gather(*[scrape_with_limit(t) for t in tournaments])
+            finally:
+                await page_pool.close()
+                await browser.close()
+                if self.cache:
+                    self.cache.close()
+
     def run_batch_scraping(self, tournaments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Run batch scraping using multiprocessing"""
         if not tournaments:
@@ -185,11 +340,19 @@ class BatchTournamentScraper:
         print(f"\n🚀 Starting batch scraping:")
         print(f"   Tournaments to process: {len(tournaments)}")
         print(f"   Max concurrent workers: {self.max_workers}")
+        if self.in_process:
+            print(f"   Mode: in-process (shared browser, {self.page_concurrency} concurrent pages)")
         print(f"   Estimated time: {len(tournaments) * 45 / self.max_workers / 60:.1f} minutes")
         print(f"\n" + "="*60)
         
+        if self.in_process:
+            return asyncio.run(self.run_batch_scraping_in_process(tournaments))
+        
         results = []
         
+        # Metrics files older than this are left over from earlier runs
+        batch_started = time.time()
+        
         # Use ProcessPoolExecutor for multiprocessing
         with concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers) as executor:
             # Submit all tournaments for processing
@@ -213,6 +376,7 @@ class BatchTournamentScraper:
                         'output': '',
                         'error': str(e)
                     })
+                self.metrics.merge(ScrapeMetrics.load(tournament['id'], since=batch_started))
         
         return results
 
@@ -222,7 +386,8 @@ class BatchTournamentScraper:
             return
         
         successful = [r for r in results if r['status'] == 'success']
-        failed = [r for r in results if r['status'] != 'success']
+        unchanged = [r for r in results if r['status'] == 'unchanged']
+        failed = [r for r in results if r['status'] not in ('success', 'unchanged')]
         total_duration = sum(r['duration'] for r in results)
         avg_duration = total_duration / len(results) if results else 0
         
@@ -230,6 +395,8 @@ class BatchTournamentScraper:
         print(f"📊 BATCH SCRAPING SUMMARY")
         print(f"="*60)
         print(f"✅ Successful: {len(successful)}")
+        if self.refresh:
+            print(f"⏭️  Unchanged: {len(unchanged)}")
         print(f"❌ Failed: {len(failed)}")
         print(f"⏱️  Total time: {total_duration:.1f}s")
         print(f"📈 Average per tournament: {avg_duration:.1f}s")
@@ -243,6 +410,14 @@ class BatchTournamentScraper:
             print(f"\n✅ Successfully scraped tournaments:")
             for result in successful:
                 print(f"   • {result['tournament_id']} ({result['duration']:.1f}s)")
+        
+        if self.readiness.timings:
+            print(f"\n⏱️  Page readiness (time to ready):")
+            self.readiness.print_summary(file=sys.stdout)
+        
+        if self.metrics.records:
+            print(f"\n📏 Page operations by type (records in metrics/):")
+            self.metrics.print_summary(file=sys.stdout)
 
     def run(self, dry_run: bool = False) -> None:
         """Main batch scraping workflow"""
@@ -291,6 +466,20 @@ def main():
                        help='Only scrape tournaments older than N days (default: 1)')
     parser.add_argument('--dry-run', action='store_true',
                        help='Show what would be scraped without actually scraping')
+    parser.add_argument('--in-process', action='store_true',
+                       help='Scrape in this process with one shared browser instead of a subprocess per tournament')
+    parser.add_argument('--page-concurrency', type=int, default=10,
+                       help='Reusable pool/team pages shared by all tournaments in --in-process mode (default: 10)')
+    parser.add_argument('--load-all-resources', action='store_true',
+                       help='Load images, fonts, stylesheets and analytics instead of blocking them')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always load team/player pages instead of using the on-disk page cache')
+    parser.add_argument('--refresh', action='store_true',
+                       help='Re-check scraped tournaments and re-extract only those whose pools/bracket changed')
+    parser.add_argument('--jsonl', action='store_true',
+                       help='Also stream each tournament\'s games and players to a .jsonl file while scraping')
+    parser.add_argument('--backend', choices=BACKENDS, default='browser',
+                       help='Fetch backend; http replays recorded API requests with browser fallback (default: browser)')
     
     args = parser.parse_args()
     
@@ -304,7 +493,14 @@ def main():
         force_rescrape=args.force,
         max_workers=args.max_workers,
         date_filter_days=args.date_filter,
-        year=args.year
+        year=args.year,
+        in_process=args.in_process,
+        page_concurrency=max(args.page_concurrency, 1),
+        backend=args.backend,
+        block_resources=not args.load_all_resources,
+        use_cache=not args.no_cache,
+        refresh=args.refresh,
+        stream_jsonl=args.jsonl
     )
     
     scraper.run(dry_run=args.dry_run)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+CBVA Browser Pool - Reusable, resource-blocking browser pages for scraping
+
+Scraping only needs the DOM the WASM app renders, so images, fonts, media and
+analytics requests are aborted before they leave the browser. Pages are kept
+in a bounded pool and reused across pool/team tasks, instead of each task
+opening (and tearing down) a fresh browser context.
+"""
+
+import asyncio
+import re
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, List, Optional, Sequence
+
+from playwright.async_api import Browser, BrowserContext, Page, Route
+
+# Resource types never needed for scraping
+SCRAPE_BLOCKED_TYPES = ('image', 'font', 'media', 'stylesheet')
+
+# Pages parsed through innerText need stylesheets: without them hidden
+# (e.g. mobile-only) elements become visible and line breaks change
+TEXT_BLOCKED_TYPES = ('image', 'font', 'media')
+
+# Third-party analytics/tracking hosts
+BLOCKED_URL_PATTERN = re.compile(
+    r'google-analytics\.com|googletagmanager\.com|doubleclick\.net|facebook\.(net|com)/tr|'
+    r'connect\.facebook\.net|hotjar\.com|segment\.(io|com)|mixpanel\.com|plausible\.io|'
+    r'clarity\.ms|sentry\.io|intercom\.io'
+)
+
+DEFAULT_POOL_SIZE = 10
+
+
+async def apply_resource_blocking(context: BrowserContext,
+                                  blocked_types: Sequence[str] = SCRAPE_BLOCKED_TYPES) -> None:
+    """Abort requests for blocked resource types and analytics hosts in a context"""
+    blocked = frozenset(blocked_types)
+
+    async def handle_route(route: Route):
+        request = route.request
+        if request.resource_type in blocked or BLOCKED_URL_PATTERN.search(request.url):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route('**/*', handle_route)
+
+
+class PagePool:
+    """
+    Bounded pool of reusable pages, each in its own resource-blocking context.
+
+    At most `size` pages exist at once; tasks wait for a free page, so the
+    pool size also caps concurrent page loads (shared across tournaments in
+    batch mode).
+    """
+
+    def __init__(self, browser: Browser, size: int = DEFAULT_POOL_SIZE,
+                 blocked_types: Sequence[str] = SCRAPE_BLOCKED_TYPES,
+                 on_new_page: Optional[Callable[[Page], None]] = None):
+        """
+        Args:
+            browser: Browser to open contexts in
+            size: Maximum number of pages (and concurrent page tasks)
+            blocked_types: Resource types to abort (empty to load everything)
+            on_new_page: Called once for each page the pool creates
+        """
+        self.browser = browser
+        self.size = size
+        self.blocked_types = tuple(blocked_types)
+        self.on_new_page = on_new_page
+        self.idle: asyncio.Queue = asyncio.Queue()
+        self.contexts: List[BrowserContext] = []
+        self.slots = asyncio.Semaphore(size)
+
+    async def create_page(self) -> Page:
+        """Open a new context and page with resource blocking applied"""
+        context = await self.browser.new_context()
+        if self.blocked_types:
+            await apply_resource_blocking(context, self.blocked_types)
+        self.contexts.append(context)
+
+        page = await context.new_page()
+        if self.on_new_page:
+            self.on_new_page(page)
+        return page
+
+    async def discard(self, page: Page) -> None:
+        """Close a page's context (after a crash or failed navigation)"""
+        context = page.context
+        if context in self.contexts:
+            self.contexts.remove(context)
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """Borrow a page for one task; waits while all pages are in use"""
+        async with self.slots:
+            page = self.idle.get_nowait() if not self.idle.empty() else await self.create_page()
+            healthy = True
+            try:
+                yield page
+            except BaseException:
+                # Includes cancellation (tournament timeouts): the page may be mid-navigation
+                healthy = False
+                raise
+            finally:
+                if healthy and not page.is_closed():
+                    # Leave the page blank so it stops running the previous app
+                    try:
+                        await page.goto('about:blank')
+                        self.idle.put_nowait(page)
+                    except Exception:
+                        await self.discard(page)
+                else:
+                    await self.discard(page)
+
+    async def close(self) -> None:
+        """Close every context the pool opened"""
+        for context in list(self.contexts):
+            try:
+                await context.close()
+            except Exception:
+                pass
+        self.contexts.clear()
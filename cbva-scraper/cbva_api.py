@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+CBVA API Backend - Fetches tournament data over plain HTTP instead of a headless browser
+
+The CBVA site is a WASM app that renders pages from data requests (XHR/fetch).
+ApiRecorder captures those requests once through Playwright network interception
+and saves them as URL templates in data/api_manifest.json. HttpTournamentFetcher
+replays the templates for any tournament with requests and decodes the JSON
+responses into the scraper's games/teams/players structures.
+
+Payloads that cannot be decoded (binary or unrecognised JSON) raise
+UnsupportedPayload so the caller can fall back to the browser scraper.
+
+Usage:
+    python cbva_scraper.py <tournament_id> --record-api    # Record endpoints while scraping
+    python cbva_scraper.py <tournament_id> --backend http  # Replay them over HTTP
+"""
+
+import json
+import os
+import re
+import sys
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+from playwright.async_api import Page, Response
+
+MANIFEST_FILE = 'data/api_manifest.json'
+SAMPLES_DIR = 'data/api_samples'
+
+# Page types the scraper loads, and the site URL pattern of each
+PAGE_TYPES = ('tournament', 'pool', 'team', 'bracket')
+PAGE_PATTERNS = (
+    ('pool', re.compile(r'/t/(?P<tournament_id>[^/]+)/pools/(?P<pool>[^/?#]+)')),
+    ('team', re.compile(r'/t/(?P<tournament_id>[^/]+)/teams/(?P<team_id>[^/?#]+)')),
+    ('bracket', re.compile(r'/t/(?P<tournament_id>[^/]+)/playoffs')),
+    ('tournament', re.compile(r'/t/(?P<tournament_id>[^/?#]+)')),
+)
+
+# Pool letters probed when a pool endpoint is templated on the pool letter
+POOL_LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+# Key aliases used to recognise records in decoded JSON
+TEAM_1_KEYS = ('team_1_id', 'team1_id', 'team_1', 'team1', 'home_team_id', 'home_team', 'home')
+TEAM_2_KEYS = ('team_2_id', 'team2_id', 'team_2', 'team2', 'away_team_id', 'away_team', 'away')
+SCORE_1_KEYS = ('team_1_score', 'team1_score', 'score_1', 'score1', 'home_score')
+SCORE_2_KEYS = ('team_2_score', 'team2_score', 'score_2', 'score2', 'away_score')
+SETS_KEYS = ('sets', 'games', 'scores')
+STAGE_KEYS = ('stage', 'round', 'round_name')
+USERNAME_KEYS = ('cbva_username', 'username', 'user_name', 'handle', 'slug')
+NAME_KEYS = ('name', 'full_name', 'display_name')
+
+
+class UnsupportedPayload(Exception):
+    """Raised when a response cannot be decoded into scraper structures"""
+
+
+def _normalize_key(key: str) -> str:
+    """camelCase / kebab-case -> snake_case"""
+    key = re.sub(r'(?<=[a-z0-9])([A-Z])', r'_\1', key)
+    return key.replace('-', '_').lower()
+
+
+def _get(record: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    """First value in record for any of the key aliases"""
+    normalized = {_normalize_key(k): v for k, v in record.items()}
+    for key in keys:
+        if normalized.get(key) is not None:
+            return normalized[key]
+    return None
+
+
+def _walk(obj: Any) -> Iterator[Dict[str, Any]]:
+    """Yield every dict in a decoded JSON document"""
+    if isinstance(obj, dict):
+        yield obj
+        for value in obj.values():
+            yield from _walk(value)
+    elif isinstance(obj, list):
+        for value in obj:
+            yield from _walk(value)
+
+
+def _ref_id(value: Any) -> Optional[str]:
+    """Team/player reference -> id (accepts plain ids, {'id': ...} objects and /teams/ hrefs)"""
+    if isinstance(value, dict):
+        value = value.get('id') or value.get('href')
+    if value is None or isinstance(value, (list, bool)):
+        return None
+    value = str(value)
+    if '/teams/' in value:
+        value = value.split('/teams/')[1]
+    return value.strip('/') or None
+
+
+def template_url(url: str, ids: Dict[str, str]) -> str:
+    """
+    Replace ids in a recorded URL with {placeholders}.
+
+    Only whole path segments and query values are replaced, so a pool letter
+    such as 'a' never matches inside a longer segment.
+    """
+    values = {value: f"{{{name}}}" for name, value in ids.items() if value}
+    parts = urlsplit(url)
+    path = '/'.join(values.get(segment, segment) for segment in parts.path.split('/'))
+    query = [(key, values.get(value, value)) for key, value in parse_qsl(parts.query, keep_blank_values=True)]
+    templated = urlunsplit((parts.scheme, parts.netloc, path, urlencode(query, safe='{}'), ''))
+    return templated.replace('%7B', '{').replace('%7D', '}')
+
+
+def classify_page_url(url: str) -> Tuple[Optional[str], Dict[str, str]]:
+    """Site page URL -> (page type, ids in the URL)"""
+    for page_type, pattern in PAGE_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            return page_type, match.groupdict()
+    return None, {}
+
+
+def load_manifest(path: str = MANIFEST_FILE) -> Optional[Dict[str, Any]]:
+    """Load recorded endpoint templates, or None if nothing has been recorded"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+    if not any(manifest.get('endpoints', {}).get(page_type) for page_type in PAGE_TYPES):
+        return None
+    return manifest
+
+
+class ApiRecorder:
+    """Captures the data requests the WASM app makes while the browser scraper runs"""
+
+    def __init__(self, tournament_id: str):
+        self.tournament_id = tournament_id
+        self.endpoints: Dict[str, Dict[str, Dict[str, Any]]] = {page_type: {} for page_type in PAGE_TYPES}
+        self.samples: List[Tuple[str, str, bytes]] = []
+        self.pending: List[asyncio.Task] = []
+
+    def attach(self, page: Page) -> None:
+        """Record XHR/fetch responses made by this page, filed under the page type being viewed"""
+        def on_response(response: Response):
+            if response.request.resource_type not in ('xhr', 'fetch'):
+                return
+            page_type, ids = classify_page_url(page.url)
+            if page_type is not None:
+                self.pending.append(asyncio.ensure_future(self.capture(response, page_type, ids)))
+
+        page.on('response', on_response)
+
+    async def capture(self, response: Response, page_type: str, ids: Dict[str, str]) -> None:
+        """Store the endpoint template and a payload sample"""
+        try:
+            body = await response.body()
+        except Exception:
+            return
+
+        url = template_url(response.url, ids)
+        content_type = response.headers.get('content-type', '').split(';')[0]
+        self.endpoints[page_type][url] = {
+            'url': url,
+            'method': response.request.method,
+            'content_type': content_type,
+            'status': response.status
+        }
+        self.samples.append((page_type, url, body))
+
+    async def save(self, path: str = MANIFEST_FILE) -> str:
+        """Merge captured endpoints into the manifest and write payload samples for decoder work"""
+        if self.pending:
+            await asyncio.gather(*self.pending, return_exceptions=True)
+
+        manifest = load_manifest(path) or {'endpoints': {page_type: [] for page_type in PAGE_TYPES}}
+        for page_type, endpoints in self.endpoints.items():
+            known = {e['url']: e for e in manifest['endpoints'].get(page_type, [])}
+            known.update(endpoints)
+            manifest['endpoints'][page_type] = list(known.values())
+        manifest['recorded_at'] = datetime.now().isoformat()
+        manifest['recorded_from'] = self.tournament_id
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        sample_dir = os.path.join(SAMPLES_DIR, self.tournament_id)
+        os.makedirs(sample_dir, exist_ok=True)
+        for i, (page_type, url, body) in enumerate(self.samples):
+            with open(os.path.join(sample_dir, f"{i:03d}_{page_type}.bin"), 'wb') as f:
+                f.write(body)
+
+        print(f"  📼 Recorded {sum(len(e) for e in self.endpoints.values())} endpoints to {path}", file=sys.stderr)
+        return path
+
+
+def decode_games(payload: Any, tournament_id: str, stage: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Find match records (two team refs plus scores) and expand them into one game per set.
+
+    Pool games pass their stage ('Pool A'); playoff games take it from the record's round.
+    """
+    games = []
+
+    for record in _walk(payload):
+        team_1_id = _ref_id(_get(record, TEAM_1_KEYS))
+        team_2_id = _ref_id(_get(record, TEAM_2_KEYS))
+        if not team_1_id or not team_2_id or team_1_id == team_2_id:
+            continue
+
+        # Scores are either one pair on the record or a list of per-set pairs
+        sets = _get(record, SETS_KEYS)
+        if isinstance(sets, list) and sets and all(isinstance(s, dict) for s in sets):
+            pairs = [(_get(s, SCORE_1_KEYS), _get(s, SCORE_2_KEYS)) for s in sets]
+        else:
+            pairs = [(_get(record, SCORE_1_KEYS), _get(record, SCORE_2_KEYS))]
+        pairs = [(int(a), int(b)) for a, b in pairs if isinstance(a, (int, float)) and isinstance(b, (int, float))]
+        if not pairs:
+            continue
+
+        game_stage = stage
+        if game_stage is None:
+            game_stage = _get(record, STAGE_KEYS)
+            game_stage = game_stage if isinstance(game_stage, str) else 'Playoffs'
+        for game_num, (team_1_score, team_2_score) in enumerate(pairs, 1):
+            games.append({
+                'tournament_id': tournament_id,
+                # Pool games are always numbered; playoff games only when best of 3
+                'stage': f"{game_stage} - Game {game_num}" if stage or len(pairs) > 1 else game_stage,
+                'team_1_id': team_1_id,
+                'team_2_id': team_2_id,
+                'team_1_score': team_1_score,
+                'team_2_score': team_2_score,
+                'winning_team_id': team_1_id if team_1_score > team_2_score else team_2_id
+            })
+
+    return games
+
+
+def decode_players(payload: Any, team_id: str) -> List[Dict[str, Any]]:
+    """Find player records (username plus name) on a team payload"""
+    players = {}
+
+    for record in _walk(payload):
+        username = _get(record, USERNAME_KEYS)
+        name = _get(record, NAME_KEYS)
+        if name is None and _get(record, ('first_name',)) is not None:
+            name = f"{_get(record, ('first_name',))} {_get(record, ('last_name',)) or ''}".strip()
+        if not isinstance(username, str) or not isinstance(name, str):
+            continue
+
+        username = username.replace('/p/', '').strip('/')
+        name = re.sub(r'\s*\([A-Z]+\)\s*$', '', name).strip()
+        players.setdefault(username, {
+            'cbva_username': username,
+            'name': name,
+            'href': f"/p/{username}",
+            'team_id': team_id
+        })
+
+    return list(players.values())
+
+
+class HttpTournamentFetcher:
+    """Replays recorded endpoint templates for a tournament over plain HTTP"""
+
+    def __init__(self, tournament_id: str, manifest: Dict[str, Any],
+                 session: Optional[requests.Session] = None, timeout: float = 10.0, max_workers: int = 8):
+        self.tournament_id = tournament_id
+        self.endpoints = manifest['endpoints']
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.max_workers = max_workers
+
+    def fetch(self, page_type: str, **ids: str) -> List[Any]:
+        """
+        Fetch and decode every endpoint recorded for a page type.
+
+        Returns an empty list when any endpoint 404s (e.g. a pool that does
+        not exist); raises UnsupportedPayload for non-JSON responses.
+        """
+        payloads = []
+        for endpoint in self.endpoints.get(page_type, []):
+            try:
+                url = endpoint['url'].format(tournament_id=self.tournament_id, **ids)
+            except (KeyError, IndexError, ValueError) as e:
+                raise UnsupportedPayload(f"Bad {page_type} endpoint template {endpoint.get('url')!r}: {e!r}")
+            response = self.session.request(endpoint.get('method', 'GET'), url, timeout=self.timeout)
+            if response.status_code == 404:
+                return []
+            response.raise_for_status()
+            try:
+                payloads.append(response.json())
+            except ValueError:
+                raise UnsupportedPayload(f"{page_type} endpoint returned {response.headers.get('content-type')}: {url}")
+        return payloads
+
+    def endpoints_templated(self, page_type: str, placeholder: str) -> bool:
+        """
+        True if endpoints are recorded for the page type and every one contains the placeholder.
+
+        An untemplated endpoint (a tournament-wide call made by the same page)
+        would return the same payload for every pool or team.
+        """
+        endpoints = self.endpoints.get(page_type, [])
+        return bool(endpoints) and all(placeholder in e.get('url', '') for e in endpoints)
+
+    def fetch_pools(self) -> Dict[str, List[Any]]:
+        """Pool letter -> payloads, probing letters until the first missing pool"""
+        if not self.endpoints_templated('pool', '{pool}'):
+            raise UnsupportedPayload("Pool endpoints are missing or not templated on {pool}")
+
+        pools = {}
+        for letter in POOL_LETTERS:
+            payloads = self.fetch('pool', pool=letter)
+            if not payloads or not any(decode_games(p, self.tournament_id, f"Pool {letter.upper()}") for p in payloads):
+                break
+            pools[letter] = payloads
+        return pools
+
+    def scrape(self) -> Dict[str, Any]:
+        """
+        Scrape a tournament into {'games', 'teams', 'players'} scraper structures.
+
+        Raises UnsupportedPayload if pools or team rosters cannot be decoded,
+        including unexpected payload shapes that break the decoders.
+        """
+        try:
+            return self.decode_tournament()
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            raise UnsupportedPayload(f"Could not decode payloads: {e!r}") from e
+
+    def decode_tournament(self) -> Dict[str, Any]:
+        """Fetch and decode pools, team rosters and the bracket (see scrape)"""
+        games: List[Dict[str, Any]] = []
+        teams: Dict[str, Dict[str, Any]] = {}
+        players: Dict[str, Dict[str, Any]] = {}
+
+        for letter, payloads in self.fetch_pools().items():
+            stage = f"Pool {letter.upper()}"
+            for payload in payloads:
+                pool_games = decode_games(payload, self.tournament_id, stage)
+                games.extend(pool_games)
+                for game in pool_games:
+                    for team_id in (game['team_1_id'], game['team_2_id']):
+                        teams.setdefault(team_id, {
+                            'id': team_id,
+                            'href': f"/t/{self.tournament_id}/teams/{team_id}",
+                            'pool': letter.upper()
+                        })
+
+        if not games:
+            raise UnsupportedPayload("No pool games decoded")
+
+        if not self.endpoints_templated('team', '{team_id}'):
+            raise UnsupportedPayload("Team endpoints are missing or not templated on {team_id}")
+
+        # Team rosters are independent requests - fetch them in parallel
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            team_payloads = list(executor.map(lambda team_id: self.fetch('team', team_id=team_id), teams))
+
+        for team_id, payloads in zip(teams, team_payloads):
+            team_players = [p for payload in payloads for p in decode_players(payload, team_id)]
+            if not team_players:
+                raise UnsupportedPayload(f"No players decoded for team {team_id}")
+            for player in team_players:
+                players.setdefault(player['cbva_username'], player)
+
+        for payload in self.fetch('bracket'):
+            games.extend(g for g in decode_games(payload, self.tournament_id)
+                         if g['team_1_id'] in teams and g['team_2_id'] in teams)
+
+        return {'games': games, 'teams': teams, 'players': players}
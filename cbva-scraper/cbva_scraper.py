@@ -3,27 +3,82 @@
 CBVA Tournament Scraper - Extracts matches and creates datasets for Supabase import
 Outputs are organized into:
   - log/ folder for log files
+  - metrics/ folder for per-page timing records (see scrape_metrics)
   - data/{tournament_id}/ folder for JSON and CSV files
 
-Usage: python cbva_scraper.py <tournament_id>
+Usage: python cbva_scraper.py <tournament_id> [--backend browser|http] [--record-api]
+                              [--page-pool-size N] [--load-all-resources] [--no-cache] [--refresh] [--jsonl]
 """
 
 import json
 import sys
-import re
 import asyncio
 import os
 import glob
+import argparse
+import hashlib
+import time
 from datetime import datetime
-from typing import Dict, List, Any
-from playwright.async_api import async_playwright, Page
+from typing import Callable, Dict, List, Any, Optional
+import requests
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from browser_pool import PagePool, DEFAULT_POOL_SIZE, SCRAPE_BLOCKED_TYPES, TEXT_BLOCKED_TYPES, apply_resource_blocking
+from cbva_api import ApiRecorder, HttpTournamentFetcher, UnsupportedPayload, load_manifest
+from page_cache import PageCache
+from output_writer import JsonlStreamWriter
+from page_readiness import PageReadiness
+from playoff_parser import clean_player_name, parse_playoff_text
+from scrape_metrics import ScrapeMetrics
+
+BACKENDS = ('browser', 'http')
+
+# Player ratings change over a season; team rosters are fixed once a tournament is played
+PLAYER_RATING_TTL_SECONDS = 7 * 24 * 3600
+
+# Exit code for --refresh when the tournament's fingerprint is unchanged
+UNCHANGED_EXIT_CODE = 3
+
+# Players on a fully rendered team roster (rosters with fewer aren't cached)
+MIN_TEAM_PLAYERS = 2
+
+# Extra attempts for navigations that fail outright (not timeouts)
+NAVIGATION_RETRIES = 1
+
+# Extra attempts for pool probes that raise; a probe that keeps failing fails the scrape
+PROBE_RETRIES = 1
+
+
+def content_hash(data: Any) -> str:
+    """Short stable hash of JSON-serializable data or text"""
+    text = data if isinstance(data, str) else json.dumps(data, sort_keys=True)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
 
 
 class CBVATournamentScraper:
-    def __init__(self, tournament_id: str):
+    def __init__(self, tournament_id: str, backend: str = 'browser', record_api: bool = False,
+                 page_pool_size: int = DEFAULT_POOL_SIZE, block_resources: bool = True,
+                 cache: Optional[PageCache] = None, previous_fingerprint: Optional[Dict[str, Any]] = None,
+                 stream_jsonl: bool = False):
         self.tournament_id = tournament_id
+        self.backend = backend
+        self.page_pool_size = page_pool_size
+        self.block_resources = block_resources
+        self.cache = cache  # Extracted team/player page data shared across tournaments
+        self.previous_fingerprint = previous_fingerprint  # From the last output, for change detection
+        self.fingerprint: Optional[Dict[str, Any]] = None
+        self.pool_hashes: Dict[str, str] = {}
+        self.stream_jsonl = stream_jsonl  # Stream games/players to {id}.jsonl while scraping
+        self.stream: Optional[JsonlStreamWriter] = None
+        self.recorder = ApiRecorder(tournament_id) if record_api else None
+        self.page_hooks: List[Callable[[Page], None]] = []  # Extra per-page listeners (e.g. replay_harness)
+        self.readiness = PageReadiness()
+        self.metrics = ScrapeMetrics(tournament_id)
         self.BASE_URL = "https://cbva.com"
         self.log_file = None  # Will be set by main()
+        self.log_handle = None  # Opened on first log() call
+        self.pages: Optional[PagePool] = None  # Reusable pool/team pages (shared when run in a batch)
         
         # Data structures
         self.tournament_info = {}
@@ -120,349 +175,462 @@ class CBVATournamentScraper:
                 'url': f"{self.BASE_URL}/t/{self.tournament_id}/info"
             }
 
+    def attach_page(self, page: Page) -> None:
+        """Record a new page's API requests if enabled, and run any page hooks"""
+        if self.recorder:
+            self.recorder.attach(page)
+        for hook in self.page_hooks:
+            hook(page)
+
+    async def new_page(self, browser: Browser) -> tuple[BrowserContext, Page]:
+        """Open a page in a fresh context (for pages read via innerText, which need stylesheets)"""
+        context = await browser.new_context()
+        if self.block_resources:
+            await apply_resource_blocking(context, TEXT_BLOCKED_TYPES)
+        page = await context.new_page()
+        self.attach_page(page)
+        return context, page
+
+    def add_games(self, games: List[Dict[str, Any]]) -> None:
+        """Add games to the tournament data (and the JSONL stream)"""
+        self.games.extend(games)
+        if self.stream:
+            self.stream.write_games(games)
+
+    def add_player(self, username: str, player: Dict[str, Any]) -> bool:
+        """Add a player unless the username is already known; returns True if added"""
+        if username in self.players:
+            return False
+        self.players[username] = player
+        if self.stream:
+            self.stream.write_player(player)
+        return True
+
     def log(self, message: str):
         """Log message to file and stderr"""
         print(message, file=sys.stderr)
         if self.log_file:
-            with open(self.log_file, 'a') as f:
-                f.write(message + '\n')
+            if self.log_handle is None:
+                self.log_handle = open(self.log_file, 'a', buffering=1)
+            self.log_handle.write(message + '\n')
+
+    def close_log(self) -> None:
+        """Close the log file so other writers can append to it"""
+        if self.log_handle is not None:
+            self.log_handle.close()
+            self.log_handle = None
+
+    async def navigate(self, page: Page, url: str, page_type: str, wait_until: str = 'networkidle') -> None:
+        """
+        Load a page, retrying failed (non-timeout) navigations, and record time, bytes and retries
         
-    async def wait_for_wasm_content(self, page: Page, timeout: int = 10000) -> bool:
-        """Wait for WASM content to load"""
+        Bytes are the received (encoded) body sizes of requests that finished during
+        the navigation, as Playwright measured them - not Content-Length, which
+        chunked and compressed responses often omit.
+        """
+        finished = []
+        
+        def track_request(request):
+            finished.append(request)
+        
+        page.on('requestfinished', track_request)
+        start = time.perf_counter()
         try:
-            self.log(f"    🔄 Waiting for WASM content to load...")
-            
-            await page.wait_for_function(
-                """() => {
-                    const hasContent = document.body.innerText.length > 1000;
-                    const hasLinks = document.querySelectorAll('a').length > 10;
-                    return hasContent && hasLinks;
-                }""",
-                timeout=timeout
-            )
-            
-            await page.wait_for_timeout(500)
+            for attempt in range(NAVIGATION_RETRIES + 1):
+                try:
+                    await page.goto(url, wait_until=wait_until)
+                    break
+                except Exception as e:
+                    if attempt == NAVIGATION_RETRIES or isinstance(e, PlaywrightTimeoutError):
+                        elapsed_ms = (time.perf_counter() - start) * 1000
+                        self.metrics.record(page_type, 'navigate', elapsed_ms, ok=False, url=url,
+                                            bytes_transferred=await self.body_bytes(finished), retries=attempt,
+                                            error=type(e).__name__)
+                        raise
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.metrics.record(page_type, 'navigate', elapsed_ms, url=url,
+                                bytes_transferred=await self.body_bytes(finished), retries=attempt)
+        finally:
+            page.remove_listener('requestfinished', track_request)
+
+    @staticmethod
+    async def body_bytes(requests: List[Any]) -> int:
+        """Total received response body size of finished Playwright requests"""
+        sizes = await asyncio.gather(*[request.sizes() for request in requests], return_exceptions=True)
+        return sum(max(size.get('responseBodySize', 0), 0) for size in sizes if isinstance(size, dict))
+
+    async def evaluate(self, page: Page, page_type: str, script: str) -> Any:
+        """Run page.evaluate, recording its time"""
+        async with self.metrics.timed(page_type, 'evaluate', page.url):
+            return await page.evaluate(script)
+
+    async def wait_for_wasm_content(self, page: Page, page_type: str, timeout: int = 10000) -> bool:
+        """Wait for WASM content of the given page type to render (see page_readiness)"""
+        self.log(f"    🔄 Waiting for WASM content to load...")
+        start = time.perf_counter()
+        loaded = await self.readiness.wait(page, page_type, timeout=timeout)
+        self.metrics.record(page_type, 'wait', (time.perf_counter() - start) * 1000, ok=loaded, url=page.url)
+        
+        if loaded:
             self.log(f"    ✅ WASM content loaded successfully")
-            return True
-            
-        except:
+        else:
             self.log(f"    ⚠️ WASM content may not have loaded completely")
-            return False
+        return loaded
 
     # Removed extract_tournament_info method - now using tournament list metadata
 
-    async def discover_pools(self, page: Page) -> List[str]:
-        """Discover all pools in the tournament"""
-        pools = []
+    async def pool_exists(self, page: Page) -> bool:
+        """
+        Check a loaded pool page for match tables with team links
         
-        print(f"Discovering pools...", file=sys.stderr)
-        print(f"  Testing pool existence...", file=sys.stderr)
+        Reads the DOM rather than innerText: pool pages come from the page pool,
+        which blocks stylesheets, and innerText is unreliable without them.
+        """
+        team_links = await self.evaluate(page, 'pool', """
+            () => document.querySelectorAll('table a[href*="/teams/"]').length
+        """)
+        return team_links >= 2
+
+    async def probe_pool(self, pool_letter: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a pool page once and extract it; None if the pool doesn't exist
         
-        # Test pools A-Z to find which exist
-        for letter in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
-            pool_url = f"{self.BASE_URL}/t/{self.tournament_id}/pools/{letter.lower()}"
-            
+        A probe that raises is retried PROBE_RETRIES times and then re-raised:
+        discovery stops at the first missing pool, so a failed load must not
+        be mistaken for the end of the pools.
+        """
+        url = f"{self.BASE_URL}/t/{self.tournament_id}/pools/{pool_letter}"
+        
+        for attempt in range(PROBE_RETRIES + 1):
             try:
-                await page.goto(pool_url, wait_until='domcontentloaded')
-                loaded = await self.wait_for_wasm_content(page, timeout=5000)
-                
-                # Always check content, regardless of WASM loading status
-                await page.wait_for_timeout(500)  # Give page time to load
-                content = await page.evaluate("() => document.body.innerText")
-                
-                # Check various indicators that pool exists
-                if ("404" not in content and 
-                    "Page not found" not in content and
-                    len(content) > 500 and
-                    ("vs" in content or "def" in content or letter.upper() in content)):
-                    pools.append(letter.lower())
-                    print(f"  ✅ Pool {letter} exists", file=sys.stderr)
-                else:
-                    print(f"  ❌ Pool {letter} doesn't exist - stopping search", file=sys.stderr)
-                    break
+                async with self.pages.page() as page:
+                    await self.navigate(page, url, 'pool')
+                    # The probe page is also the extraction page, so give it the full extraction wait
+                    loaded = await self.wait_for_wasm_content(page, 'pool')
+                    
+                    # Always check content, regardless of WASM loading status
+                    if not await self.pool_exists(page):
+                        return None
                     
+                    print(f"  ✅ Pool {pool_letter.upper()} exists", file=sys.stderr)
+                    if not loaded:
+                        print(f"  ⚠️ Pool {pool_letter.upper()} may not have finished rendering - "
+                              f"games could be missing", file=sys.stderr)
+                    return await self.read_pool_data(page, pool_letter)
+            
             except Exception as e:
-                print(f"  ❌ Pool {letter} doesn't exist - stopping search", file=sys.stderr)
-                break
-        
-        print(f"Will process {len(pools)} pools: {', '.join([p.upper() for p in pools])}", file=sys.stderr)
-        return pools
+                print(f"  ⚠️ Probing pool {pool_letter.upper()} failed "
+                      f"(attempt {attempt + 1}/{PROBE_RETRIES + 1}): {e}", file=sys.stderr)
+                if attempt == PROBE_RETRIES:
+                    raise RuntimeError(f"Could not probe pool {pool_letter.upper()}: {e}") from e
 
-    async def extract_pool_data(self, page: Page, pool_letter: str) -> None:
-        """Extract matches and teams from a pool"""
-        url = f"{self.BASE_URL}/t/{self.tournament_id}/pools/{pool_letter}"
+    async def discover_and_extract_pools(self, window: int = 4) -> List[str]:
+        """
+        Discover and extract pools in one pass
         
-        try:
-            print(f"  Processing pool {pool_letter.upper()}: {url}", file=sys.stderr)
-            await page.goto(url, wait_until='networkidle')
-            await self.wait_for_wasm_content(page)
+        Probes `window` pool letters in parallel and extracts each pool from the
+        page loaded to probe it. Stops at the first missing letter; pools probed
+        speculatively past it are discarded.
+        """
+        pools = []
+        letters = 'abcdefghijklmnopqrstuvwxyz'
+        
+        print(f"Discovering pools ({window} at a time)...", file=sys.stderr)
+        
+        for start in range(0, len(letters), window):
+            batch = letters[start:start + window]
+            results = await asyncio.gather(*[self.probe_pool(letter) for letter in batch])
             
-            # Extract pool data using the exact working v2 approach
-            pool_data = await page.evaluate(f"""
-                () => {{
-                    const games = [];
-                    const teams = {{}};
+            for letter, result in zip(batch, results):
+                if result is None:
+                    print(f"  ❌ Pool {letter.upper()} doesn't exist - stopping search", file=sys.stderr)
+                    print(f"Processed {len(pools)} pools: {', '.join([p.upper() for p in pools])}", file=sys.stderr)
+                    return pools
+                
+                pools.append(letter)
+                self.merge_pool_result(result)
+        
+        print(f"Processed {len(pools)} pools: {', '.join([p.upper() for p in pools])}", file=sys.stderr)
+        return pools
+
+    async def read_pool_data(self, page: Page, pool_letter: str) -> Dict[str, Any]:
+        """Extract matches and teams from a loaded pool page"""
+        # Extract pool data using the exact working v2 approach
+        pool_data = await self.evaluate(page, 'pool', f"""
+            () => {{
+                const games = [];
+                const teams = {{}};
+                
+                // Find all tables except the first one (which is standings)
+                const tables = document.querySelectorAll('table');
+                
+                tables.forEach((table, tableIndex) => {{
+                    // Skip the standings table (usually the first one)
+                    if (tableIndex === 0) return;
                     
-                    // Find all tables except the first one (which is standings)
-                    const tables = document.querySelectorAll('table');
+                    const rows = table.querySelectorAll('tr');
+                    const teamSet = new Set();
+                    let scores = [];
                     
-                    tables.forEach((table, tableIndex) => {{
-                        // Skip the standings table (usually the first one)
-                        if (tableIndex === 0) return;
-                        
-                        const rows = table.querySelectorAll('tr');
-                        const teamSet = new Set();
-                        let scores = [];
-                        
-                        // Extract unique teams and scores from the table
-                        rows.forEach(row => {{
-                            // Find team links in this row
-                            const teamLinks = row.querySelectorAll('a[href*="/teams/"]');
-                            teamLinks.forEach(link => {{
-                                const href = link.getAttribute('href');
-                                const teamId = href.split('/teams/')[1];
-                                if (teamId) {{
-                                    teamSet.add(teamId);
-                                    // Store team info
-                                    if (!teams[teamId]) {{
-                                        teams[teamId] = {{
-                                            id: teamId,
-                                            href: href
-                                        }};
-                                    }}
+                    // Extract unique teams and scores from the table
+                    rows.forEach(row => {{
+                        // Find team links in this row
+                        const teamLinks = row.querySelectorAll('a[href*="/teams/"]');
+                        teamLinks.forEach(link => {{
+                            const href = link.getAttribute('href');
+                            const teamId = href.split('/teams/')[1];
+                            if (teamId) {{
+                                teamSet.add(teamId);
+                                // Store team info
+                                if (!teams[teamId]) {{
+                                    teams[teamId] = {{
+                                        id: teamId,
+                                        href: href
+                                    }};
                                 }}
-                            }});
-                            
-                            // Find scores in cells
-                            const cells = row.querySelectorAll('td');
-                            cells.forEach(cell => {{
-                                const text = cell.textContent.trim();
-                                // Match single number (score)
-                                if (/^\\d{{1,2}}$/.test(text)) {{
-                                    scores.push(parseInt(text));
-                                }}
-                            }});
+                            }}
                         }});
                         
-                        // Convert set to array
-                        const teamArray = Array.from(teamSet);
-                        
-                        // If we have exactly 2 teams and at least 2 scores, it's a match
-                        if (teamArray.length === 2 && scores.length >= 2) {{
-                            // Check if this is best of 3 (multiple score pairs)
-                            if (scores.length >= 4) {{
-                                // Best of 3 - create multiple matches
-                                for (let i = 0; i < scores.length; i += 2) {{
-                                    if (i + 1 < scores.length) {{
-                                        const gameNum = Math.floor(i / 2) + 1;
-                                        games.push({{
-                                            tournament_id: '{self.tournament_id}',
-                                            stage: 'Pool {pool_letter.upper()} - Game ' + gameNum,
-                                            team_1_id: teamArray[0],
-                                            team_2_id: teamArray[1],
-                                            team_1_score: scores[i],
-                                            team_2_score: scores[i + 1],
-                                            winning_team_id: scores[i] > scores[i + 1] ? teamArray[0] : teamArray[1]
-                                        }});
-                                    }}
-                                }}
-                            }} else {{
-                                // Single game
-                                games.push({{
-                                    tournament_id: '{self.tournament_id}',
-                                    stage: 'Pool {pool_letter.upper()} - Game 1',
-                                    team_1_id: teamArray[0],
-                                    team_2_id: teamArray[1],
-                                    team_1_score: scores[0],
-                                    team_2_score: scores[1],
-                                    winning_team_id: scores[0] > scores[1] ? teamArray[0] : teamArray[1]
-                                }});
+                        // Find scores in cells
+                        const cells = row.querySelectorAll('td');
+                        cells.forEach(cell => {{
+                            const text = cell.textContent.trim();
+                            // Match single number (score)
+                            if (/^\\d{{1,2}}$/.test(text)) {{
+                                scores.push(parseInt(text));
                             }}
-                        }}
+                        }});
                     }});
                     
-                    return {{ matches: games, teams }};
-                }}
-            """)
-            
-            # Add games to global list
-            self.games.extend(pool_data['matches'])
-            
-            # Store team info
-            for team_id, team_info in pool_data['teams'].items():
-                if team_id not in self.teams:
-                    self.teams[team_id] = {
-                        'id': team_id,
-                        'href': team_info['href'],
-                        'pool': pool_letter.upper()
-                    }
-            
-            print(f"    Found {len(pool_data['matches'])} games, {len(pool_data['teams'])} teams", file=sys.stderr)
+                    // Convert set to array
+                    const teamArray = Array.from(teamSet);
+                    
+                    // If we have exactly 2 teams and at least 2 scores, it's a match
+                    if (teamArray.length === 2 && scores.length >= 2) {{
+                        // Check if this is best of 3 (multiple score pairs)
+                        if (scores.length >= 4) {{
+                            // Best of 3 - create multiple matches
+                            for (let i = 0; i < scores.length; i += 2) {{
+                                if (i + 1 < scores.length) {{
+                                    const gameNum = Math.floor(i / 2) + 1;
+                                    games.push({{
+                                        tournament_id: '{self.tournament_id}',
+                                        stage: 'Pool {pool_letter.upper()} - Game ' + gameNum,
+                                        team_1_id: teamArray[0],
+                                        team_2_id: teamArray[1],
+                                        team_1_score: scores[i],
+                                        team_2_score: scores[i + 1],
+                                        winning_team_id: scores[i] > scores[i + 1] ? teamArray[0] : teamArray[1]
+                                    }});
+                                }}
+                            }}
+                        }} else {{
+                            // Single game
+                            games.push({{
+                                tournament_id: '{self.tournament_id}',
+                                stage: 'Pool {pool_letter.upper()} - Game 1',
+                                team_1_id: teamArray[0],
+                                team_2_id: teamArray[1],
+                                team_1_score: scores[0],
+                                team_2_score: scores[1],
+                                winning_team_id: scores[0] > scores[1] ? teamArray[0] : teamArray[1]
+                            }});
+                        }}
+                    }}
+                }});
+                
+                return {{ matches: games, teams }};
+            }}
+        """)
+        
+        print(f"    Found {len(pool_data['matches'])} games, {len(pool_data['teams'])} teams", file=sys.stderr)
+        
+        return {
+            'pool_letter': pool_letter,
+            'games': pool_data['matches'],
+            'teams': pool_data['teams']
+        }
+
+    def merge_pool_result(self, result: Dict[str, Any]) -> None:
+        """Merge one pool's games and teams into the tournament data"""
+        self.pool_hashes[result['pool_letter']] = content_hash({'games': result['games'], 'teams': result['teams']})
+
+        # Add games to global list
+        self.add_games(result['games'])
+        
+        # Store team info
+        for team_id, team_info in result['teams'].items():
+            if team_id not in self.teams:
+                self.teams[team_id] = {
+                    'id': team_id,
+                    'href': team_info['href'],
+                    'pool': result['pool_letter'].upper()
+                }
+
+    async def load_bracket_text(self, page: Page) -> str:
+        """Load the bracket page and return its text ('' if it fails to load)"""
+        url = f"{self.BASE_URL}/t/{self.tournament_id}/playoffs/bracket"
+        
+        try:
+            print(f"Processing playoffs...", file=sys.stderr)
+            print(f"  Processing playoffs: {url}", file=sys.stderr)
+            print(f"  Tournament division: {self.tournament_info.get('division', 'Unknown')}", file=sys.stderr)
+            await self.navigate(page, url, 'bracket')
+            await self.wait_for_wasm_content(page, 'bracket', timeout=15000)
             
+            # Get the full page text for analysis
+            return await self.evaluate(page, 'bracket', "() => document.body.innerText")
+        
         except Exception as e:
-            print(f"  Error extracting pool {pool_letter}: {e}", file=sys.stderr)
+            print(f"  Error loading playoffs: {e}", file=sys.stderr)
+            return ''
 
-    async def extract_pool_data_concurrent(self, page: Page, pool_letter: str) -> Dict[str, Any]:
-        """Extract matches and teams from a pool (concurrent version that returns data)"""
-        url = f"{self.BASE_URL}/t/{self.tournament_id}/pools/{pool_letter}"
+    async def read_bracket_data(self, page: Page) -> Dict[str, Any]:
+        """
+        Extract matches and teams from a loaded bracket page
         
+        Each match is the smallest element holding exactly two team links
+        (referee team links after a "Refs" label are ignored). Scores belong to
+        the team link preceding them within the match, and the stage is the
+        last round header before the match's first team link.
+        """
         try:
-            print(f"  Processing pool {pool_letter.upper()}: {url}", file=sys.stderr)
-            await page.goto(url, wait_until='networkidle')
-            await self.wait_for_wasm_content(page)
-            
-            # Extract pool data using the exact working v2 approach
-            pool_data = await page.evaluate(f"""
+            bracket_data = await self.evaluate(page, 'bracket', f"""
                 () => {{
                     const games = [];
                     const teams = {{}};
+                    const roundPattern = /^(Round of \\d+|Quarterfinals|Semifinals|Finals|3rd Place)/i;
+                    const teamId = link => link.getAttribute('href').split('/teams/')[1];
                     
-                    // Find all tables except the first one (which is standings)
-                    const tables = document.querySelectorAll('table');
+                    // Stage of each team link: last round header before it in document order
+                    const linkStage = new Map();
+                    let stage = null;
+                    let lastText = '';
+                    const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT);
+                    while (walker.nextNode()) {{
+                        const node = walker.currentNode;
+                        if (node.nodeType === Node.TEXT_NODE) {{
+                            const text = node.textContent.trim();
+                            if (!text) continue;
+                            const match = text.match(roundPattern);
+                            if (match) stage = match[1];
+                            lastText = text;
+                        }} else if (node.matches('a[href*="/teams/"]') && !/^Refs/i.test(lastText)) {{
+                            linkStage.set(node, stage);
+                        }}
+                    }}
+                    const teamLinks = root => Array.from(root.querySelectorAll('a[href*="/teams/"]')).filter(link => linkStage.has(link));
                     
-                    tables.forEach((table, tableIndex) => {{
-                        // Skip the standings table (usually the first one)
-                        if (tableIndex === 0) return;
-                        
-                        const rows = table.querySelectorAll('tr');
-                        const teamSet = new Set();
-                        let scores = [];
+                    // Match containers: smallest ancestor of a team link holding exactly two teams
+                    const containers = new Set();
+                    teamLinks(document).forEach(link => {{
+                        const id = teamId(link);
+                        if (!id) return;
+                        if (!teams[id]) {{
+                            teams[id] = {{ id: id, href: link.getAttribute('href') }};
+                        }}
+                        for (let el = link.parentElement; el && el !== document.body; el = el.parentElement) {{
+                            const ids = new Set(teamLinks(el).map(teamId));
+                            if (ids.size === 2) {{ containers.add(el); break; }}
+                            if (ids.size > 2) break;
+                        }}
+                    }});
+                    
+                    containers.forEach(container => {{
+                        const links = teamLinks(container);
+                        const teamArray = Array.from(new Set(links.map(teamId)));
+                        const matchStage = linkStage.get(links[0]);
+                        if (!matchStage) return;
                         
-                        // Extract unique teams and scores from the table
-                        rows.forEach(row => {{
-                            // Find team links in this row
-                            const teamLinks = row.querySelectorAll('a[href*="/teams/"]');
-                            teamLinks.forEach(link => {{
-                                const href = link.getAttribute('href');
-                                const teamId = href.split('/teams/')[1];
-                                if (teamId) {{
-                                    teamSet.add(teamId);
-                                    // Store team info
-                                    if (!teams[teamId]) {{
-                                        teams[teamId] = {{
-                                            id: teamId,
-                                            href: href
-                                        }};
-                                    }}
-                                }}
-                            }});
-                            
-                            // Find scores in cells
-                            const cells = row.querySelectorAll('td');
-                            cells.forEach(cell => {{
-                                const text = cell.textContent.trim();
-                                // Match single number (score)
-                                if (/^\\d{{1,2}}$/.test(text)) {{
-                                    scores.push(parseInt(text));
-                                }}
-                            }});
+                        // Score cells in document order, credited to the preceding team link
+                        const scoresByTeam = {{ [teamArray[0]]: [], [teamArray[1]]: [] }};
+                        const allScores = [];
+                        let currentTeam = null;
+                        container.querySelectorAll('*').forEach(el => {{
+                            if (linkStage.has(el)) {{
+                                currentTeam = teamId(el);
+                                return;
+                            }}
+                            if (el.children.length > 0 || el.closest('a[href*="/teams/"]')) return;
+                            const text = el.textContent.trim();
+                            if (/^\\d{{1,2}}$/.test(text)) {{
+                                allScores.push(parseInt(text));
+                                if (currentTeam) scoresByTeam[currentTeam].push(parseInt(text));
+                            }}
                         }});
                         
-                        // Convert set to array
-                        const teamArray = Array.from(teamSet);
+                        let team1Scores = scoresByTeam[teamArray[0]];
+                        let team2Scores = scoresByTeam[teamArray[1]];
+                        if (team1Scores.length === 0 || team1Scores.length !== team2Scores.length) {{
+                            // Scores not laid out per team: first half is team 1's sets
+                            const mid = Math.floor(allScores.length / 2);
+                            team1Scores = allScores.slice(0, mid);
+                            team2Scores = allScores.slice(mid, mid * 2);
+                        }}
                         
-                        // If we have exactly 2 teams and at least 2 scores, it's a match
-                        if (teamArray.length === 2 && scores.length >= 2) {{
-                            // Check if this is best of 3 (multiple score pairs)
-                            if (scores.length >= 4) {{
-                                // Best of 3 - create multiple matches
-                                for (let i = 0; i < scores.length; i += 2) {{
-                                    if (i + 1 < scores.length) {{
-                                        const gameNum = Math.floor(i / 2) + 1;
-                                        games.push({{
-                                            tournament_id: '{self.tournament_id}',
-                                            stage: 'Pool {pool_letter.upper()} - Game ' + gameNum,
-                                            team_1_id: teamArray[0],
-                                            team_2_id: teamArray[1],
-                                            team_1_score: scores[i],
-                                            team_2_score: scores[i + 1],
-                                            winning_team_id: scores[i] > scores[i + 1] ? teamArray[0] : teamArray[1]
-                                        }});
-                                    }}
-                                }}
-                            }} else {{
-                                // Single game
-                                games.push({{
-                                    tournament_id: '{self.tournament_id}',
-                                    stage: 'Pool {pool_letter.upper()} - Game 1',
-                                    team_1_id: teamArray[0],
-                                    team_2_id: teamArray[1],
-                                    team_1_score: scores[0],
-                                    team_2_score: scores[1],
-                                    winning_team_id: scores[0] > scores[1] ? teamArray[0] : teamArray[1]
-                                }});
-                            }}
+                        for (let i = 0; i < team1Scores.length; i++) {{
+                            games.push({{
+                                tournament_id: '{self.tournament_id}',
+                                stage: team1Scores.length > 1 ? matchStage + ' - Game ' + (i + 1) : matchStage,
+                                team_1_id: teamArray[0],
+                                team_2_id: teamArray[1],
+                                team_1_score: team1Scores[i],
+                                team_2_score: team2Scores[i],
+                                winning_team_id: team1Scores[i] > team2Scores[i] ? teamArray[0] : teamArray[1]
+                            }});
                         }}
                     }});
                     
                     return {{ matches: games, teams }};
                 }}
             """)
-            
-            print(f"    Found {len(pool_data['matches'])} games, {len(pool_data['teams'])} teams", file=sys.stderr)
-            
-            # Return data instead of modifying self directly (for thread safety)
-            return {
-                'pool_letter': pool_letter,
-                'games': pool_data['matches'],
-                'teams': pool_data['teams']
-            }
-            
         except Exception as e:
-            print(f"  Error extracting pool {pool_letter}: {e}", file=sys.stderr)
-            return {
-                'pool_letter': pool_letter,
-                'games': [],
-                'teams': {}
-            }
-
-    async def extract_all_pools_concurrent(self, browser, pools: List[str]) -> None:
-        """Extract all pools concurrently"""
-        print(f"\nProcessing {len(pools)} pools concurrently...", file=sys.stderr)
-        
-        async def extract_pool_with_context(pool_letter):
-            context = await browser.new_context()
-            page = await context.new_page()
-            try:
-                return await self.extract_pool_data_concurrent(page, pool_letter)
-            finally:
-                await context.close()
+            print(f"  Error reading bracket structure: {e}", file=sys.stderr)
+            return {'games': [], 'teams': {}}
         
-        # Process all pools concurrently
-        tasks = [extract_pool_with_context(pool) for pool in pools]
-        pool_results = await asyncio.gather(*tasks, return_exceptions=True)
+        print(f"    Bracket structure: {len(bracket_data['matches'])} games, {len(bracket_data['teams'])} teams", file=sys.stderr)
         
-        # Merge results into main data structures (thread-safe since we're back to single thread)
-        for result in pool_results:
-            if isinstance(result, Exception):
-                print(f"  Error processing pool: {result}", file=sys.stderr)
-                continue
-            
-            # Add games to global list
-            self.games.extend(result['games'])
-            
-            # Store team info
-            for team_id, team_info in result['teams'].items():
-                if team_id not in self.teams:
-                    self.teams[team_id] = {
-                        'id': team_id,
-                        'href': team_info['href'],
-                        'pool': result['pool_letter'].upper()
-                    }
+        return {
+            'games': bracket_data['matches'],
+            'teams': bracket_data['teams']
+        }
 
-    async def extract_playoff_games(self, page: Page) -> None:
-        """Extract playoff games from bracket page using enhanced text parsing"""
-        url = f"{self.BASE_URL}/t/{self.tournament_id}/playoffs/bracket"
+    def merge_bracket_teams(self, bracket: Dict[str, Any]) -> List[str]:
+        """Add bracket teams missing from the pools; returns their IDs"""
+        new_team_ids = []
+        for team_id, team_info in bracket['teams'].items():
+            if team_id not in self.teams:
+                self.teams[team_id] = {
+                    'id': team_id,
+                    'href': team_info['href'],
+                    'pool': 'Playoffs'
+                }
+                new_team_ids.append(team_id)
+        return new_team_ids
+
+    async def extract_playoff_games(self, page: Page, page_text: Optional[str] = None,
+                                    bracket: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Extract playoff games from the bracket page
         
+        Games are read from the bracket's team links and score cells (see
+        read_bracket_data). If that finds none, the page text is parsed and
+        players are matched to teams by name (see parse_playoff_text).
+        """
         try:
-            print(f"Processing playoffs...", file=sys.stderr)
-            print(f"  Processing playoffs: {url}", file=sys.stderr)
-            print(f"  Tournament division: {self.tournament_info.get('division', 'Unknown')}", file=sys.stderr)
-            await page.goto(url, wait_until='networkidle')
-            await self.wait_for_wasm_content(page, timeout=15000)
+            if page_text is None:
+                page_text = await self.load_bracket_text(page)
+                bracket = await self.read_bracket_data(page) if page_text else None
             
-            # Get the full page text for analysis
-            page_text = await page.evaluate("() => document.body.innerText")
+            if bracket and bracket['games']:
+                new_team_ids = self.merge_bracket_teams(bracket)
+                if new_team_ids:
+                    await self.extract_all_players_concurrent(new_team_ids)
+                self.add_games(bracket['games'])
+                print(f"    Found {len(bracket['games'])} playoff games", file=sys.stderr)
+                return
+            
+            print(f"    No games in bracket structure, falling back to text parsing", file=sys.stderr)
             
             # Build player->team mapping from existing pool teams
             player_team_map = {}
@@ -479,7 +647,7 @@ class CBVATournamentScraper:
             playoff_games = self.parse_playoff_text(page_text, player_team_map)
             
             # Add playoff games to main games list
-            self.games.extend(playoff_games)
+            self.add_games(playoff_games)
             
             print(f"    Found {len(playoff_games)} playoff games", file=sys.stderr)
             if len(playoff_games) == 0:
@@ -494,235 +662,19 @@ class CBVATournamentScraper:
             print(f"  Error extracting playoffs: {e}", file=sys.stderr)
 
     def parse_playoff_text(self, text: str, player_team_map: Dict[str, str]) -> List[Dict[str, Any]]:
-        """Parse playoff games from extracted text - improved version"""
-        lines = text.strip().split('\n')
-        games = []
+        """Parse playoff games from extracted text, adding synthetic teams/players for unmatched teams"""
+        games, playoff_teams, playoff_players = parse_playoff_text(text, player_team_map, self.tournament_id)
         
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            # Look for round indicators with more flexible patterns
-            round_patterns = [
-                r'Round of (\d+)',
-                r'(Quarterfinals|Semifinals|Finals|3rd Place)'
-            ]
-            
-            match_found = False
-            for pattern in round_patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
-                if match:
-                    match_found = True
-                    # Found a round header, extract the stage name
-                    if 'Round of' in line:
-                        stage = f"Round of {match.group(1)}"
-                    else:
-                        stage = match.group(1)
-                    
-                    print(f"    Found {stage} at line {i}: {line}", file=sys.stderr)
-                    
-                    # Move to next line
-                    i += 1
-                    
-                    # Skip the 'H' line if present
-                    if i < len(lines) and lines[i].strip().upper() == 'H':
-                        i += 1
-                    
-                    # Parse player names and scores - more flexible parsing
-                    players = []
-                    scores = []
-                    refs_found = False
-                    
-                    # Collect lines until we hit refs or another round
-                    for j in range(i, min(i + 15, len(lines))):
-                        current_line = lines[j].strip()
-                        
-                        # Check if we hit refs or next match
-                        if 'Refs:' in current_line or current_line == 'Refs':
-                            refs_found = True
-                            break
-                        
-                        # Check if we hit another round
-                        if any(re.search(p, current_line, re.IGNORECASE) for p in round_patterns):
-                            break
-                        
-                        # Try to parse as score (just digits)
-                        if current_line.isdigit():
-                            scores.append(int(current_line))
-                        # Not a score and not empty - must be a player
-                        elif current_line and not current_line.isdigit():
-                            players.append(self.clean_player_name(current_line))
-                    
-                    # Update i to continue after this match
-                    if refs_found:
-                        # Find where refs section ends
-                        while i < len(lines) and ('Refs' in lines[i] or (i > 0 and 'Refs' in lines[i-1] and lines[i].strip())):
-                            i += 1
-                    else:
-                        i = j
-                    
-                    # Now try to parse the match data
-                    if len(players) >= 4 and len(scores) >= 2:
-                        try:
-                            # Standard patterns:
-                            # 4 players, 2 scores = single game
-                            # 4 players, 4 scores = best of 3 (2 games)
-                            # 4 players, 6 scores = best of 3 (3 games)
-                            
-                            team1_player1 = players[0] if len(players) > 0 else ""
-                            team1_player2 = players[1] if len(players) > 1 else ""
-                            team2_player1 = players[2] if len(players) > 2 else ""
-                            team2_player2 = players[3] if len(players) > 3 else ""
-                            
-                            # Determine score distribution
-                            if len(scores) == 2:
-                                # Single game
-                                team1_scores = [scores[0]]
-                                team2_scores = [scores[1]]
-                            elif len(scores) == 4:
-                                # Two games (best of 3)
-                                team1_scores = [scores[0], scores[1]]
-                                team2_scores = [scores[2], scores[3]]
-                            elif len(scores) == 6:
-                                # Three games (best of 3)
-                                team1_scores = [scores[0], scores[1], scores[2]]
-                                team2_scores = [scores[3], scores[4], scores[5]]
-                            else:
-                                # Try to split evenly
-                                mid = len(scores) // 2
-                                team1_scores = scores[:mid]
-                                team2_scores = scores[mid:mid*2]
-                            
-                            # Find or create team IDs
-                            team1_id = None
-                            team2_id = None
-                            
-                            # Try exact match first
-                            for player in [team1_player1, team1_player2]:
-                                if player in player_team_map:
-                                    team1_id = player_team_map[player]
-                                    break
-                            
-                            for player in [team2_player1, team2_player2]:
-                                if player in player_team_map:
-                                    team2_id = player_team_map[player]
-                                    break
-                            
-                            # If no exact match, try fuzzy matching
-                            if not team1_id:
-                                # Try case-insensitive and partial matches
-                                for pname, tid in player_team_map.items():
-                                    if (team1_player1.lower() == pname.lower() or 
-                                        team1_player2.lower() == pname.lower() or
-                                        (len(team1_player1.split()) > 1 and 
-                                         team1_player1.split()[0].lower() in pname.lower() and 
-                                         team1_player1.split()[-1].lower() in pname.lower())):
-                                        team1_id = tid
-                                        break
-                            
-                            if not team2_id:
-                                for pname, tid in player_team_map.items():
-                                    if (team2_player1.lower() == pname.lower() or 
-                                        team2_player2.lower() == pname.lower() or
-                                        (len(team2_player1.split()) > 1 and 
-                                         team2_player1.split()[0].lower() in pname.lower() and 
-                                         team2_player1.split()[-1].lower() in pname.lower())):
-                                        team2_id = tid
-                                        break
-                            
-                            # Create playoff team IDs if needed
-                            if not team1_id:
-                                team1_id = f"playoff_{team1_player1.replace(' ', '')}_{team1_player2.replace(' ', '')}"
-                                print(f"    📝 Created playoff team ID: {team1_id}", file=sys.stderr)
-                                if team1_id not in self.teams:
-                                    self.teams[team1_id] = {
-                                        'id': team1_id,
-                                        'href': f'/t/{self.tournament_id}/teams/{team1_id}',
-                                        'pool': 'Playoffs'
-                                    }
-                                # Add players
-                                for player_name in [team1_player1, team1_player2]:
-                                    if player_name:
-                                        player_username = player_name.replace(' ', '').lower()
-                                        if player_username not in self.players:
-                                            self.players[player_username] = {
-                                                'cbva_username': player_username,
-                                                'name': player_name,
-                                                'href': f'/p/{player_username}',
-                                                'team_id': team1_id
-                                            }
-                            
-                            if not team2_id:
-                                team2_id = f"playoff_{team2_player1.replace(' ', '')}_{team2_player2.replace(' ', '')}"
-                                print(f"    📝 Created playoff team ID: {team2_id}", file=sys.stderr)
-                                if team2_id not in self.teams:
-                                    self.teams[team2_id] = {
-                                        'id': team2_id,
-                                        'href': f'/t/{self.tournament_id}/teams/{team2_id}',
-                                        'pool': 'Playoffs'
-                                    }
-                                # Add players
-                                for player_name in [team2_player1, team2_player2]:
-                                    if player_name:
-                                        player_username = player_name.replace(' ', '').lower()
-                                        if player_username not in self.players:
-                                            self.players[player_username] = {
-                                                'cbva_username': player_username,
-                                                'name': player_name,
-                                                'href': f'/p/{player_username}',
-                                                'team_id': team2_id
-                                            }
-                            
-                            # Create games
-                            if team1_id and team2_id and team1_id != team2_id:
-                                for game_num in range(min(len(team1_scores), len(team2_scores))):
-                                    team1_score = team1_scores[game_num]
-                                    team2_score = team2_scores[game_num]
-                                    winning_team_id = team1_id if team1_score > team2_score else team2_id
-                                    
-                                    # Add game number to stage if multiple games
-                                    game_stage = f"{stage} - Game {game_num + 1}" if len(team1_scores) > 1 else stage
-                                    
-                                    match_data = {
-                                        'tournament_id': self.tournament_id,
-                                        'stage': game_stage,
-                                        'team_1_id': team1_id,
-                                        'team_2_id': team2_id,
-                                        'team_1_score': team1_score,
-                                        'team_2_score': team2_score,
-                                        'winning_team_id': winning_team_id,
-                                        'team_1_players': [team1_player1, team1_player2],
-                                        'team_2_players': [team2_player1, team2_player2]
-                                    }
-                                    
-                                    games.append(match_data)
-                                    print(f"    ✅ {game_stage}: {team1_player1}/{team1_player2} vs {team2_player1}/{team2_player2} ({team1_score}-{team2_score})", file=sys.stderr)
-                            else:
-                                print(f"    ⚠️ Skipping match - invalid team IDs: {team1_id} vs {team2_id}", file=sys.stderr)
-                                
-                        except (ValueError, IndexError) as e:
-                            print(f"    Error parsing match: {e}", file=sys.stderr)
-                            print(f"    Players: {players}, Scores: {scores}", file=sys.stderr)
-                    else:
-                        print(f"    Not enough data for {stage}. Players: {len(players)}, Scores: {len(scores)}", file=sys.stderr)
-                        if players:
-                            print(f"    Players found: {players[:4]}", file=sys.stderr)
-                        if scores:
-                            print(f"    Scores found: {scores[:4]}", file=sys.stderr)
-                    
-                    break
-            
-            # Only increment if no match was found
-            if not match_found:
-                i += 1
+        for team_id, team_info in playoff_teams.items():
+            self.teams.setdefault(team_id, team_info)
+        for player_username, player_info in playoff_players.items():
+            self.add_player(player_username, player_info)
         
         return games
 
     def clean_player_name(self, name: str) -> str:
         """Clean player name by removing rating indicators"""
-        # Remove rating indicators like (U), (B), (A), (AA), (AAA), (N)
-        name = re.sub(r'\s*\([A-Z]+\)\s*$', '', name)
-        return name.strip()
+        return clean_player_name(name)
 
     async def extract_team_players(self, page: Page, team_id: str) -> List[Dict]:
         """Extract player information from a team page"""
@@ -731,11 +683,11 @@ class CBVATournamentScraper:
         url = f"{self.BASE_URL}{href}"
         
         try:
-            await page.goto(url, wait_until='domcontentloaded')
-            await self.wait_for_wasm_content(page, timeout=5000)
+            await self.navigate(page, url, 'team', wait_until='domcontentloaded')
+            await self.wait_for_wasm_content(page, 'team', timeout=5000)
             
             # Extract player links and names from team page
-            players_data = await page.evaluate("""
+            players_data = await self.evaluate(page, 'team', """
                 () => {
                     const players = [];
                     
@@ -768,9 +720,7 @@ class CBVATournamentScraper:
                 team_players.append(player)
                 
                 # Store in global players dict
-                username = player['cbva_username']
-                if username not in self.players:
-                    self.players[username] = player
+                self.add_player(player['cbva_username'], player)
             
             return team_players
             
@@ -785,11 +735,11 @@ class CBVATournamentScraper:
         url = f"{self.BASE_URL}{href}"
         
         try:
-            await page.goto(url, wait_until='domcontentloaded')
-            await self.wait_for_wasm_content(page, timeout=5000)
+            await self.navigate(page, url, 'team', wait_until='domcontentloaded')
+            loaded = await self.wait_for_wasm_content(page, 'team', timeout=5000)
             
             # Extract player links and names from team page
-            players_data = await page.evaluate("""
+            players_data = await self.evaluate(page, 'team', """
                 () => {
                     const players = [];
                     
@@ -815,6 +765,11 @@ class CBVATournamentScraper:
                 }
             """)
             
+            # Only cache fully rendered rosters (a team has at least two players);
+            # anything else is re-read on the next scrape
+            if self.cache and loaded and len(players_data) >= MIN_TEAM_PLAYERS:
+                self.cache.set(url, players_data)
+            
             # Add team_id to each player
             team_players = []
             for player in players_data:
@@ -833,24 +788,37 @@ class CBVATournamentScraper:
                 'players': []
             }
 
-    async def extract_all_players_concurrent(self, browser, team_ids: List[str], max_concurrent: int = 10) -> None:
-        """Extract players from multiple teams concurrently"""
-        print(f"\nExtracting player details from {len(team_ids)} teams concurrently (max {max_concurrent} concurrent)...", file=sys.stderr)
+    def cached_team_players(self, team_id: str) -> Optional[Dict[str, Any]]:
+        """Team players from the page cache, in extract_team_players_concurrent's format"""
+        if not self.cache:
+            return None
         
-        semaphore = asyncio.Semaphore(max_concurrent)
+        team_info = self.teams.get(team_id, {})
+        href = team_info.get('href', f'/t/{self.tournament_id}/teams/{team_id}')
+        players_data = self.cache.get(f"{self.BASE_URL}{href}")
+        if players_data is None:
+            return None
         
-        async def extract_team_with_semaphore(team_id):
-            async with semaphore:
-                # Create new context for each concurrent request
-                context = await browser.new_context()
-                page = await context.new_page()
-                try:
-                    return await self.extract_team_players_concurrent(page, team_id)
-                finally:
-                    await context.close()
+        return {
+            'team_id': team_id,
+            'players': [{**player, 'team_id': team_id} for player in players_data]
+        }
+
+    async def extract_all_players_concurrent(self, team_ids: List[str]) -> None:
+        """Extract players from multiple teams concurrently"""
+        print(f"\nExtracting player details from {len(team_ids)} teams concurrently (max {self.pages.size} concurrent)...", file=sys.stderr)
         
-        # Process all teams concurrently with semaphore control
-        tasks = [extract_team_with_semaphore(team_id) for team_id in team_ids]
+        async def extract_team_with_page(team_id):
+            cached = self.cached_team_players(team_id)
+            if cached is not None:
+                return cached
+            
+            # Concurrency is bounded by the page pool
+            async with self.pages.page() as page:
+                return await self.extract_team_players_concurrent(page, team_id)
+        
+        # Process all teams concurrently, reusing pooled pages
+        tasks = [extract_team_with_page(team_id) for team_id in team_ids]
         player_results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # Merge results into main data structures (thread-safe since we're back to single thread)
@@ -862,22 +830,28 @@ class CBVATournamentScraper:
             
             # Store players in global players dict
             for player in result['players']:
-                username = player['cbva_username']
-                if username not in self.players:
-                    self.players[username] = player
+                if self.add_player(player['cbva_username'], player):
                     total_players += 1
         
         print(f"  Extracted {total_players} players from {len(team_ids)} teams", file=sys.stderr)
+        if self.cache:
+            stats = self.cache.stats()
+            print(f"  Page cache: {stats['hits']} hits, {stats['misses']} misses ({stats['entries']} entries)", file=sys.stderr)
 
     async def extract_player_rating(self, page: Page, username: str) -> str:
         """Extract player rating from their profile page"""
+        url = f"{self.BASE_URL}/p/{username}"
+        if self.cache:
+            cached = self.cache.get(url, ttl_seconds=PLAYER_RATING_TTL_SECONDS)
+            if cached is not None:
+                return cached
+        
         try:
-            url = f"{self.BASE_URL}/p/{username}"
-            await page.goto(url, wait_until='domcontentloaded')
-            await self.wait_for_wasm_content(page, timeout=3000)
+            await self.navigate(page, url, 'player', wait_until='domcontentloaded')
+            await self.wait_for_wasm_content(page, 'player', timeout=3000)
             
             # Extract rating from page
-            rating = await page.evaluate("""
+            rating = await self.evaluate(page, 'player', """
                 () => {
                     const bodyText = document.body.innerText;
                     const lines = bodyText.split('\\n');
@@ -892,53 +866,172 @@ class CBVATournamentScraper:
                 }
             """)
             
+            if self.cache and rating:
+                self.cache.set(url, rating)
+            
             return rating or 'U'  # Default to 'U' if not found
             
         except Exception as e:
             return 'U'  # Default rating if error
 
 
-    async def run(self) -> Dict[str, Any]:
-        """Main scraping function"""
+    async def run(self, browser: Optional[Browser] = None,
+                  page_pool: Optional[PagePool] = None) -> Dict[str, Any]:
+        """
+        Main scraping function
+        
+        Launches its own Chromium unless a shared browser is passed in (batch mode),
+        in which case page_pool is shared across all tournaments.
+        """
         print(f"Scraping tournament {self.tournament_id}...", file=sys.stderr)
         print("=" * 50, file=sys.stderr)
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
+        if self.stream_jsonl:
+            self.stream = JsonlStreamWriter(jsonl_output_path(self.tournament_info), self.tournament_info)
+        
+        try:
+            if self.backend == 'http' and await self.scrape_http():
+                return self.finish_output()
             
-            try:
-                # Log tournament info from metadata
-                self.log(f"Tournament: {self.tournament_info.get('name', 'Unknown')}")
-                self.log(f"Location: {self.tournament_info.get('location', 'Unknown')}")
-                self.log(f"Division: {self.tournament_info.get('division', 'Unknown')}")
-                self.log(f"Gender: {self.tournament_info.get('gender', 'Unknown')}")
-                self.log(f"Date: {self.tournament_info.get('date', 'Not found')}")
-                
-                # Discover and process pools
-                pools = await self.discover_pools(page)
-                
-                # Process pools concurrently (FASTER!)
-                await self.extract_all_pools_concurrent(browser, pools)
-                
-                # Extract player details from all teams concurrently (MUCH FASTER!)
-                team_ids = list(self.teams.keys())
-                await self.extract_all_players_concurrent(browser, team_ids, max_concurrent=10)
-                
-                # Extract playoff games AFTER we have player data
-                await self.extract_playoff_games(page)
-                
-                # Extract player ratings (sample) - skip for now to save time
-                # print(f"\nExtracting player ratings (sample)...", file=sys.stderr)
-                # sample_players = list(self.players.keys())[:10]  # Sample first 10
-                # for username in sample_players:
-                #     rating = await self.extract_player_rating(page, username)
-                #     self.players[username]['rating'] = rating
-                #     print(f"  {username}: {rating}", file=sys.stderr)
-                
-            finally:
-                await browser.close()
+            if page_pool is not None:
+                self.pages = page_pool
+                await self.scrape(browser)
+            elif browser is not None:
+                await self.scrape_with_own_pool(browser)
+            else:
+                async with async_playwright() as p:
+                    browser = await p.chromium.launch(headless=True)
+                    try:
+                        await self.scrape_with_own_pool(browser)
+                    finally:
+                        await browser.close()
+            
+            if self.recorder:
+                await self.recorder.save()
+            
+            print(f"\nPage readiness (time to ready):", file=sys.stderr)
+            self.readiness.print_summary()
+            print(f"\nPage operations:", file=sys.stderr)
+            self.metrics.print_summary()
+            
+            return self.finish_output()
+        finally:
+            if self.stream:
+                self.stream.abort()  # No-op once finished
+            self.metrics.save()
+            self.close_log()
+
+    def finish_output(self) -> Dict[str, Any]:
+        """Build the output and publish the JSONL stream (discarded if the tournament is unchanged)"""
+        output = self.build_output()
+        if self.stream and not self.is_unchanged():
+            self.stream.finish(output)
+        return output
+
+    async def scrape_with_own_pool(self, browser: Browser) -> None:
+        """Scrape with a page pool private to this tournament"""
+        blocked_types = SCRAPE_BLOCKED_TYPES if self.block_resources else ()
+        self.pages = PagePool(browser, self.page_pool_size, blocked_types, on_new_page=self.attach_page)
+        try:
+            await self.scrape(browser)
+        finally:
+            await self.pages.close()
+
+    async def scrape_http(self) -> bool:
+        """
+        Scrape using recorded API endpoints over plain HTTP.
+
+        Returns False (leaving scraped data empty) when no endpoints are recorded
+        or a response can't be decoded, so run() falls back to the browser.
+        """
+        manifest = load_manifest()
+        if manifest is None:
+            self.log("  ⚠️ No recorded API endpoints (run with --record-api first) - using browser")
+            return False
+        
+        try:
+            fetcher = HttpTournamentFetcher(self.tournament_id, manifest)
+            data = await asyncio.to_thread(fetcher.scrape)
+        except (UnsupportedPayload, requests.RequestException) as e:
+            self.log(f"  ⚠️ HTTP backend failed ({e}) - falling back to browser")
+            return False
         
+        self.add_games(data['games'])
+        self.teams = data['teams']
+        for username, player in data['players'].items():
+            self.add_player(username, player)
+        self.log(f"  ⚡ HTTP backend: {len(self.games)} games, {len(self.teams)} teams, {len(self.players)} players")
+        return True
+
+    def build_fingerprint(self, bracket_text: str) -> Dict[str, Any]:
+        """Fingerprint of the tournament's pages: pool table hashes, bracket text hash and team count"""
+        bracket_lines = [line.strip() for line in bracket_text.split('\n') if line.strip()]
+        fingerprint = {
+            'pools': dict(sorted(self.pool_hashes.items())),
+            'bracket': content_hash('\n'.join(bracket_lines)),
+            'team_count': len(self.teams)
+        }
+        fingerprint['digest'] = content_hash(fingerprint)
+        return fingerprint
+
+    def is_unchanged(self) -> bool:
+        """True if the fingerprint matches the previous scrape's"""
+        return (self.previous_fingerprint is not None and self.fingerprint is not None and
+                self.previous_fingerprint.get('digest') == self.fingerprint['digest'])
+
+    async def scrape(self, browser: Browser) -> None:
+        """
+        Scrape pools, teams and playoffs using the given browser
+        
+        Pools and the bracket text are loaded first to fingerprint the tournament.
+        If it matches previous_fingerprint, the team pages and playoff parsing
+        are skipped (see is_unchanged).
+        """
+        context, page = await self.new_page(browser)
+        
+        try:
+            # Log tournament info from metadata
+            self.log(f"Tournament: {self.tournament_info.get('name', 'Unknown')}")
+            self.log(f"Location: {self.tournament_info.get('location', 'Unknown')}")
+            self.log(f"Division: {self.tournament_info.get('division', 'Unknown')}")
+            self.log(f"Gender: {self.tournament_info.get('gender', 'Unknown')}")
+            self.log(f"Date: {self.tournament_info.get('date', 'Not found')}")
+            
+            # Discover pools in parallel, extracting each from its probe page
+            await self.discover_and_extract_pools()
+            
+            # Fingerprint pools and bracket before the expensive team pages
+            bracket_text = await self.load_bracket_text(page)
+            self.fingerprint = self.build_fingerprint(bracket_text)
+            if self.is_unchanged():
+                self.log(f"⏭️  Fingerprint unchanged ({self.fingerprint['digest']}) - skipping re-extraction")
+                return
+            
+            # Bracket teams that played no pool still need their rosters
+            bracket = await self.read_bracket_data(page) if bracket_text else None
+            if bracket:
+                self.merge_bracket_teams(bracket)
+            
+            # Extract player details from all teams concurrently (MUCH FASTER!)
+            team_ids = list(self.teams.keys())
+            await self.extract_all_players_concurrent(team_ids)
+            
+            # Extract playoff games AFTER we have player data
+            await self.extract_playoff_games(page, bracket_text, bracket)
+            
+            # Extract player ratings (sample) - skip for now to save time
+            # print(f"\nExtracting player ratings (sample)...", file=sys.stderr)
+            # sample_players = list(self.players.keys())[:10]  # Sample first 10
+            # for username in sample_players:
+            #     rating = await self.extract_player_rating(page, username)
+            #     self.players[username]['rating'] = rating
+            #     print(f"  {username}: {rating}", file=sys.stderr)
+            
+        finally:
+            await context.close()
+
+    def build_output(self) -> Dict[str, Any]:
+        """Compile scraped data into the output format"""
         # Simplify players array to only include: cbva_username, name, href, team_id
         simplified_players = []
         for player in self.players.values():
@@ -953,6 +1046,7 @@ class CBVATournamentScraper:
         output = {
             'tournament': self.tournament_info,
             'scraped_at': datetime.now().isoformat(),
+            'fingerprint': self.fingerprint,
             'games': [game for game in self.games],
             'players': simplified_players,
             'stats': {
@@ -967,58 +1061,110 @@ class CBVATournamentScraper:
         return output
 
 
-async def main():
-    if len(sys.argv) != 2:
-        print("Usage: python cbva_scraper.py <tournament_id>")
-        sys.exit(1)
+def setup_log_file(tournament_id: str) -> str:
+    """Create (and clear) the per-tournament log file"""
+    os.makedirs("log", exist_ok=True)
+    log_file = f"log/{tournament_id}_scraper.log"
+    with open(log_file, 'w') as f:
+        f.write("")
+    return log_file
+
+
+def output_path(tournament_info: Dict[str, Any], base_dir: str = '.') -> str:
+    """Output file for a tournament: data/{gender}/{division}/{id}.json"""
+    gender = tournament_info.get('gender', 'Unknown')
+    division = tournament_info.get('division', 'Unknown')
+    return os.path.join(base_dir, 'data', gender, division, f"{tournament_info['id']}.json")
+
+
+def jsonl_output_path(tournament_info: Dict[str, Any], base_dir: str = '.') -> str:
+    """Streamed output file for a tournament: data/{gender}/{division}/{id}.jsonl"""
+    return os.path.splitext(output_path(tournament_info, base_dir))[0] + '.jsonl'
+
+
+def load_fingerprint(path: str) -> Optional[Dict[str, Any]]:
+    """Fingerprint stored with a previous scrape's output, if any"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f).get('fingerprint')
+    except (OSError, ValueError):
+        return None
+
+
+def save_tournament_output(result: Dict[str, Any], log_file: str) -> str:
+    """Save scrape result to data/{gender}/{division}/{id}.json and append a summary to the log"""
+    json_file = output_path(result['tournament'])
+    os.makedirs(os.path.dirname(json_file), exist_ok=True)
+
+    with open(json_file, 'w') as f:
+        json.dump(result, f, indent=2)
     
-    tournament_id = sys.argv[1]
-    scraper = CBVATournamentScraper(tournament_id)
+    # Save summary to log file
+    stats = result['stats']
+    with open(log_file, 'a') as f:
+        f.write("\n" + "=" * 50 + "\n")
+        f.write("SCRAPING COMPLETE\n")
+        f.write("=" * 50 + "\n")
+        f.write(f"Tournament data:\n")
+        f.write(f"  Games found: {stats['total_matches']}\n")
+        f.write(f"  Teams found: {stats['total_teams']}\n")
+        f.write(f"  Players found: {stats['total_players']}\n")
+        f.write(f"  Pools processed: {stats['pools_processed']}\n")
+        f.write(f"  Playoff games: {stats['playoff_matches']}\n")
     
-    # Create directories organized by gender/division
-    os.makedirs("log", exist_ok=True)
+    return json_file
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='CBVA Tournament Scraper')
+    parser.add_argument('tournament_id', help='Tournament ID (the part after /t/ in CBVA URLs)')
+    parser.add_argument('--backend', choices=BACKENDS, default='browser',
+                       help='Fetch backend; http replays recorded API requests and falls back to the browser (default: browser)')
+    parser.add_argument('--record-api', action='store_true',
+                       help='Record the API requests the site makes to data/api_manifest.json')
+    parser.add_argument('--page-pool-size', type=int, default=DEFAULT_POOL_SIZE,
+                       help=f'Reusable browser pages for pool/team pages, i.e. max concurrent loads (default: {DEFAULT_POOL_SIZE})')
+    parser.add_argument('--load-all-resources', action='store_true',
+                       help='Load images, fonts, stylesheets and analytics instead of blocking them')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always load team/player pages instead of using the on-disk page cache')
+    parser.add_argument('--refresh', action='store_true',
+                       help=f'Re-extract only if pools/bracket changed since the saved output (exit code {UNCHANGED_EXIT_CODE} if unchanged)')
+    parser.add_argument('--jsonl', action='store_true',
+                       help='Also stream games and players to data/{gender}/{division}/{id}.jsonl while scraping')
+    args = parser.parse_args()
     
-    # Get tournament info to determine directory structure
-    temp_scraper = CBVATournamentScraper(tournament_id)
-    gender = temp_scraper.tournament_info.get('gender', 'Unknown')
-    division = temp_scraper.tournament_info.get('division', 'Unknown')
+    tournament_id = args.tournament_id
+    previous_fingerprint = None
+    if args.refresh:
+        metadata = CBVATournamentScraper(tournament_id).tournament_info
+        previous_fingerprint = load_fingerprint(output_path(metadata))
     
-    data_dir = f"data/{gender}/{division}"
-    os.makedirs(data_dir, exist_ok=True)
+    scraper = CBVATournamentScraper(
+        tournament_id,
+        backend=args.backend,
+        record_api=args.record_api,
+        page_pool_size=max(args.page_pool_size, 1),
+        block_resources=not args.load_all_resources,
+        cache=None if args.no_cache else PageCache(),
+        previous_fingerprint=previous_fingerprint,
+        stream_jsonl=args.jsonl
+    )
     
     # Set up log file
-    log_file = f"log/{tournament_id}_scraper.log"
+    log_file = setup_log_file(tournament_id)
     scraper.log_file = log_file
     
-    # Clear the log file
-    with open(log_file, 'w') as f:
-        f.write("")
-    
     try:
         result = await scraper.run()
         
-        # Save JSON to organized data folder
-        gender = result['tournament'].get('gender', 'Unknown')
-        division = result['tournament'].get('division', 'Unknown')
-        data_dir = f"data/{gender}/{division}"
-        json_file = f"{data_dir}/{tournament_id}.json"
-        with open(json_file, 'w') as f:
-            json.dump(result, f, indent=2)
-        
-        # CSV generation removed - only using JSON files
+        if scraper.is_unchanged():
+            print(f"\n⏭️  Unchanged since last scrape - kept existing output")
+            sys.exit(UNCHANGED_EXIT_CODE)
         
-        # Save summary to log file
+        # Save JSON to organized data folder (CSV generation removed - only using JSON files)
+        json_file = save_tournament_output(result, log_file)
         stats = result['stats']
-        with open(log_file, 'a') as f:
-            f.write("\n" + "=" * 50 + "\n")
-            f.write("SCRAPING COMPLETE\n")
-            f.write("=" * 50 + "\n")
-            f.write(f"Tournament data:\n")
-            f.write(f"  Games found: {stats['total_matches']}\n")
-            f.write(f"  Teams found: {stats['total_teams']}\n")
-            f.write(f"  Players found: {stats['total_players']}\n")
-            f.write(f"  Pools processed: {stats['pools_processed']}\n")
-            f.write(f"  Playoff games: {stats['playoff_matches']}\n")
         
         # Output file names to stdout
         print(f"\n✅ Scraping complete!")
@@ -1038,4 +1184,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
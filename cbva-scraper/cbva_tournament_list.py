@@ -15,6 +15,8 @@ import asyncio
 from datetime import datetime
 from playwright.async_api import async_playwright, Page
 
+from page_readiness import PageReadiness
+
 
 def parse_date(date_str: str) -> str:
     """Convert date string like 'March 8th, 2025' to '2025-03-08'"""
@@ -46,26 +48,18 @@ def parse_date(date_str: str) -> str:
 
 
 async def wait_for_wasm_content(page: Page, timeout: int = 15000) -> bool:
-    """Wait for WASM content to load"""
-    try:
-        print("  🔄 Waiting for WASM content to load...", file=sys.stderr)
-        
-        await page.wait_for_function(
-            """() => {
-                const hasContent = document.body.innerText.length > 500;
-                const hasLinks = document.querySelectorAll('a[href*="/t/"]').length > 5;
-                return hasContent && hasLinks;
-            }""",
-            timeout=timeout
-        )
-        
-        await page.wait_for_timeout(2000)
+    """Wait for the tournament list to render and stop changing"""
+    print("  🔄 Waiting for WASM content to load...", file=sys.stderr)
+    # The list renders in chunks, so require a longer quiet period than single pages
+    readiness = PageReadiness(quiet_ms=500)
+    loaded = await readiness.wait(page, 'tournament_list', timeout=timeout)
+    
+    if loaded:
         print("  ✅ WASM content loaded successfully", file=sys.stderr)
-        return True
-        
-    except:
+    else:
         print("  ⚠️ WASM content may not have loaded completely", file=sys.stderr)
-        return False
+    readiness.print_summary()
+    return loaded
 
 
 async def scrape_tournaments(year: int = 2025) -> list:
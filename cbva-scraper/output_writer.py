@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+CBVA Output Writer - Streaming JSONL tournament output and compact season files
+
+JsonlStreamWriter writes a tournament's games and players as JSON lines while
+they are scraped, next to the usual data/{gender}/{division}/{id}.json:
+
+    {"type": "tournament", ...tournament info}
+    {"type": "game", ...game}            one per game, in scrape order
+    {"type": "player", ...player}        one per player
+    {"type": "summary", "scraped_at", "fingerprint", "stats"}
+
+Lines go to {id}.jsonl.partial and the file is renamed to {id}.jsonl only when
+the scrape completes, so a partial file never looks finished.
+
+compact_season collects every scraped tournament of a year (JSON or JSONL)
+into two columnar tables, games and players, written as Parquet when pandas
+has a Parquet engine and as gzipped JSON columns (stdlib only) otherwise.
+load_season reads either back as a dict of columns.
+
+Usage:
+    python output_writer.py compact --year 2025 [--format parquet|json]
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import re
+import sys
+from typing import Any, Dict, Iterator, List, Optional
+
+DATA_DIR = 'data'
+SEASON_DIR = os.path.join(DATA_DIR, 'season')
+
+# Directories under data/ that don't hold tournament output
+NON_TOURNAMENT_DIRS = ('tournaments', 'season', 'api_samples')
+
+# Columns of the compacted season tables (tournament columns first)
+TOURNAMENT_COLUMNS = ('tournament_id', 'date', 'gender', 'division')
+GAME_COLUMNS = TOURNAMENT_COLUMNS + ('stage', 'team_1_id', 'team_2_id', 'team_1_score', 'team_2_score',
+                                     'winning_team_id')
+PLAYER_COLUMNS = TOURNAMENT_COLUMNS + ('cbva_username', 'name', 'href', 'team_id')
+INT_COLUMNS = ('team_1_score', 'team_2_score')
+
+TABLES = ('games', 'players')
+FORMATS = ('parquet', 'json')
+FORMAT_SUFFIXES = {'parquet': '.parquet', 'json': '.json.gz'}
+
+
+class JsonlStreamWriter:
+    """Writes one tournament's records as JSON lines while it is scraped"""
+
+    def __init__(self, path: str, tournament_info: Dict[str, Any]):
+        self.path = path
+        self.partial_path = path + '.partial'
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.file = open(self.partial_path, 'w')
+        self.games = 0
+        self.players = 0
+        self.write_record('tournament', tournament_info)
+
+    def write_record(self, record_type: str, data: Dict[str, Any]) -> None:
+        self.file.write(json.dumps({'type': record_type, **data}) + '\n')
+
+    def write_games(self, games: List[Dict[str, Any]]) -> None:
+        """Append games and flush, so progress is on disk if the scrape dies"""
+        for game in games:
+            self.write_record('game', game)
+        self.games += len(games)
+        self.file.flush()
+
+    def write_player(self, player: Dict[str, Any]) -> None:
+        """Append one player in the output format (cbva_username, name, href, team_id)"""
+        self.write_record('player', {key: player.get(key) for key in ('cbva_username', 'name', 'href', 'team_id')})
+        self.players += 1
+
+    def finish(self, output: Dict[str, Any]) -> str:
+        """Write the summary line and publish the file under its final name"""
+        self.write_record('summary', {
+            'scraped_at': output.get('scraped_at'),
+            'fingerprint': output.get('fingerprint'),
+            'stats': output.get('stats')
+        })
+        self.file.close()
+        os.replace(self.partial_path, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        """Discard the partial file (failed or unchanged scrape); no-op after finish()"""
+        if not self.file.closed:
+            self.file.close()
+        if os.path.exists(self.partial_path):
+            os.remove(self.partial_path)
+
+
+def read_tournament(path: str) -> Dict[str, Any]:
+    """Load a tournament output file (.json or .jsonl) into the JSON output structure"""
+    if not path.endswith('.jsonl'):
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    result: Dict[str, Any] = {'tournament': {}, 'games': [], 'players': []}
+    with open(path, 'r') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            record_type = record.pop('type')
+            if record_type == 'tournament':
+                result['tournament'] = record
+            elif record_type == 'game':
+                result['games'].append(record)
+            elif record_type == 'player':
+                result['players'].append(record)
+            elif record_type == 'summary':
+                result.update(record)
+    return result
+
+
+def tournament_files(data_dir: str = DATA_DIR) -> Iterator[str]:
+    """Output file of each scraped tournament, preferring JSON when both formats exist"""
+    paths = glob.glob(os.path.join(data_dir, '*', '*', '*.json')) + \
+        glob.glob(os.path.join(data_dir, '*', '*', '*.jsonl'))
+    chosen: Dict[str, str] = {}
+    for path in sorted(paths):
+        if os.path.relpath(path, data_dir).split(os.sep)[0] in NON_TOURNAMENT_DIRS:
+            continue
+        stem = os.path.splitext(path)[0]
+        if stem not in chosen or path.endswith('.json'):
+            chosen[stem] = path
+    return iter(sorted(chosen.values()))
+
+
+def season_tables(year: int, data_dir: str = DATA_DIR) -> Dict[str, Dict[str, List[Any]]]:
+    """Games and players of every tournament dated in the given year, as columns"""
+    games = {column: [] for column in GAME_COLUMNS}
+    players = {column: [] for column in PLAYER_COLUMNS}
+
+    for path in tournament_files(data_dir):
+        try:
+            result = read_tournament(path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Skipping {path}: {e}", file=sys.stderr)
+            continue
+
+        # Dates are ISO ('2025-03-08') in current output, 'March 9, 2025' in older files
+        tournament = result.get('tournament', {})
+        if not re.search(rf'\b{year}\b', str(tournament.get('date') or '')):
+            continue
+
+        context = {
+            'tournament_id': tournament.get('id'),
+            'date': tournament.get('date'),
+            'gender': tournament.get('gender'),
+            'division': tournament.get('division')
+        }
+        for table, records, columns in ((games, result.get('games', []), GAME_COLUMNS),
+                                        (players, result.get('players', []), PLAYER_COLUMNS)):
+            for record in records:
+                for column in columns:
+                    table[column].append(context[column] if column in context else record.get(column))
+
+    return {'games': games, 'players': players}
+
+
+def parquet_available() -> bool:
+    """True if pandas and one of its Parquet engines are installed"""
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        return False
+    for engine in ('pyarrow', 'fastparquet'):
+        try:
+            __import__(engine)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+def season_paths(year: int, season_dir: str, fmt: str) -> Dict[str, str]:
+    """Table name -> file path of a compacted season in the given format"""
+    return {name: os.path.join(season_dir, f"{year}_{name}{FORMAT_SUFFIXES[fmt]}") for name in TABLES}
+
+
+def compact_season(year: int, data_dir: str = DATA_DIR, out_dir: Optional[str] = None,
+                   fmt: Optional[str] = None) -> List[str]:
+    """
+    Write a season's games and players as compact columnar files.
+
+    Args:
+        year: Season year (matched against tournament dates)
+        data_dir: Scraper data directory
+        out_dir: Output directory (default: {data_dir}/season)
+        fmt: 'parquet' or 'json' (default: parquet if available, else json)
+
+    Returns:
+        Paths written
+    """
+    out_dir = out_dir or os.path.join(data_dir, 'season')
+    fmt = fmt or ('parquet' if parquet_available() else 'json')
+    tables = season_tables(year, data_dir)
+    paths = season_paths(year, out_dir, fmt)
+    os.makedirs(out_dir, exist_ok=True)
+
+    if fmt == 'parquet':
+        import pandas as pd
+
+        for name, columns in tables.items():
+            frame = pd.DataFrame(columns)
+            for column in INT_COLUMNS:
+                if column in frame:
+                    frame[column] = frame[column].astype('Int16')
+            frame.to_parquet(paths[name], index=False)
+        return list(paths.values())
+
+    for name, columns in tables.items():
+        with gzip.open(paths[name], 'wt') as f:
+            json.dump(columns, f, separators=(',', ':'))
+    return list(paths.values())
+
+
+def load_season(year: int, season_dir: str = SEASON_DIR, fmt: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Read a compacted season back as {'games': {column: values}, 'players': {...}}.
+
+    Without fmt, reads whichever format was written most recently.
+    """
+    if fmt is None:
+        written = []
+        for candidate in FORMATS:
+            paths = season_paths(year, season_dir, candidate)
+            if all(os.path.exists(path) for path in paths.values()):
+                written.append((os.path.getmtime(paths['games']), candidate))
+        if not written:
+            raise FileNotFoundError(f"No compacted {year} season in {season_dir}")
+        fmt = max(written)[1]
+
+    paths = season_paths(year, season_dir, fmt)
+    if fmt == 'json':
+        tables = {}
+        for name, path in paths.items():
+            with gzip.open(path, 'rt') as f:
+                tables[name] = json.load(f)
+        return tables
+
+    import pandas as pd
+
+    return {
+        name: {column: values.to_numpy() for column, values in pd.read_parquet(path).items()}
+        for name, path in paths.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CBVA scraper output tools')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    compact_parser = subparsers.add_parser('compact', help='Compact a season of tournament outputs into columnar files')
+    compact_parser.add_argument('--year', type=int, default=2025, help='Season year (default: 2025)')
+    compact_parser.add_argument('--format', choices=FORMATS,
+                               help='Output format (default: parquet if pandas has an engine, else json)')
+    compact_parser.add_argument('--data-dir', default=DATA_DIR, help=f'Scraper data directory (default: {DATA_DIR})')
+    args = parser.parse_args()
+
+    fmt = args.format or ('parquet' if parquet_available() else 'json')
+    paths = compact_season(args.year, args.data_dir, fmt=fmt)
+    tables = load_season(args.year, os.path.dirname(paths[0]), fmt)
+    games = len(next(iter(tables['games'].values()), []))
+    players = len(next(iter(tables['players'].values()), []))
+    print(f"✅ {args.year}: {games} games, {players} player entries")
+    for path in paths:
+        print(f"   {path} ({os.path.getsize(path) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
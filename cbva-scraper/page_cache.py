@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+CBVA Page Cache - Persistent cache of data extracted from CBVA pages
+
+Stores extracted results (team player lists, player ratings) in SQLite keyed
+by page URL, with a per-entry TTL and least-recently-used eviction. The
+database runs in WAL mode with a busy timeout, so concurrent batch_scraper
+workers (threads, asyncio tasks or subprocesses) can share one cache file.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_FILE = 'data/page_cache.sqlite'
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600   # Finished tournament rosters don't change
+DEFAULT_MAX_ENTRIES = 100000
+
+# Eviction check interval (counting rows on every write would scan the table)
+EVICTION_CHECK_INTERVAL = 100
+
+
+class PageCache:
+    """URL -> extracted JSON data, with TTL and LRU eviction"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_FILE, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            path: SQLite database file (created if missing)
+            ttl_seconds: Default age after which entries are treated as missing
+            max_entries: Entries kept before least recently used ones are evicted
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute('CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)')
+
+    def get(self, url: str, ttl_seconds: Optional[float] = None) -> Optional[Any]:
+        """Cached data for a URL, or None if missing or older than the TTL"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        now = time.time()
+
+        with self.lock:
+            row = self.conn.execute('SELECT data, stored_at FROM pages WHERE url = ?', (url,)).fetchone()
+            if row is None or now - row[1] > ttl:
+                self.misses += 1
+                return None
+
+            self.conn.execute('UPDATE pages SET accessed_at = ? WHERE url = ?', (now, url))
+            self.hits += 1
+            return json.loads(row[0])
+
+    def set(self, url: str, data: Any) -> None:
+        """Store data for a URL, evicting least recently used entries over max_entries"""
+        now = time.time()
+
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO pages (url, data, stored_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (url, json.dumps(data), now, now)
+            )
+            self.writes += 1
+            if self.writes % EVICTION_CHECK_INTERVAL:
+                return
+
+            count = self.conn.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+            if count > self.max_entries:
+                self.conn.execute(
+                    'DELETE FROM pages WHERE url IN (SELECT url FROM pages ORDER BY accessed_at LIMIT ?)',
+                    (count - self.max_entries,)
+                )
+
+    def invalidate(self, url: str) -> None:
+        """Drop one URL from the cache"""
+        with self.lock:
+            self.conn.execute('DELETE FROM pages WHERE url = ?', (url,))
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counts for this process and the number of stored entries"""
+        with self.lock:
+            entries = self.conn.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
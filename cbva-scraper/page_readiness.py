@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+CBVA Page Readiness - Event-driven waits for WASM-rendered pages
+
+Replaces fixed sleeps with page-type-specific readiness checks: a page is ready
+once the elements that page type is scraped for are present and the DOM has
+stopped mutating for a short quiet period (tracked by a MutationObserver).
+Time-to-ready is recorded per page type so slow pages show up in histograms.
+"""
+
+import math
+import sys
+import time
+from collections import defaultdict, Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from playwright.async_api import Page
+
+
+@dataclass(frozen=True)
+class PageProfile:
+    """What a page type must render before it can be scraped"""
+    selector: str                       # Elements the scraper reads
+    min_count: int = 1                  # How many of them must exist
+    text_pattern: Optional[str] = None  # Regex the page text must also match
+
+
+PAGE_PROFILES: Dict[str, PageProfile] = {
+    'pool': PageProfile('table a[href*="/teams/"]', min_count=2),
+    'team': PageProfile('a[href*="/p/"]', min_count=2),
+    'bracket': PageProfile('a', min_count=10, text_pattern=r'Round of|Quarterfinals|Semifinals|Finals'),
+    'player': PageProfile('a', min_count=10, text_pattern=r'^[ABCNU]$'),
+    'tournament_list': PageProfile('a[href*="/t/"]', min_count=6),
+}
+
+# Upper bounds (ms) of the time-to-ready histogram buckets
+HISTOGRAM_BUCKETS_MS = (250, 500, 1000, 2000, 5000, 10000, 15000)
+
+# Installs the MutationObserver on first poll, then reports 'ready' once the
+# page-type elements are present and the DOM has been quiet for quietMs.
+# Pages that render without the expected elements (no playoffs, missing pool)
+# resolve as 'not_found' or 'settled' after a longer settle period instead of
+# running out the timeout.
+READINESS_JS = """
+([selector, minCount, textPattern, quietMs, settleMs]) => {
+    if (!window.__cbvaReadiness) {
+        window.__cbvaReadiness = { lastMutation: performance.now() };
+        new MutationObserver(() => { window.__cbvaReadiness.lastMutation = performance.now(); })
+            .observe(document.documentElement, { childList: true, subtree: true, characterData: true });
+    }
+    if (!document.body) return false;
+
+    const quietFor = performance.now() - window.__cbvaReadiness.lastMutation;
+    const text = document.body.innerText;
+
+    const hasElements = document.querySelectorAll(selector).length >= minCount;
+    const hasText = !textPattern || new RegExp(textPattern, 'm').test(text);
+    if (hasElements && hasText && quietFor >= quietMs) return 'ready';
+
+    if (/Page not found/.test(text) && quietFor >= quietMs) return 'not_found';
+
+    const rendered = text.length > 1000 && document.querySelectorAll('a').length > 10;
+    if (rendered && quietFor >= settleMs) return 'settled';
+
+    return false;
+}
+"""
+
+
+class PageReadiness:
+    """Waits for pages to be scrape-ready and records time-to-ready per page type"""
+
+    def __init__(self, quiet_ms: int = 150, settle_ms: int = 1000, poll_ms: int = 50):
+        self.quiet_ms = quiet_ms
+        self.settle_ms = settle_ms
+        self.poll_ms = poll_ms
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+        self.outcomes: Dict[str, Counter] = defaultdict(Counter)
+
+    async def wait(self, page: Page, page_type: str, timeout: int = 10000) -> bool:
+        """
+        Wait until a page of the given type is ready to scrape.
+
+        Returns True if the page rendered (its expected elements, or settled
+        content without them), False on timeout or a not-found page.
+        """
+        profile = PAGE_PROFILES[page_type]
+        start = time.perf_counter()
+
+        try:
+            handle = await page.wait_for_function(
+                READINESS_JS,
+                arg=[profile.selector, profile.min_count, profile.text_pattern, self.quiet_ms, self.settle_ms],
+                timeout=timeout,
+                polling=self.poll_ms
+            )
+            outcome = await handle.json_value()
+        except Exception:
+            outcome = 'timeout'
+
+        self.record(page_type, (time.perf_counter() - start) * 1000, outcome)
+        return outcome in ('ready', 'settled')
+
+    def record(self, page_type: str, elapsed_ms: float, outcome: str) -> None:
+        """Record one page wait"""
+        self.timings[page_type].append(elapsed_ms)
+        self.outcomes[page_type][outcome] += 1
+
+    def merge(self, other: 'PageReadiness') -> None:
+        """Add another tracker's timings (e.g. per-tournament trackers in a batch)"""
+        for page_type, timings in other.timings.items():
+            self.timings[page_type].extend(timings)
+        for page_type, outcomes in other.outcomes.items():
+            self.outcomes[page_type].update(outcomes)
+
+    def histogram(self, page_type: str) -> List[Tuple[str, int]]:
+        """Time-to-ready counts per bucket, e.g. [('<=250ms', 12), ..., ('>15000ms', 0)]"""
+        timings = self.timings.get(page_type, [])
+        buckets = []
+        lower = float('-inf')
+        for upper in HISTOGRAM_BUCKETS_MS:
+            buckets.append((f"<={upper}ms", sum(1 for t in timings if lower < t <= upper)))
+            lower = upper
+        buckets.append((f">{lower:.0f}ms", sum(1 for t in timings if t > lower)))
+        return buckets
+
+    def summary(self) -> Dict[str, Dict]:
+        """Per page type: count, p50/p95/max time-to-ready (ms) and outcome counts"""
+        summary = {}
+        for page_type, timings in self.timings.items():
+            ordered = sorted(timings)
+            summary[page_type] = {
+                'count': len(ordered),
+                'p50_ms': round(percentile(ordered, 50), 1),
+                'p95_ms': round(percentile(ordered, 95), 1),
+                'max_ms': round(ordered[-1], 1),
+                'outcomes': dict(self.outcomes[page_type])
+            }
+        return summary
+
+    def print_summary(self, file=sys.stderr) -> None:
+        """Print time-to-ready percentiles and histograms"""
+        for page_type, stats in self.summary().items():
+            outcomes = ', '.join(f"{k}: {v}" for k, v in stats['outcomes'].items())
+            print(f"  ⏱️  {page_type}: {stats['count']} pages, p50 {stats['p50_ms']}ms, "
+                  f"p95 {stats['p95_ms']}ms, max {stats['max_ms']}ms ({outcomes})", file=file)
+            histogram = '  '.join(f"{label}: {count}" for label, count in self.histogram(page_type) if count)
+            print(f"      {histogram}", file=file)
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a sorted list"""
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+CBVA Playoff Parser - Parses playoff games from bracket page text
+
+The bracket page renders each match as a round header ("Round of 16",
+"Quarterfinals", ...), an optional 'H' line, four player names and the set
+scores, followed by a "Refs:" line. Each line is classified once with
+precompiled patterns and every match reads at most MATCH_WINDOW lines after
+its header, so parsing is linear in the bracket size.
+
+Players are resolved to pool teams through PlayerTeamIndex, which keys
+names by their normalized form (casefolded, accents stripped) and by their
+first/last name tokens instead of scanning every known player per team.
+"""
+
+import re
+import sys
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+
+ROUND_OF_PATTERN = re.compile(r'Round of (\d+)', re.IGNORECASE)
+NAMED_ROUND_PATTERN = re.compile(r'(Quarterfinals|Semifinals|Finals|3rd Place)', re.IGNORECASE)
+RATING_SUFFIX_PATTERN = re.compile(r'\s*\([A-Z]+\)\s*$')
+
+# Lines read after a round header when collecting a match's players and scores
+MATCH_WINDOW = 15
+
+
+def clean_player_name(name: str) -> str:
+    """Clean player name by removing rating indicators like (U), (B), (A), (AA), (AAA), (N)"""
+    return RATING_SUFFIX_PATTERN.sub('', name).strip()
+
+
+def normalize_name(name: str) -> str:
+    """Casefold, strip accents and collapse whitespace"""
+    decomposed = unicodedata.normalize('NFKD', name)
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(stripped.casefold().split())
+
+
+def round_stage(line: str) -> Optional[str]:
+    """Stage name if the line is a round header, else None"""
+    match = ROUND_OF_PATTERN.search(line)
+    if match:
+        return f"Round of {match.group(1)}" if 'Round of' in line else match.group(1)
+
+    match = NAMED_ROUND_PATTERN.search(line)
+    if match:
+        return match.group(1)
+
+    return None
+
+
+def split_scores(scores: List[int]) -> Tuple[List[int], List[int]]:
+    """Split a match's scores into team 1 and team 2 set scores"""
+    if len(scores) == 2:
+        # Single game
+        return [scores[0]], [scores[1]]
+    if len(scores) == 4:
+        # Two games (best of 3)
+        return [scores[0], scores[1]], [scores[2], scores[3]]
+    if len(scores) == 6:
+        # Three games (best of 3)
+        return [scores[0], scores[1], scores[2]], [scores[3], scores[4], scores[5]]
+
+    # Try to split evenly
+    mid = len(scores) // 2
+    return scores[:mid], scores[mid:mid * 2]
+
+
+class PlayerTeamIndex:
+    """Player name -> team ID lookups by exact, normalized and first/last-token keys"""
+
+    def __init__(self, player_team_map: Dict[str, str]):
+        self.exact = dict(player_team_map)
+        self.normalized: Dict[str, str] = {}
+        self.first_last: Dict[Tuple[str, str], str] = {}
+
+        # First player registered under a key wins, matching map order
+        for name, team_id in player_team_map.items():
+            key = normalize_name(name)
+            self.normalized.setdefault(key, team_id)
+            tokens = key.split()
+            if len(tokens) > 1:
+                self.first_last.setdefault((tokens[0], tokens[-1]), team_id)
+
+    def lookup(self, names: List[str]) -> Optional[str]:
+        """Team ID for the first of a team's player names that resolves, trying stricter keys first"""
+        for name in names:
+            if name in self.exact:
+                return self.exact[name]
+
+        keys = [normalize_name(name) for name in names if name]
+        for key in keys:
+            if key in self.normalized:
+                return self.normalized[key]
+
+        for key in keys:
+            tokens = key.split()
+            if len(tokens) > 1 and (tokens[0], tokens[-1]) in self.first_last:
+                return self.first_last[(tokens[0], tokens[-1])]
+
+        return None
+
+
+def collect_match_lines(lines: List[str], stages: List[Optional[str]], start: int) -> Tuple[List[str], List[int]]:
+    """Player names and scores after a round header, up to the refs line or the next header"""
+    players = []
+    scores = []
+
+    # Skip the 'H' line if present
+    if start < len(lines) and lines[start].upper() == 'H':
+        start += 1
+
+    for j in range(start, min(start + MATCH_WINDOW, len(lines))):
+        line = lines[j]
+
+        # Stop at refs or the next round
+        if 'Refs:' in line or line == 'Refs' or stages[j] is not None:
+            break
+
+        if line.isdigit():
+            scores.append(int(line))
+        elif line:
+            players.append(clean_player_name(line))
+
+    return players, scores
+
+
+def parse_playoff_text(text: str, player_team_map: Dict[str, str],
+                       tournament_id: str) -> Tuple[List[Dict[str, Any]], Dict[str, Dict], Dict[str, Dict]]:
+    """
+    Parse playoff games from bracket page text.
+
+    Args:
+        text: Bracket page innerText
+        player_team_map: Player name -> pool team ID
+        tournament_id: Tournament ID for games and synthetic team hrefs
+
+    Returns:
+        (games, teams, players) where teams/players are synthetic playoff
+        entries created for teams that could not be matched to a pool team
+    """
+    lines = [line.strip() for line in text.strip().split('\n')]
+    stages = [round_stage(line) for line in lines]
+    index = PlayerTeamIndex(player_team_map)
+
+    games: List[Dict[str, Any]] = []
+    teams: Dict[str, Dict] = {}
+    players: Dict[str, Dict] = {}
+
+    def playoff_team(team_players: List[str]) -> str:
+        """Create a synthetic team (and its players) for unmatched playoff players"""
+        team_id = f"playoff_{team_players[0].replace(' ', '')}_{team_players[1].replace(' ', '')}"
+        if team_id not in teams:
+            print(f"    📝 Created playoff team ID: {team_id}", file=sys.stderr)
+            teams[team_id] = {
+                'id': team_id,
+                'href': f'/t/{tournament_id}/teams/{team_id}',
+                'pool': 'Playoffs'
+            }
+        for player_name in team_players:
+            if player_name:
+                player_username = player_name.replace(' ', '').lower()
+                players.setdefault(player_username, {
+                    'cbva_username': player_username,
+                    'name': player_name,
+                    'href': f'/p/{player_username}',
+                    'team_id': team_id
+                })
+        return team_id
+
+    for i, stage in enumerate(stages):
+        if stage is None:
+            continue
+
+        print(f"    Found {stage} at line {i}: {lines[i]}", file=sys.stderr)
+        match_players, scores = collect_match_lines(lines, stages, i + 1)
+
+        if len(match_players) < 4 or len(scores) < 2:
+            print(f"    Not enough data for {stage}. Players: {len(match_players)}, Scores: {len(scores)}", file=sys.stderr)
+            if match_players:
+                print(f"    Players found: {match_players[:4]}", file=sys.stderr)
+            if scores:
+                print(f"    Scores found: {scores[:4]}", file=sys.stderr)
+            continue
+
+        team1_players = match_players[0:2]
+        team2_players = match_players[2:4]
+        team1_scores, team2_scores = split_scores(scores)
+
+        team1_id = index.lookup(team1_players) or playoff_team(team1_players)
+        team2_id = index.lookup(team2_players) or playoff_team(team2_players)
+
+        if team1_id == team2_id:
+            print(f"    ⚠️ Skipping match - invalid team IDs: {team1_id} vs {team2_id}", file=sys.stderr)
+            continue
+
+        for game_num in range(min(len(team1_scores), len(team2_scores))):
+            team1_score = team1_scores[game_num]
+            team2_score = team2_scores[game_num]
+
+            # Add game number to stage if multiple games
+            game_stage = f"{stage} - Game {game_num + 1}" if len(team1_scores) > 1 else stage
+
+            games.append({
+                'tournament_id': tournament_id,
+                'stage': game_stage,
+                'team_1_id': team1_id,
+                'team_2_id': team2_id,
+                'team_1_score': team1_score,
+                'team_2_score': team2_score,
+                'winning_team_id': team1_id if team1_score > team2_score else team2_id,
+                'team_1_players': list(team1_players),
+                'team_2_players': list(team2_players)
+            })
+            print(f"    ✅ {game_stage}: {'/'.join(team1_players)} vs {'/'.join(team2_players)} "
+                  f"({team1_score}-{team2_score})", file=sys.stderr)
+
+    return games, teams, players
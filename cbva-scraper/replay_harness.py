@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+CBVA Replay Harness - Records tournament pages once and benchmarks the scraper offline
+
+Recording runs the browser scraper against cbva.com and captures every
+response its pages receive (documents, WASM/JS assets and data requests) into
+a HAR file per tournament, together with the scrape's game/team/player counts.
+
+Replay serves those HAR entries from a local stand-in HTTPS server. Chromium
+is launched with every hostname resolved to that server and certificate
+errors ignored, so CBVATournamentScraper.run loads "cbva.com" unchanged while
+nothing leaves the machine. Requests missing from the recording get a 404.
+
+Each benchmark reports wall time, pages/s and parsed games per fixture and
+flags count changes against the recording, so scraper performance changes
+can be measured (and regression-checked) reproducibly.
+
+Usage:
+    python replay_harness.py record <tournament_id> [<tournament_id> ...]
+    python replay_harness.py bench [<tournament_id> ...] [--repeat N] [--report report.json]
+"""
+
+import argparse
+import asyncio
+import base64
+import glob
+import hashlib
+import json
+import os
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from playwright.async_api import async_playwright, Page, Request, Response
+
+from cbva_scraper import CBVATournamentScraper
+
+FIXTURES_DIR = 'fixtures'
+
+# Response headers that no longer apply once the body has been decoded
+DROPPED_HEADERS = frozenset(('content-encoding', 'content-length', 'transfer-encoding', 'connection',
+                             'alt-svc', 'strict-transport-security'))
+
+# Scrape stats compared between the recording and each replay
+CHECKED_STATS = ('total_matches', 'playoff_matches', 'total_teams', 'total_players')
+
+
+def fixture_paths(tournament_id: str, base_dir: str = FIXTURES_DIR) -> Tuple[str, str]:
+    """HAR file and expected-stats file of a fixture"""
+    return (os.path.join(base_dir, f"{tournament_id}.har"),
+            os.path.join(base_dir, f"{tournament_id}.json"))
+
+
+def request_key(method: str, url: str, body: Optional[bytes] = None) -> Tuple[str, str, str]:
+    """Lookup key of a request: method, host + path + query, and a hash of the body"""
+    parts = urlsplit(url)
+    target = parts.netloc.lower() + parts.path + (f"?{parts.query}" if parts.query else '')
+    body_hash = hashlib.sha256(body).hexdigest()[:16] if body else ''
+    return method.upper(), target, body_hash
+
+
+class HarRecorder:
+    """Captures every response the scraper's pages receive as HAR entries"""
+
+    def __init__(self, tournament_id: str):
+        self.tournament_id = tournament_id
+        self.entries: List[Dict[str, Any]] = []
+        self.pending: List[asyncio.Task] = []
+
+    def attach(self, page: Page) -> None:
+        """Record all responses made by this page"""
+        def on_response(response: Response):
+            self.pending.append(asyncio.ensure_future(self.capture(response)))
+
+        page.on('response', on_response)
+
+    async def capture(self, response: Response) -> None:
+        """Store one response (redirects and unreadable bodies are stored without content)"""
+        request: Request = response.request
+        try:
+            body = await response.body()
+        except Exception:
+            body = b''
+
+        post_data = request.post_data_buffer
+        self.entries.append({
+            'startedDateTime': datetime.now().isoformat(),
+            'request': {
+                'method': request.method,
+                'url': request.url,
+                'headers': [],
+                'postData': {
+                    'mimeType': request.headers.get('content-type', ''),
+                    'text': base64.b64encode(post_data).decode('ascii'),
+                    'encoding': 'base64'
+                } if post_data else None
+            },
+            'response': {
+                'status': response.status,
+                'statusText': response.status_text,
+                'headers': [{'name': k, 'value': v} for k, v in response.headers.items()],
+                'content': {
+                    'size': len(body),
+                    'mimeType': response.headers.get('content-type', ''),
+                    'text': base64.b64encode(body).decode('ascii'),
+                    'encoding': 'base64'
+                }
+            }
+        })
+
+    async def save(self, path: str) -> int:
+        """Write the captured entries as a HAR file; returns the entry count"""
+        if self.pending:
+            await asyncio.gather(*self.pending, return_exceptions=True)
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({
+                'log': {
+                    'version': '1.2',
+                    'creator': {'name': 'cbva-replay-harness', 'version': '1.0'},
+                    'comment': f"CBVA tournament {self.tournament_id}",
+                    'entries': self.entries
+                }
+            }, f)
+        return len(self.entries)
+
+
+class HarFixture:
+    """Recorded responses indexed by request key"""
+
+    def __init__(self, har_path: str):
+        with open(har_path, 'r') as f:
+            entries = json.load(f)['log']['entries']
+
+        self.responses: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self.by_path: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for entry in entries:
+            request = entry['request']
+            post_data = request.get('postData')
+            body = base64.b64decode(post_data['text']) if post_data else None
+            key = request_key(request['method'], request['url'], body)
+
+            # Later captures of the same request win, as in the live session
+            self.responses[key] = entry['response']
+            self.by_path[(key[0], key[1].split('?')[0])] = entry['response']
+
+    def lookup(self, method: str, url: str, body: Optional[bytes]) -> Optional[Dict[str, Any]]:
+        """Recorded response for a request, falling back to the same path with any query string"""
+        key = request_key(method, url, body)
+        return self.responses.get(key) or self.by_path.get((key[0], key[1].split('?')[0]))
+
+
+class ReplayServer:
+    """Local HTTPS stand-in for cbva.com (and every other host) serving one fixture at a time"""
+
+    def __init__(self):
+        self.fixture: Optional[HarFixture] = None
+        self.served = 0
+        self.missing: List[str] = []
+        self.cert_dir = tempfile.TemporaryDirectory()
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), self.handler_class())
+        self.httpd.daemon_threads = True
+        self.httpd.socket = self.ssl_context().wrap_socket(self.httpd.socket, server_side=True)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def ssl_context(self) -> ssl.SSLContext:
+        """Throwaway self-signed certificate (Chromium runs with certificate errors ignored)"""
+        cert = os.path.join(self.cert_dir.name, 'cert.pem')
+        key = os.path.join(self.cert_dir.name, 'key.pem')
+        subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                        '-subj', '/CN=cbva.com', '-keyout', key, '-out', cert],
+                       check=True, capture_output=True)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        return context
+
+    def handler_class(self):
+        server = self
+
+        class ReplayHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def replay(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else None
+                url = f"https://{self.headers.get('Host', '')}{self.path}"
+                response = server.fixture.lookup(self.command, url, body) if server.fixture else None
+
+                if response is None:
+                    server.missing.append(f"{self.command} {url}")
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                content = response['content']
+                payload = base64.b64decode(content.get('text', '')) if content.get('encoding') == 'base64' \
+                    else content.get('text', '').encode('utf-8')
+                server.served += 1
+                self.send_response(response['status'], response.get('statusText') or None)
+                for header in response['headers']:
+                    if header['name'].lower() not in DROPPED_HEADERS:
+                        self.send_header(header['name'], header['value'])
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(payload)
+
+            do_GET = do_POST = do_HEAD = do_PUT = do_OPTIONS = replay
+
+            def log_message(self, format, *args):
+                pass
+
+        return ReplayHandler
+
+    def serve(self, fixture: HarFixture) -> None:
+        """Switch to another fixture and reset the request counters"""
+        self.fixture = fixture
+        self.served = 0
+        self.missing = []
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.cert_dir.cleanup()
+
+    def browser_args(self) -> List[str]:
+        """Chromium flags routing every hostname to this server"""
+        return [f"--host-resolver-rules=MAP * 127.0.0.1:{self.port}", '--ignore-certificate-errors']
+
+
+async def record_fixture(tournament_id: str, base_dir: str = FIXTURES_DIR) -> Dict[str, Any]:
+    """Scrape a tournament live, saving its responses and expected stats as a fixture"""
+    har_path, stats_path = fixture_paths(tournament_id, base_dir)
+    scraper = CBVATournamentScraper(tournament_id)
+    scraper.metrics.base_dir = os.path.join(base_dir, 'metrics')
+    recorder = HarRecorder(tournament_id)
+    scraper.page_hooks.append(recorder.attach)
+
+    result = await scraper.run()
+    entries = await recorder.save(har_path)
+
+    expected = {
+        'tournament_id': tournament_id,
+        'recorded_at': datetime.now().isoformat(),
+        'entries': entries,
+        'stats': {key: result['stats'][key] for key in CHECKED_STATS}
+    }
+    with open(stats_path, 'w') as f:
+        json.dump(expected, f, indent=2)
+
+    print(f"📼 {tournament_id}: {entries} responses -> {har_path} "
+          f"({expected['stats']['total_matches']} games)")
+    return expected
+
+
+async def bench_fixture(server: ReplayServer, tournament_id: str,
+                        base_dir: str = FIXTURES_DIR) -> Dict[str, Any]:
+    """Scrape one fixture through the replay server and measure it"""
+    har_path, stats_path = fixture_paths(tournament_id, base_dir)
+    with open(stats_path, 'r') as f:
+        expected = json.load(f)
+    server.serve(HarFixture(har_path))
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=server.browser_args())
+        try:
+            # No page cache: every page is loaded, so runs are comparable
+            scraper = CBVATournamentScraper(tournament_id)
+            scraper.metrics.base_dir = os.path.join(base_dir, 'metrics')
+            start = time.perf_counter()
+            result = await scraper.run(browser=browser)
+            wall_seconds = time.perf_counter() - start
+        finally:
+            await browser.close()
+
+    pages = sum(1 for r in scraper.metrics.records if r['phase'] == 'navigate')
+    stats = {key: result['stats'][key] for key in CHECKED_STATS}
+    return {
+        'tournament_id': tournament_id,
+        'wall_seconds': round(wall_seconds, 2),
+        'pages': pages,
+        'pages_per_second': round(pages / wall_seconds, 2) if wall_seconds else 0.0,
+        'stats': stats,
+        'expected': expected['stats'],
+        'changed': [key for key in CHECKED_STATS if stats[key] != expected['stats'].get(key)],
+        'responses_served': server.served,
+        'responses_missing': len(server.missing)
+    }
+
+
+async def run_benchmarks(tournament_ids: List[str], repeat: int = 1,
+                         base_dir: str = FIXTURES_DIR) -> List[Dict[str, Any]]:
+    """Benchmark each fixture `repeat` times against one replay server"""
+    server = ReplayServer()
+    server.start()
+    results = []
+    try:
+        for tournament_id in tournament_ids:
+            for run in range(repeat):
+                result = await bench_fixture(server, tournament_id, base_dir)
+                result['run'] = run + 1
+                results.append(result)
+                print_result(result)
+    finally:
+        server.stop()
+    return results
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    """One benchmark line, flagging game/team/player counts that differ from the recording"""
+    stats = result['stats']
+    status = '✅' if not result['changed'] else '⚠️ '
+    print(f"{status} {result['tournament_id']} run {result['run']}: {result['wall_seconds']:.2f}s, "
+          f"{result['pages']} pages ({result['pages_per_second']:.2f} pages/s), "
+          f"{stats['total_matches']} games ({stats['playoff_matches']} playoff), "
+          f"{result['responses_missing']} unrecorded requests")
+    for key in result['changed']:
+        print(f"     {key}: {result['expected'].get(key)} recorded -> {stats[key]} replayed")
+
+
+def print_summary(results: List[Dict[str, Any]]) -> None:
+    """Totals across all fixtures"""
+    if not results:
+        return
+    wall = sum(r['wall_seconds'] for r in results)
+    pages = sum(r['pages'] for r in results)
+    changed = [r for r in results if r['changed']]
+    print(f"\n📊 {len(results)} runs: {wall:.1f}s total, {pages} pages, "
+          f"{pages / wall if wall else 0:.2f} pages/s, {len(changed)} with changed counts")
+
+
+def recorded_fixtures(base_dir: str = FIXTURES_DIR) -> List[str]:
+    """Tournament IDs with a recorded fixture"""
+    return sorted(os.path.basename(path)[:-len('.har')] for path in glob.glob(os.path.join(base_dir, '*.har')))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record CBVA pages and benchmark the scraper offline')
+    parser.add_argument('--fixtures-dir', default=FIXTURES_DIR,
+                       help=f'Directory for HAR fixtures (default: {FIXTURES_DIR})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help='Scrape tournaments live and save them as fixtures')
+    record_parser.add_argument('tournament_ids', nargs='+', help='Tournament IDs to record')
+
+    bench_parser = subparsers.add_parser('bench', help='Scrape recorded fixtures through the local replay server')
+    bench_parser.add_argument('tournament_ids', nargs='*', help='Fixtures to run (default: all recorded)')
+    bench_parser.add_argument('--repeat', type=int, default=1, help='Runs per fixture (default: 1)')
+    bench_parser.add_argument('--report', help='Write benchmark results as JSON to this file')
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        for tournament_id in args.tournament_ids:
+            asyncio.run(record_fixture(tournament_id, args.fixtures_dir))
+        return
+
+    tournament_ids = args.tournament_ids or recorded_fixtures(args.fixtures_dir)
+    if not tournament_ids:
+        print(f"🚫 No fixtures in {args.fixtures_dir}/ - record some first")
+        sys.exit(1)
+
+    results = asyncio.run(run_benchmarks(tournament_ids, max(args.repeat, 1), args.fixtures_dir))
+    print_summary(results)
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"📁 Report: {args.report}")
+
+    if any(r['changed'] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
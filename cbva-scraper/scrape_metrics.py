@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+CBVA Scrape Metrics - Per-page timing records and summaries
+
+Records one entry per page operation: navigation (with bytes transferred
+and retries), the WASM readiness wait and each page.evaluate. A tournament's
+records are written as JSON lines to metrics/{tournament_id}.jsonl with a
+summary in metrics/{tournament_id}_summary.json, so batch runs (including
+subprocess mode) can aggregate p50/p95 by page type and phase.
+"""
+
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from page_readiness import percentile
+
+METRICS_DIR = 'metrics'
+PHASES = ('navigate', 'wait', 'evaluate')
+
+
+class ScrapeMetrics:
+    """Collects page operation records for one tournament (or a merged batch)"""
+
+    def __init__(self, tournament_id: Optional[str] = None, base_dir: str = METRICS_DIR):
+        self.tournament_id = tournament_id
+        self.base_dir = base_dir
+        self.records: List[Dict[str, Any]] = []
+        self.started = time.perf_counter()
+
+    def record(self, page_type: str, phase: str, elapsed_ms: float, ok: bool = True,
+               url: Optional[str] = None, bytes_transferred: int = 0, retries: int = 0,
+               error: Optional[str] = None) -> None:
+        """Record one page operation"""
+        self.records.append({
+            'tournament_id': self.tournament_id,
+            'page_type': page_type,
+            'phase': phase,
+            'ms': round(elapsed_ms, 1),
+            'ok': ok,
+            'url': url,
+            'bytes': bytes_transferred,
+            'retries': retries,
+            'error': error,
+            'at': datetime.now().isoformat()
+        })
+
+    @asynccontextmanager
+    async def timed(self, page_type: str, phase: str, url: Optional[str] = None) -> AsyncIterator[None]:
+        """Time the enclosed block, recording a failure (and re-raising) if it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            self.record(page_type, phase, (time.perf_counter() - start) * 1000, ok=False, url=url,
+                        error=type(e).__name__)
+            raise
+        self.record(page_type, phase, (time.perf_counter() - start) * 1000, url=url)
+
+    def merge(self, other: 'ScrapeMetrics') -> None:
+        """Add another tournament's records"""
+        self.records.extend(other.records)
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Per page type and phase: count, failures, retries, bytes and p50/p95/max (ms)"""
+        grouped = defaultdict(lambda: defaultdict(list))
+        for record in self.records:
+            grouped[record['page_type']][record['phase']].append(record)
+
+        summary = {}
+        for page_type, phases in grouped.items():
+            summary[page_type] = {}
+            for phase, records in phases.items():
+                ordered = sorted(r['ms'] for r in records)
+                summary[page_type][phase] = {
+                    'count': len(records),
+                    'failures': sum(1 for r in records if not r['ok']),
+                    'retries': sum(r['retries'] for r in records),
+                    'bytes': sum(r['bytes'] for r in records),
+                    'p50_ms': round(percentile(ordered, 50), 1),
+                    'p95_ms': round(percentile(ordered, 95), 1),
+                    'max_ms': round(ordered[-1], 1)
+                }
+        return summary
+
+    def save(self, base_dir: Optional[str] = None) -> str:
+        """Write records as JSON lines plus a summary file; returns the JSONL path"""
+        base_dir = base_dir or self.base_dir
+        os.makedirs(base_dir, exist_ok=True)
+        path = os.path.join(base_dir, f"{self.tournament_id}.jsonl")
+        with open(path, 'w') as f:
+            for record in self.records:
+                f.write(json.dumps(record) + '\n')
+
+        with open(os.path.join(base_dir, f"{self.tournament_id}_summary.json"), 'w') as f:
+            json.dump({
+                'tournament_id': self.tournament_id,
+                'wall_seconds': round(time.perf_counter() - self.started, 2),
+                'pages': sum(1 for r in self.records if r['phase'] == 'navigate'),
+                'page_types': self.summary()
+            }, f, indent=2)
+
+        return path
+
+    @classmethod
+    def load(cls, tournament_id: str, base_dir: str = METRICS_DIR,
+             since: Optional[float] = None) -> 'ScrapeMetrics':
+        """
+        Records saved by a (subprocess) scrape; empty if none were written.
+
+        With since (a time.time() timestamp), files last written before it are
+        ignored, so a crashed scrape doesn't pick up an earlier run's records.
+        """
+        metrics = cls(tournament_id)
+        path = os.path.join(base_dir, f"{tournament_id}.jsonl")
+        try:
+            if since is not None and os.path.getmtime(path) < since:
+                return metrics
+            with open(path, 'r') as f:
+                metrics.records = [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError):
+            pass
+        return metrics
+
+    def print_summary(self, file=sys.stderr) -> None:
+        """Print p50/p95 per page type and phase, with failures, retries and bytes"""
+        for page_type, phases in sorted(self.summary().items()):
+            for phase in PHASES:
+                stats = phases.get(phase)
+                if not stats:
+                    continue
+                extras = []
+                if stats['failures']:
+                    extras.append(f"{stats['failures']} failed")
+                if stats['retries']:
+                    extras.append(f"{stats['retries']} retries")
+                if stats['bytes']:
+                    extras.append(f"{stats['bytes'] / 1024:.0f} KB")
+                extra = f" ({', '.join(extras)})" if extras else ''
+                print(f"  📏 {page_type:<8} {phase:<8}: {stats['count']:>4}x  p50 {stats['p50_ms']}ms, "
+                      f"p95 {stats['p95_ms']}ms, max {stats['max_ms']}ms{extra}", file=file)
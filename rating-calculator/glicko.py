@@ -5,6 +5,8 @@ Based on Mark Glickman's Glicko-2 rating system
 import math
 from typing import Tuple
 
+import numpy as np
+
 
 class GlickoCalculator:
     """Glicko-2 rating calculator for beach volleyball ratings."""
@@ -93,6 +95,78 @@ class GlickoCalculator:
         new_rating, new_rd = self.glicko2_to_rating(new_mu, new_phi)
         
         return new_rating, new_rd, new_volatility
+    
+    def glicko2_to_rating_batch(self, mu: np.ndarray, phi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized glicko2_to_rating with the same rounding and clamping."""
+        ratings = np.clip(np.round(mu * 173.7178 + 1500), 100, 3000)
+        rds = np.clip(np.round(phi * 173.7178), 30, 350)
+        return ratings, rds
+    
+    def g_batch(self, phi: np.ndarray) -> np.ndarray:
+        """Vectorized g(φ) function."""
+        return 1 / np.sqrt(1 + 3 * phi * phi / (math.pi * math.pi))
+    
+    def expected_score_batch(self, mu: np.ndarray, mu_j: np.ndarray, phi_j: np.ndarray) -> np.ndarray:
+        """Vectorized expected score E(s|μ,μⱼ,φⱼ)."""
+        return 1 / (1 + np.exp(-self.g_batch(phi_j) * (mu - mu_j)))
+    
+    def calculate_new_ratings_batch(
+        self,
+        ratings: np.ndarray,
+        rds: np.ndarray,
+        volatilities,
+        opponent_ratings: np.ndarray,
+        opponent_rds: np.ndarray,
+        scores: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate new ratings for many independent player/opponent pairs at once.
+        
+        Each element is updated exactly as calculate_new_rating would update it,
+        so results match the scalar path element for element.
+        
+        Args:
+            ratings: Current ratings
+            rds: Current rating deviations
+            volatilities: Current volatilities (array or scalar)
+            opponent_ratings: Opponent ratings
+            opponent_rds: Opponent rating deviations
+            scores: Match scores (1.0 for win, 0.0 for loss, 0.5 for draw)
+            
+        Returns:
+            Tuple of (new_ratings, new_rds, new_volatilities) as float arrays
+        """
+        ratings = np.asarray(ratings, dtype=np.float64)
+        rds = np.asarray(rds, dtype=np.float64)
+        opponent_ratings = np.asarray(opponent_ratings, dtype=np.float64)
+        opponent_rds = np.asarray(opponent_rds, dtype=np.float64)
+        scores = np.asarray(scores, dtype=np.float64)
+        
+        # Convert to Glicko-2 scale
+        mu = (ratings - 1500) / 173.7178
+        phi = rds / 173.7178
+        mu_j = (opponent_ratings - 1500) / 173.7178
+        phi_j = opponent_rds / 173.7178
+        
+        # Calculate variance
+        g_phi_j = self.g_batch(phi_j)
+        expected = self.expected_score_batch(mu, mu_j, phi_j)
+        variance = 1 / (g_phi_j * g_phi_j * expected * (1 - expected))
+        
+        # Constant volatility, as in the scalar path
+        new_volatility = np.broadcast_to(
+            np.asarray(volatilities, dtype=np.float64), ratings.shape
+        ).copy()
+        
+        # Calculate new phi and mu
+        phi_star = np.sqrt(phi * phi + new_volatility * new_volatility)
+        new_phi = 1 / np.sqrt(1 / (phi_star * phi_star) + 1 / variance)
+        new_mu = mu + new_phi * new_phi * g_phi_j * (scores - expected)
+        
+        # Convert back to regular scale
+        new_ratings, new_rds = self.glicko2_to_rating_batch(new_mu, new_phi)
+        
+        return new_ratings, new_rds, new_volatility
 
 
 def calculate_team_rating_change(
@@ -125,4 +199,18 @@ def calculate_team_average_rating(p1_rating: float, p1_rd: float, p2_rating: flo
     """Calculate team's average rating and combined RD."""
     team_rating = (p1_rating + p2_rating) / 2
     team_rd = math.sqrt((p1_rd * p1_rd + p2_rd * p2_rd) / 2)
-    return team_rating, team_rd
\ No newline at end of file
+    return team_rating, team_rd
+
+
+def calculate_team_average_rating_batch(
+    p1_ratings: np.ndarray, p1_rds: np.ndarray,
+    p2_ratings: np.ndarray, p2_rds: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized calculate_team_average_rating over arrays of teams."""
+    p1_ratings = np.asarray(p1_ratings, dtype=np.float64)
+    p2_ratings = np.asarray(p2_ratings, dtype=np.float64)
+    p1_rds = np.asarray(p1_rds, dtype=np.float64)
+    p2_rds = np.asarray(p2_rds, dtype=np.float64)
+    team_ratings = (p1_ratings + p2_ratings) / 2
+    team_rds = np.sqrt((p1_rds * p1_rds + p2_rds * p2_rds) / 2)
+    return team_ratings, team_rds
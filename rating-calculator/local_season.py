@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Local Season
+Ingests cbva-scraper output into a local SQLite database and recomputes ratings from it
+
+This is the offline equivalent of stage-cbva-data.js + process_cbva_tournament
++ simple_rating_calc.py: tournaments are staged with the same rules (teams need
+exactly two players, match_type from the tournament gender, matches played
+from 9 AM five minutes apart), players are resolved by cbva_username, and the
+in-memory engine runs over the result without any database round-trips.
+
+Usage:
+    python local_season.py [--data-dir ../cbva-scraper/data] [--db local_season.db]
+                           [--output calculated_ratings.csv] [--passes 10] [--no-ingest]
+"""
+import argparse
+import importlib.util
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from simple_rating_calc import RatingCalculator, logger
+
+SCRAPER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cbva-scraper')
+SCRAPER_DATA_DIR = os.path.join(SCRAPER_DIR, 'data')
+DEFAULT_DB_PATH = 'local_season.db'
+
+
+def load_scraper_module(name: str):
+    """Import a cbva-scraper module by file path (the scraper is scripts, not a package)."""
+    spec = importlib.util.spec_from_file_location(f'cbva_scraper_{name}', os.path.join(SCRAPER_DIR, f'{name}.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Scraper output (JSON and streamed JSONL) is read with the scraper's own reader
+output_writer = load_scraper_module('output_writer')
+
+# Tournament dates are ISO in current scraper output, 'March 9, 2025' in older files
+DATE_FORMATS = ('%Y-%m-%d', '%B %d, %Y', '%b %d, %Y')
+
+# process_cbva_tournament starts matches at 9 AM, 5 minutes apart
+FIRST_MATCH_HOUR = 9
+MATCH_INTERVAL = timedelta(minutes=5)
+
+# Profiles created from CBVA data get this prefix on their username
+USERNAME_PREFIX = 'cbva_'
+
+PLAYER_FIELDS = ('team1_player1_id', 'team1_player2_id', 'team2_player1_id', 'team2_player2_id')
+MATCH_COLUMNS = ('id', 'tournament_id', 'stage', 'match_number') + PLAYER_FIELDS + \
+    ('team1_score', 'team2_score', 'winning_team', 'match_type', 'played_at')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tournaments (
+    tournament_id TEXT PRIMARY KEY,
+    name TEXT,
+    date TEXT,
+    location TEXT,
+    gender TEXT,
+    division TEXT,
+    source_path TEXT
+);
+CREATE TABLE IF NOT EXISTS players (
+    cbva_username TEXT PRIMARY KEY,
+    full_name TEXT,
+    gender TEXT
+);
+CREATE TABLE IF NOT EXISTS matches (
+    id TEXT PRIMARY KEY,
+    tournament_id TEXT NOT NULL,
+    stage TEXT,
+    match_number INTEGER,
+    team1_player1_id TEXT NOT NULL,
+    team1_player2_id TEXT NOT NULL,
+    team2_player1_id TEXT NOT NULL,
+    team2_player2_id TEXT NOT NULL,
+    team1_score INTEGER,
+    team2_score INTEGER,
+    winning_team INTEGER,
+    match_type TEXT,
+    played_at TEXT
+);
+CREATE INDEX IF NOT EXISTS matches_played_at ON matches (played_at, id);
+CREATE INDEX IF NOT EXISTS matches_tournament ON matches (tournament_id);
+"""
+
+
+def parse_tournament_date(date: Optional[str]) -> Optional[datetime]:
+    """Parse a scraped tournament date, or None if it is missing or unrecognized."""
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime((date or '').strip(), date_format).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    return None
+
+
+def tournament_info(path: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Tournament row for an output file; gender and division come from the data/{Men|Women}/{division} path."""
+    tournament = result.get('tournament') or {}
+    parts = os.path.normpath(path).split(os.sep)[:-1]
+    gender = tournament.get('gender')
+    division = tournament.get('division')
+    for idx, part in enumerate(parts):
+        if part in ('Men', 'Women'):
+            gender = part
+            division = parts[idx + 1] if idx + 1 < len(parts) else division
+            break
+
+    return {
+        'tournament_id': tournament.get('id') or os.path.splitext(os.path.basename(path))[0],
+        'name': tournament.get('name'),
+        'date': tournament.get('date'),
+        'location': tournament.get('location'),
+        'gender': 'female' if gender in ('Women', 'female') else 'male',
+        'division': division or 'Open',
+        'source_path': path
+    }
+
+
+def stage_matches(result: Dict[str, Any], info: Dict[str, Any],
+                  match_date: datetime) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Build match rows for a tournament the way stage-cbva-data.js and process_cbva_tournament do.
+
+    Returns:
+        Tuple of (match rows, games skipped for not having two full teams or scores)
+    """
+    team_players: Dict[str, List[str]] = {}
+    for player in result.get('players', []):
+        team_players.setdefault(player.get('team_id'), []).append(
+            player.get('cbva_username') or player.get('username')
+        )
+
+    match_type = 'womens' if info['gender'] == 'female' else 'mens'
+    first_match = match_date.replace(hour=FIRST_MATCH_HOUR)
+    matches = []
+    skipped = 0
+
+    for index, game in enumerate(result.get('games') or result.get('matches') or []):
+        team1 = team_players.get(game.get('team_1_id'), [])
+        team2 = team_players.get(game.get('team_2_id'), [])
+        team1_score = game.get('team_1_score')
+        team2_score = game.get('team_2_score')
+        if len(team1) != 2 or len(team2) != 2 or team1_score is None or team2_score is None:
+            skipped += 1
+            continue
+
+        match_number = index + 1
+        matches.append({
+            'id': f"{info['tournament_id']}-{match_number}",
+            'tournament_id': info['tournament_id'],
+            'stage': game.get('stage') or 'Match',
+            'match_number': match_number,
+            'team1_player1_id': team1[0],
+            'team1_player2_id': team1[1],
+            'team2_player1_id': team2[0],
+            'team2_player2_id': team2[1],
+            'team1_score': team1_score,
+            'team2_score': team2_score,
+            'winning_team': 1 if team1_score > team2_score else 2,
+            'match_type': match_type,
+            'played_at': (first_match + (match_number - 1) * MATCH_INTERVAL).isoformat()
+        })
+
+    return matches, skipped
+
+
+class LocalSeasonDB:
+    """SQLite store of staged CBVA tournaments, players and matches."""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def ingest_file(self, path: str) -> Optional[Tuple[int, int]]:
+        """
+        Stage one tournament output file, replacing any earlier import of the same tournament.
+
+        Returns:
+            Tuple of (matches staged, games skipped), or None if the file was skipped
+        """
+        try:
+            result = output_writer.read_tournament(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  Skipping {path}: {e}")
+            return None
+
+        info = tournament_info(path, result)
+        match_date = parse_tournament_date(info['date'])
+        if match_date is None:
+            logger.warning(f"⚠️  Skipping {path}: unrecognized tournament date {info['date']!r}")
+            return None
+
+        matches, skipped = stage_matches(result, info, match_date)
+
+        # A player's first sighting wins, as with profiles created by process_cbva_tournament
+        players = []
+        for player in result.get('players', []):
+            username = player.get('cbva_username') or player.get('username')
+            if username:
+                players.append((username, player.get('name') or player.get('full_name') or username,
+                                player.get('gender') or info['gender']))
+
+        with self.conn:
+            self.conn.execute("DELETE FROM matches WHERE tournament_id = ?", (info['tournament_id'],))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO tournaments VALUES (:tournament_id, :name, :date, :location, "
+                ":gender, :division, :source_path)", info
+            )
+            self.conn.executemany("INSERT OR IGNORE INTO players VALUES (?, ?, ?)", players)
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO matches ({', '.join(MATCH_COLUMNS)}) "
+                f"VALUES ({', '.join(':' + column for column in MATCH_COLUMNS)})", matches
+            )
+
+        return len(matches), skipped
+
+    def ingest(self, data_dir: str = SCRAPER_DATA_DIR) -> Dict[str, int]:
+        """Stage every tournament output file under data_dir."""
+        stats = {'files': 0, 'tournaments': 0, 'matches': 0, 'skipped_games': 0, 'skipped_files': 0}
+        for path in output_writer.tournament_files(data_dir):
+            stats['files'] += 1
+            staged = self.ingest_file(path)
+            if staged is None:
+                stats['skipped_files'] += 1
+                continue
+            stats['tournaments'] += 1
+            stats['matches'] += staged[0]
+            stats['skipped_games'] += staged[1]
+        return stats
+
+    def get_all_matches(self) -> List[Dict]:
+        """Matches in the get_all_matches shape, in chronological order."""
+        query = f"SELECT id, match_type, winning_team, played_at, {', '.join(PLAYER_FIELDS)} FROM matches"
+        return [dict(row) for row in self.conn.execute(query + " ORDER BY played_at, id")]
+
+    def match_divisions(self) -> Dict[str, str]:
+        """Division of each match's tournament, keyed by match ID."""
+        return dict(self.conn.execute(
+            "SELECT matches.id, tournaments.division FROM matches JOIN tournaments USING (tournament_id)"
+        ).fetchall())
+
+    def player_ids(self) -> List[str]:
+        """Every staged player's cbva_username (the local player ID)."""
+        return [row[0] for row in self.conn.execute("SELECT cbva_username FROM players ORDER BY cbva_username")]
+
+    def stats(self) -> Dict[str, int]:
+        """Row counts per table."""
+        return {
+            table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ('tournaments', 'players', 'matches')
+        }
+
+
+class LocalRatingCalculator(RatingCalculator):
+    """RatingCalculator that reads matches from a LocalSeasonDB and writes ratings only to CSV."""
+
+    def __init__(self, db: LocalSeasonDB, output_file: str = "calculated_ratings.csv"):
+        """Load the same rating settings as RatingCalculator, without a database connection."""
+        super().__init__(connect=False)
+        self.db = db
+        self.output_file = output_file
+
+    def get_all_matches(self) -> List[Dict]:
+        return self.db.get_all_matches()
+
+    def get_all_player_ratings(self) -> Dict[str, Dict]:
+        """Every staged player, starting from default ratings."""
+        return {player_id: {'id': player_id} for player_id in self.db.player_ids()}
+
+    def get_usernames(self, player_ids: List[str]) -> Dict[str, str]:
+        """Usernames as process_cbva_tournament creates them (cbva_ prefix)."""
+        return {player_id: USERNAME_PREFIX + player_id for player_id in player_ids}
+
+    def update_all_ratings_batch(self, player_ratings: Dict[str, Dict],
+                                 csv_ratings: Dict[str, Dict] = None) -> bool:
+        return self.save_ratings_csv(player_ratings if csv_ratings is None else csv_ratings, self.output_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recompute ratings from local cbva-scraper output')
+    parser.add_argument('--data-dir', default=SCRAPER_DATA_DIR, help='cbva-scraper data directory')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help=f'SQLite database (default: {DEFAULT_DB_PATH})')
+    parser.add_argument('--output', default='calculated_ratings.csv', help='Ratings CSV (default: calculated_ratings.csv)')
+    parser.add_argument('--passes', type=int, default=10, help='Maximum passes (default: 10)')
+    parser.add_argument('--no-ingest', action='store_true', help='Use the database as is, without re-reading scraper output')
+    args = parser.parse_args()
+
+    print("🏐 Sand Volleyball Rating Calculator (Local Season)\n")
+    start = time.perf_counter()
+    db = LocalSeasonDB(args.db)
+
+    try:
+        if not args.no_ingest:
+            stats = db.ingest(args.data_dir)
+            print(f"📥 Ingested {stats['tournaments']}/{stats['files']} tournaments, {stats['matches']} matches "
+                  f"({stats['skipped_games']} games without two full teams, {stats['skipped_files']} files skipped) "
+                  f"in {time.perf_counter() - start:.1f}s")
+
+        counts = db.stats()
+        print(f"📊 {args.db}: {counts['tournaments']} tournaments, {counts['players']} players, "
+              f"{counts['matches']} matches\n")
+
+        calc = LocalRatingCalculator(db, args.output)
+        success = calc.calculate_all_ratings_iterative(num_passes=args.passes)
+    finally:
+        db.close()
+
+    if success:
+        print(f"\n🎉 Wrote {args.output} in {time.perf_counter() - start:.1f}s")
+    else:
+        print("\n⚠️  Local rating calculation failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Match Encoding
+Converts fetched match rows into integer/float arrays once per recompute
+"""
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from rating_store import RatingStore, gender_code
+
+PLAYER_FIELDS = ('team1_player1_id', 'team1_player2_id', 'team2_player1_id', 'team2_player2_id')
+
+
+def parse_played_at(played_at: str) -> datetime:
+    """Parse a PostgREST timestamp (which may use a 'Z' suffix)."""
+    return datetime.fromisoformat(played_at.replace('Z', '+00:00'))
+
+
+def time_weights_from_days(days_ago: np.ndarray, half_life_days: float, min_time_weight: float) -> np.ndarray:
+    """Exponential-decay time weights, floored at min_time_weight (vectorized calculate_time_weight)."""
+    weights = 0.5 ** (days_ago / half_life_days)
+    return np.maximum(weights, min_time_weight)
+
+
+class EncodedMatches:
+    """
+    Matches pre-encoded for the rating engines.
+
+    Attributes:
+        match_ids: Match UUIDs, in chronological order
+        played_at: Raw played_at strings
+        players: (n, 4) store indices ordered t1p1, t1p2, t2p1, t2p2
+        genders: (n,) rating pool (rating_store.MENS / WOMENS)
+        winners: (n,) winning team (1 or 2, 0 if unknown)
+        days_ago: (n,) whole days between played_at and the reference date
+        time_weights: (n,) precomputed time weights (1.0 without a reference date)
+    """
+
+    def __init__(self, match_ids: List[str], played_at: List[str], players: np.ndarray,
+                 genders: np.ndarray, winners: np.ndarray, days_ago: np.ndarray,
+                 time_weights: np.ndarray):
+        self.match_ids = match_ids
+        self.played_at = played_at
+        self.players = players
+        self.genders = genders
+        self.winners = winners
+        self.days_ago = days_ago
+        self.time_weights = time_weights
+
+    def __len__(self) -> int:
+        return len(self.match_ids)
+
+    def with_time_weights(self, half_life_days: float, min_time_weight: float) -> 'EncodedMatches':
+        """Copy sharing all arrays except time_weights, recomputed for other decay settings."""
+        return EncodedMatches(
+            self.match_ids, self.played_at, self.players, self.genders, self.winners,
+            self.days_ago, time_weights_from_days(self.days_ago, half_life_days, min_time_weight)
+        )
+
+    def subset(self, indices) -> 'EncodedMatches':
+        """Select matches by index or boolean mask (order is preserved)."""
+        indices = np.arange(len(self))[indices]
+        return EncodedMatches(
+            [self.match_ids[i] for i in indices],
+            [self.played_at[i] for i in indices],
+            self.players[indices],
+            self.genders[indices],
+            self.winners[indices],
+            self.days_ago[indices],
+            self.time_weights[indices]
+        )
+
+
+def encode_matches(matches: List[Dict], store: RatingStore, current_date: datetime = None,
+                   half_life_days: float = 180, min_time_weight: float = 0.1
+                   ) -> Tuple[EncodedMatches, List[Dict]]:
+    """
+    Encode chronologically ordered match rows against a rating store.
+
+    Matches with a player missing from the store cannot be rated and are
+    returned separately instead of being encoded.
+
+    Args:
+        matches: Match rows as returned by get_all_matches
+        store: Rating store the player indices refer to
+        current_date: Reference date for time weighting (None disables weighting)
+        half_life_days: Time weight half-life
+        min_time_weight: Lower bound for time weights
+
+    Returns:
+        Tuple of (encoded matches, skipped match rows)
+    """
+    index = store.index
+    match_ids = []
+    played_at = []
+    players = []
+    genders = []
+    winners = []
+    days_ago = []
+    skipped = []
+
+    for match in matches:
+        try:
+            player_idx = [index[match[field]] for field in PLAYER_FIELDS]
+        except KeyError:
+            skipped.append(match)
+            continue
+
+        match_ids.append(match['id'])
+        played_at.append(match['played_at'])
+        players.append(player_idx)
+        genders.append(gender_code(match['match_type']))
+        winners.append(match['winning_team'] if match['winning_team'] in (1, 2) else 0)
+        if current_date:
+            days_ago.append((current_date - parse_played_at(match['played_at'])).days)
+
+    num_matches = len(match_ids)
+    days_ago = np.array(days_ago, dtype=np.float64) if current_date else np.zeros(num_matches)
+    if current_date:
+        time_weights = time_weights_from_days(days_ago, half_life_days, min_time_weight)
+    else:
+        time_weights = np.ones(num_matches)
+
+    encoded = EncodedMatches(
+        match_ids,
+        played_at,
+        np.array(players, dtype=np.int64).reshape(-1, 4),
+        np.array(genders, dtype=np.int8),
+        np.array(winners, dtype=np.int8),
+        days_ago,
+        time_weights
+    )
+    return encoded, skipped
@@ -0,0 +1,44 @@
+"""
+Match Scheduler
+Splits a chronological match list into conflict-free waves for batch rating updates
+"""
+from typing import Dict, List
+
+import numpy as np
+
+
+def build_match_waves(players: np.ndarray, genders: np.ndarray) -> List[np.ndarray]:
+    """
+    Group chronologically ordered matches into waves that can be updated together.
+
+    A match only touches the ratings of its four players in its own rating
+    pool, so it is placed in the wave right after the last wave that touched
+    any of those rating slots. No rating slot appears twice in a wave, and
+    every slot still sees its matches in the original order, so applying the
+    waves in sequence gives the same ratings as applying the matches one at
+    a time.
+
+    Args:
+        players: (n, 4) player store indices, in chronological match order
+        genders: (n,) rating pool of each match
+
+    Returns:
+        List of waves, each an ascending array of match indices
+    """
+    # One integer key per (player, rating pool) slot
+    slot_keys = (players.astype(np.int64) * 2 + genders.astype(np.int64)[:, None]).tolist()
+
+    last_wave: Dict[int, int] = {}
+    waves: List[List[int]] = []
+
+    for idx, keys in enumerate(slot_keys):
+        wave_num = max(last_wave.get(key, -1) for key in keys) + 1
+
+        if wave_num == len(waves):
+            waves.append([])
+        waves[wave_num].append(idx)
+
+        for key in keys:
+            last_wave[key] = wave_num
+
+    return [np.array(wave, dtype=np.int64) for wave in waves]
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Parameter Sweep
+Scores a grid of rating parameters by how well they predict held-out later matches
+
+Matches are loaded and encoded once, then copied into shared memory blocks
+that every worker in the process pool attaches to, so a task only carries
+its parameter set. Each set rates the earlier (training) matches in one
+chronological pass, then replays the held-out later matches wave by wave,
+predicting each match from pre-match ratings before applying it. Sets are
+ranked by log-loss on those predictions (see rating_evaluation).
+
+GlickoCalculator's tau is not swept: the engines keep volatility constant,
+so tau never enters a rating update.
+
+Usage:
+    python parameter_sweep.py [--db local_season.db | --database [--production]]
+                              [--half-life 90,180,365] [--min-weight 0.05,0.1,0.2]
+                              [--volatility 0.03,0.06,0.09] [--holdout 0.2]
+                              [--workers N] [--output sweep_results.csv]
+"""
+import argparse
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from glicko import GlickoCalculator
+from local_season import DEFAULT_DB_PATH, LocalRatingCalculator, LocalSeasonDB
+from match_encoding import EncodedMatches, encode_matches
+from match_scheduler import build_match_waves
+from rating_engine import run_wave_pass
+from rating_evaluation import prediction_metrics, replay_predictions
+from rating_store import RatingStore
+from simple_rating_calc import RatingCalculator
+
+# Encoded match arrays shared with the workers (train and holdout sets alike)
+MATCH_ARRAYS = ('players', 'genders', 'winners', 'days_ago')
+
+# Attached shared memory and match sets, set up once per worker by init_worker
+_worker: Dict = {}
+
+
+def parse_grid(values: str, cast=float) -> List:
+    """Parse a comma-separated list of grid values."""
+    return [cast(value) for value in values.split(',') if value.strip()]
+
+
+def flatten_waves(waves: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatenate waves into one index array plus (num_waves + 1) boundaries."""
+    order = np.concatenate(waves) if waves else np.zeros(0, dtype=np.int64)
+    bounds = np.cumsum([0] + [len(wave) for wave in waves]).astype(np.int64)
+    return order, bounds
+
+
+def unflatten_waves(order: np.ndarray, bounds: np.ndarray) -> List[np.ndarray]:
+    """Views of each wave in a flattened wave array."""
+    return [order[bounds[i]:bounds[i + 1]] for i in range(len(bounds) - 1)]
+
+
+class SharedArrays:
+    """NumPy arrays copied once into named shared memory blocks."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.blocks: Dict[str, shared_memory.SharedMemory] = {}
+        self.specs: Dict[str, Tuple[str, tuple, str]] = {}
+
+        for name, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self.blocks[name] = block
+            self.specs[name] = (block.name, array.shape, array.dtype.str)
+
+    def close(self) -> None:
+        """Release and remove the shared memory blocks."""
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+
+
+def attach_arrays(specs: Dict[str, Tuple[str, tuple, str]]
+                  ) -> Tuple[List[shared_memory.SharedMemory], Dict[str, np.ndarray]]:
+    """Attach to shared arrays created by SharedArrays (keep the blocks alive while in use)."""
+    blocks = []
+    arrays = {}
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    return blocks, arrays
+
+
+def match_set(arrays: Dict[str, np.ndarray], prefix: str) -> Tuple[EncodedMatches, List[np.ndarray]]:
+    """Rebuild an encoded match set and its waves from shared arrays (IDs and timestamps aren't shared)."""
+    num_matches = len(arrays[f'{prefix}/winners'])
+    encoded = EncodedMatches(
+        range(num_matches), range(num_matches),
+        *(arrays[f'{prefix}/{name}'] for name in MATCH_ARRAYS),
+        np.ones(num_matches)
+    )
+    return encoded, unflatten_waves(arrays[f'{prefix}/wave_order'], arrays[f'{prefix}/wave_bounds'])
+
+
+def init_worker(specs: Dict, num_players: int, default_rating: float, default_rd: float) -> None:
+    """Attach a pool worker to the shared match arrays."""
+    blocks, arrays = attach_arrays(specs)
+    _worker['blocks'] = blocks
+    _worker['train'] = match_set(arrays, 'train')
+    _worker['holdout'] = match_set(arrays, 'holdout')
+    _worker['num_players'] = num_players
+    _worker['defaults'] = (default_rating, default_rd)
+
+
+def evaluate_params(params: Dict) -> Dict:
+    """Rate the training matches with one parameter set and score its held-out predictions."""
+    train, train_waves = _worker['train']
+    holdout, holdout_waves = _worker['holdout']
+    train = train.with_time_weights(params['half_life_days'], params['min_time_weight'])
+    holdout = holdout.with_time_weights(params['half_life_days'], params['min_time_weight'])
+
+    store = RatingStore(range(_worker['num_players']), *_worker['defaults'])
+    calculator = GlickoCalculator()
+
+    start = time.perf_counter()
+    run_wave_pass(train, train_waves, store, calculator, params['volatility'])
+    expected = replay_predictions(holdout, holdout_waves, store, calculator, params['volatility'])
+
+    return {**params, **prediction_metrics(expected, holdout.winners),
+            'seconds': round(time.perf_counter() - start, 3)}
+
+
+def load_matches(args) -> Tuple[RatingCalculator, List[Dict], List[str]]:
+    """Matches and player IDs from the local season database or (--database) Supabase."""
+    if args.database:
+        calc = RatingCalculator(use_production=args.production)
+        return calc, calc.get_all_matches(), list(calc.get_all_player_ratings().keys())
+
+    db = LocalSeasonDB(args.db)
+    try:
+        return LocalRatingCalculator(db), db.get_all_matches(), db.player_ids()
+    finally:
+        db.close()
+
+
+def shared_match_arrays(encoded: EncodedMatches, cutoff: int) -> Dict[str, np.ndarray]:
+    """Train/holdout match arrays and their waves, keyed '{set}/{array}'."""
+    arrays = {}
+    for prefix, part in (('train', encoded.subset(slice(None, cutoff))),
+                         ('holdout', encoded.subset(slice(cutoff, None)))):
+        for name in MATCH_ARRAYS:
+            arrays[f'{prefix}/{name}'] = getattr(part, name)
+        order, bounds = flatten_waves(build_match_waves(part.players, part.genders))
+        arrays[f'{prefix}/wave_order'] = order
+        arrays[f'{prefix}/wave_bounds'] = bounds
+    return arrays
+
+
+def write_results(results: List[Dict], filename: str) -> None:
+    """Write ranked results to CSV."""
+    with open(filename, 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=['rank'] + list(results[0].keys()))
+        writer.writeheader()
+        for rank, result in enumerate(results, 1):
+            writer.writerow({'rank': rank, **result})
+
+
+def print_results(results: List[Dict], current: Dict, top: int) -> None:
+    """Print the best parameter sets, marking the currently configured one."""
+    print(f"\n{'Rank':>4}  {'Half-life':>9}  {'Min weight':>10}  {'Volatility':>10}  {'Log-loss':>8}  {'Brier':>7}  {'Accuracy':>8}")
+    for rank, result in enumerate(results, 1):
+        is_current = all(result[key] == value for key, value in current.items())
+        if rank > top and not is_current:
+            continue
+        print(f"{rank:>4}  {result['half_life_days']:>9g}  {result['min_time_weight']:>10g}  "
+              f"{result['volatility']:>10g}  {result['log_loss']:>8.4f}  {result['brier']:>7.4f}  {result['accuracy']:>8.1%}"
+              f"{'  ← current' if is_current else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sweep rating parameters scored on held-out matches')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help=f'Local season database (default: {DEFAULT_DB_PATH})')
+    parser.add_argument('--database', action='store_true', help='Load matches from Supabase instead of the local database')
+    parser.add_argument('--production', action='store_true', help='With --database, use the production database')
+    parser.add_argument('--half-life', default='90,180,365', help='RATING_HALF_LIFE_DAYS values (default: 90,180,365)')
+    parser.add_argument('--min-weight', default='0.05,0.1,0.2', help='MIN_TIME_WEIGHT values (default: 0.05,0.1,0.2)')
+    parser.add_argument('--volatility', default='0.03,0.06,0.09', help='VOLATILITY values (default: 0.03,0.06,0.09)')
+    parser.add_argument('--holdout', type=float, default=0.2, help='Fraction of latest matches held out (default: 0.2)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes (default: CPU count)')
+    parser.add_argument('--output', default='sweep_results.csv', help='Ranked results CSV (default: sweep_results.csv)')
+    parser.add_argument('--top', type=int, default=10, help='Rows to print (default: 10)')
+    args = parser.parse_args()
+
+    print("🏐 Sand Volleyball Rating Parameter Sweep\n")
+    calc, all_matches, player_ids = load_matches(args)
+    store = RatingStore(player_ids, calc.default_rating, calc.default_rd)
+    encoded, skipped = encode_matches(all_matches, store, datetime.now(timezone.utc))
+
+    cutoff = int(len(encoded) * (1 - args.holdout))
+    if cutoff == 0 or cutoff == len(encoded):
+        print(f"❌ Need matches on both sides of the holdout split ({len(encoded)} matches, holdout {args.holdout})")
+        return
+    print(f"📊 {len(encoded)} matches ({len(skipped)} skipped for missing players): "
+          f"{cutoff} training, {len(encoded) - cutoff} held out from {encoded.played_at[cutoff][:10]}")
+
+    grid = [
+        {'half_life_days': half_life, 'min_time_weight': min_weight, 'volatility': volatility}
+        for half_life, min_weight, volatility in itertools.product(
+            parse_grid(args.half_life), parse_grid(args.min_weight), parse_grid(args.volatility)
+        )
+    ]
+    print(f"🧪 Evaluating {len(grid)} parameter sets on {args.workers} workers...")
+
+    start = time.perf_counter()
+    shared = SharedArrays(shared_match_arrays(encoded, cutoff))
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                                 initargs=(shared.specs, len(store), calc.default_rating, calc.default_rd)) as pool:
+            results = list(pool.map(evaluate_params, grid))
+    finally:
+        shared.close()
+
+    results.sort(key=lambda result: result['log_loss'])
+    write_results(results, args.output)
+
+    current = {'half_life_days': calc.half_life_days, 'min_time_weight': calc.min_time_weight,
+               'volatility': calc.volatility}
+    print_results(results, current, args.top)
+    print(f"\n✅ Evaluated {len(grid)} parameter sets in {time.perf_counter() - start:.1f}s, "
+          f"results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Rating Checkpoint
+Persists in-memory rating state and a digest of the processed matches between runs
+"""
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from rating_store import RatingStore, MENS, WOMENS
+
+CHECKPOINT_VERSION = 2
+
+# Match fields that affect ratings, hashed into the processed-prefix digest
+DIGEST_FIELDS = ('id', 'played_at', 'match_type', 'winning_team',
+                 'team1_player1_id', 'team1_player2_id', 'team2_player1_id', 'team2_player2_id')
+
+
+def matches_digest(matches: List[Dict]) -> str:
+    """Hash of the rating-relevant fields of chronologically ordered matches."""
+    digest = hashlib.sha256()
+    for match in matches:
+        digest.update(json.dumps([match.get(field) for field in DIGEST_FIELDS]).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def save_checkpoint(path: str, store: RatingStore, processed_matches: List[Dict], config: Dict) -> None:
+    """
+    Save rating state plus a fingerprint of the matches it includes.
+
+    Args:
+        path: Checkpoint file path
+        store: Ratings after processing processed_matches
+        processed_matches: Every (non-deleted) match processed, in chronological order
+        config: Rating settings the state was computed with
+    """
+    checkpoint = {
+        'version': CHECKPOINT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'watermark': processed_matches[-1]['played_at'] if processed_matches else None,
+        'processed_matches': len(processed_matches),
+        'prefix_digest': matches_digest(processed_matches),
+        'config': config,
+        'ratings': {
+            pid: [
+                int(store.ratings[MENS, idx]), int(store.rds[MENS, idx]),
+                int(store.ratings[WOMENS, idx]), int(store.rds[WOMENS, idx])
+            ]
+            for idx, pid in enumerate(store.player_ids)
+        }
+    }
+
+    # Write atomically so an interrupted run never leaves a truncated checkpoint
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str) -> Optional[Dict]:
+    """Load a checkpoint, or None if it is missing or from another format version."""
+    if not os.path.exists(path):
+        return None
+
+    with open(path, 'r') as f:
+        checkpoint = json.load(f)
+
+    if checkpoint.get('version') != CHECKPOINT_VERSION:
+        return None
+
+    return checkpoint
+
+
+def checkpoint_age_days(checkpoint: Dict, current_date: datetime) -> float:
+    """Days since the checkpoint was written."""
+    created_at = datetime.fromisoformat(checkpoint['created_at'])
+    return (current_date - created_at).total_seconds() / 86400
+
+
+def store_from_checkpoint(checkpoint: Dict, player_ids: List[str], default_rating: float,
+                          default_rd: float) -> RatingStore:
+    """
+    Build a rating store for the current players from checkpointed ratings.
+
+    Players created since the checkpoint start at the default rating.
+    """
+    store = RatingStore(player_ids, default_rating, default_rd)
+    saved = checkpoint['ratings']
+
+    for idx, pid in enumerate(store.player_ids):
+        if pid in saved:
+            mens_rating, mens_rd, womens_rating, womens_rd = saved[pid]
+            store.ratings[:, idx] = (mens_rating, womens_rating)
+            store.rds[:, idx] = (mens_rd, womens_rd)
+
+    return store
+
+
+def touched_players(store: RatingStore, players: np.ndarray) -> List[str]:
+    """Player UUIDs referenced by an (n, 4) array of store indices."""
+    return [store.player_ids[idx] for idx in np.unique(players)]
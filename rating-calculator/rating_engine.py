@@ -0,0 +1,135 @@
+"""
+Rating Engine
+Applies encoded matches to a rating store, one match at a time or in conflict-free waves
+"""
+from typing import List, Sequence
+
+import numpy as np
+
+from glicko import (
+    GlickoCalculator,
+    calculate_team_rating_change,
+    calculate_team_average_rating,
+    calculate_team_average_rating_batch
+)
+from match_encoding import EncodedMatches
+from rating_store import RatingStore
+
+ENGINES = ('wave', 'sequential')
+
+
+def update_match(store: RatingStore, player_idx: Sequence[int], gender: int, winner: int,
+                 time_weight: float, calculator: GlickoCalculator, volatility: float) -> None:
+    """
+    Apply a single match to the rating store.
+
+    Args:
+        store: Rating store to read and update
+        player_idx: Store indices ordered t1p1, t1p2, t2p1, t2p2
+        gender: Rating pool to update
+        winner: Winning team (1 or 2)
+        time_weight: Weight pulling the match score toward 0.5
+        calculator: Glicko calculator
+        volatility: Player volatility
+    """
+    ratings = store.ratings[gender]
+    rds = store.rds[gender]
+    p1, p2, p3, p4 = player_idx
+
+    p1_rating, p1_rd = float(ratings[p1]), float(rds[p1])
+    p2_rating, p2_rd = float(ratings[p2]), float(rds[p2])
+    p3_rating, p3_rd = float(ratings[p3]), float(rds[p3])
+    p4_rating, p4_rd = float(ratings[p4]), float(rds[p4])
+
+    # Calculate team averages
+    team1_rating, team1_rd = calculate_team_average_rating(p1_rating, p1_rd, p2_rating, p2_rd)
+    team2_rating, team2_rd = calculate_team_average_rating(p3_rating, p3_rd, p4_rating, p4_rd)
+
+    # Apply time weight to scores (moves them toward 0.5 for older matches)
+    team1_score = 1.0 if winner == 1 else 0.0
+    team2_score = 1.0 if winner == 2 else 0.0
+    weighted_team1_score = 0.5 + (team1_score - 0.5) * time_weight
+    weighted_team2_score = 0.5 + (team2_score - 0.5) * time_weight
+
+    (p1_new_rating, p1_new_rd), (p2_new_rating, p2_new_rd) = calculate_team_rating_change(
+        p1_rating, p1_rd, p2_rating, p2_rd,
+        team2_rating, team2_rd, weighted_team1_score,
+        calculator, volatility
+    )
+    (p3_new_rating, p3_new_rd), (p4_new_rating, p4_new_rd) = calculate_team_rating_change(
+        p3_rating, p3_rd, p4_rating, p4_rd,
+        team1_rating, team1_rd, weighted_team2_score,
+        calculator, volatility
+    )
+
+    ratings[p1], rds[p1] = p1_new_rating, p1_new_rd
+    ratings[p2], rds[p2] = p2_new_rating, p2_new_rd
+    ratings[p3], rds[p3] = p3_new_rating, p3_new_rd
+    ratings[p4], rds[p4] = p4_new_rating, p4_new_rd
+
+
+def run_sequential_pass(encoded: EncodedMatches, store: RatingStore,
+                        calculator: GlickoCalculator, volatility: float) -> int:
+    """Apply every encoded match in order, one at a time. Returns matches processed."""
+    players = encoded.players.tolist()
+    genders = encoded.genders.tolist()
+    winners = encoded.winners.tolist()
+    time_weights = encoded.time_weights.tolist()
+
+    for player_idx, gender, winner, time_weight in zip(players, genders, winners, time_weights):
+        update_match(store, player_idx, gender, winner, time_weight, calculator, volatility)
+
+    return len(encoded)
+
+
+def apply_wave(encoded: EncodedMatches, wave: np.ndarray, store: RatingStore,
+               calculator: GlickoCalculator, volatility: float) -> None:
+    """
+    Apply a conflict-free wave of matches as one batch.
+
+    No rating slot is touched by more than one match in the wave (see
+    build_match_waves), so the result equals applying the matches one by one.
+    """
+    player_idx = encoded.players[wave]
+    genders = encoded.genders[wave][:, None]
+
+    # Gather current ratings into (matches, 4) arrays
+    ratings = store.ratings[genders, player_idx]
+    rds = store.rds[genders, player_idx]
+
+    # Calculate team averages
+    team1_rating, team1_rd = calculate_team_average_rating_batch(
+        ratings[:, 0], rds[:, 0], ratings[:, 1], rds[:, 1]
+    )
+    team2_rating, team2_rd = calculate_team_average_rating_batch(
+        ratings[:, 2], rds[:, 2], ratings[:, 3], rds[:, 3]
+    )
+
+    # Weighted scores
+    winners = encoded.winners[wave]
+    time_weights = encoded.time_weights[wave]
+    weighted_team1_score = 0.5 + ((winners == 1) - 0.5) * time_weights
+    weighted_team2_score = 0.5 + ((winners == 2) - 0.5) * time_weights
+
+    # Each player plays against the opposing team's average
+    opponent_ratings = np.column_stack([team2_rating, team2_rating, team1_rating, team1_rating])
+    opponent_rds = np.column_stack([team2_rd, team2_rd, team1_rd, team1_rd])
+    scores = np.column_stack([weighted_team1_score, weighted_team1_score,
+                              weighted_team2_score, weighted_team2_score])
+
+    new_ratings, new_rds, _ = calculator.calculate_new_ratings_batch(
+        ratings, rds, volatility, opponent_ratings, opponent_rds, scores
+    )
+
+    # Write results back to the rating store
+    store.ratings[genders, player_idx] = new_ratings
+    store.rds[genders, player_idx] = new_rds
+
+
+def run_wave_pass(encoded: EncodedMatches, waves: List[np.ndarray], store: RatingStore,
+                  calculator: GlickoCalculator, volatility: float) -> int:
+    """Apply every wave in order. Returns matches processed."""
+    for wave in waves:
+        apply_wave(encoded, wave, store, calculator, volatility)
+
+    return len(encoded)
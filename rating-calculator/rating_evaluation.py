@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Rating Evaluation
+Measures how well pre-match ratings predict match results
+
+Matches are replayed chronologically in conflict-free waves. Before each wave
+is applied, team 1's expected score (GlickoCalculator.expected_score, batched)
+is recorded from the pre-match ratings, so every prediction is made before
+its match is seen. Predictions are scored by log-loss, Brier score, accuracy
+and calibration buckets, overall, by gender and (local database only) by division.
+
+Usage:
+    python rating_evaluation.py [--db local_season.db | --database [--production]]
+                                [--warmup 0.1] [--buckets 10] [--report evaluation.json]
+"""
+import argparse
+import json
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from glicko import GlickoCalculator, calculate_team_average_rating_batch
+from local_season import DEFAULT_DB_PATH, LocalRatingCalculator, LocalSeasonDB
+from match_encoding import EncodedMatches, encode_matches
+from match_scheduler import build_match_waves
+from rating_engine import apply_wave
+from rating_store import MENS, RatingStore
+from simple_rating_calc import RatingCalculator
+
+# Keeps log(0) finite for confidently wrong predictions
+LOG_LOSS_EPSILON = 1e-15
+
+
+def replay_predictions(encoded: EncodedMatches, waves: List[np.ndarray], store: RatingStore,
+                       calculator: GlickoCalculator, volatility: float) -> np.ndarray:
+    """
+    Team 1's pre-match expected score for every match, updating ratings wave by wave.
+
+    Matches in a wave share no rating slot, so ratings read before a wave are
+    each match's pre-match ratings, exactly as in a one-at-a-time replay.
+    """
+    expected = np.empty(len(encoded))
+
+    for wave in waves:
+        player_idx = encoded.players[wave]
+        genders = encoded.genders[wave][:, None]
+        ratings = store.ratings[genders, player_idx]
+        rds = store.rds[genders, player_idx]
+
+        team1_rating, team1_rd = calculate_team_average_rating_batch(ratings[:, 0], rds[:, 0], ratings[:, 1], rds[:, 1])
+        team2_rating, team2_rd = calculate_team_average_rating_batch(ratings[:, 2], rds[:, 2], ratings[:, 3], rds[:, 3])
+        team1_mu, _ = calculator.rating_to_glicko2(team1_rating, team1_rd)
+        team2_mu, team2_phi = calculator.rating_to_glicko2(team2_rating, team2_rd)
+        expected[wave] = calculator.expected_score_batch(team1_mu, team2_mu, team2_phi)
+
+        apply_wave(encoded, wave, store, calculator, volatility)
+
+    return expected
+
+
+def prediction_metrics(expected: np.ndarray, winners: np.ndarray) -> Dict:
+    """
+    Log-loss, Brier score and accuracy of team 1 expected scores over matches with a known winner.
+
+    Exact 0.5 predictions (e.g. two teams of unrated players) pick no winner: they
+    are left out of accuracy and counted as ties.
+    """
+    known = winners > 0
+    outcomes = (winners[known] == 1).astype(np.float64)
+    expected = expected[known]
+
+    if not outcomes.size:
+        return {'matches': 0, 'log_loss': float('nan'), 'brier': float('nan'), 'accuracy': float('nan'),
+                'ties': 0}
+
+    clipped = np.clip(expected, LOG_LOSS_EPSILON, 1 - LOG_LOSS_EPSILON)
+    log_loss = -np.mean(outcomes * np.log(clipped) + (1 - outcomes) * np.log(1 - clipped))
+    brier = np.mean((expected - outcomes) ** 2)
+    decided = expected != 0.5
+    accuracy = np.mean((expected[decided] > 0.5) == (outcomes[decided] == 1)) if decided.any() else float('nan')
+    return {'matches': int(outcomes.size), 'log_loss': float(log_loss), 'brier': float(brier),
+            'accuracy': float(accuracy), 'ties': int(outcomes.size - decided.sum())}
+
+
+def calibration_buckets(expected: np.ndarray, winners: np.ndarray, num_buckets: int = 10) -> List[Dict]:
+    """Mean expected score vs observed team 1 win rate in equal-width expected score buckets."""
+    known = winners > 0
+    expected = expected[known]
+    outcomes = (winners[known] == 1).astype(np.float64)
+    edges = np.linspace(0, 1, num_buckets + 1)
+    bucket_idx = np.clip(np.digitize(expected, edges) - 1, 0, num_buckets - 1)
+
+    counts = np.bincount(bucket_idx, minlength=num_buckets)
+    expected_sums = np.bincount(bucket_idx, weights=expected, minlength=num_buckets)
+    outcome_sums = np.bincount(bucket_idx, weights=outcomes, minlength=num_buckets)
+
+    return [
+        {
+            'low': float(edges[i]),
+            'high': float(edges[i + 1]),
+            'matches': int(counts[i]),
+            'mean_expected': float(expected_sums[i] / counts[i]),
+            'observed': float(outcome_sums[i] / counts[i])
+        }
+        for i in range(num_buckets) if counts[i]
+    ]
+
+
+def grouped_metrics(expected: np.ndarray, winners: np.ndarray, groups: np.ndarray) -> Dict[str, Dict]:
+    """prediction_metrics for each distinct group label."""
+    return {
+        str(group): prediction_metrics(expected[groups == group], winners[groups == group])
+        for group in np.unique(groups)
+    }
+
+
+def evaluate_predictions(encoded: EncodedMatches, expected: np.ndarray,
+                         divisions: Optional[np.ndarray] = None, warmup: float = 0.0,
+                         num_buckets: int = 10) -> Dict:
+    """
+    Score pre-match predictions overall, by gender and by division.
+
+    Args:
+        encoded: Replayed matches, in the order of expected
+        expected: Team 1 pre-match expected scores (see replay_predictions)
+        divisions: Division label per match (None to skip the division breakdown)
+        warmup: Fraction of earliest matches left out of scoring while ratings settle
+        num_buckets: Calibration buckets
+
+    Returns:
+        Report dict with overall, by_gender, by_division and calibration sections
+    """
+    scored = slice(int(len(encoded) * warmup), None)
+    expected = expected[scored]
+    winners = encoded.winners[scored]
+    genders = np.where(encoded.genders[scored] == MENS, 'mens', 'womens')
+
+    report = {
+        'overall': prediction_metrics(expected, winners),
+        'warmup_matches': scored.start,
+        'by_gender': grouped_metrics(expected, winners, genders),
+        'calibration': calibration_buckets(expected, winners, num_buckets)
+    }
+    if divisions is not None:
+        report['by_division'] = grouped_metrics(expected, winners, divisions[scored])
+    return report
+
+
+def print_report(report: Dict) -> None:
+    """Print an evaluation report as tables."""
+    def metrics_row(label: str, metrics: Dict) -> str:
+        return (f"   {label:<12} {metrics['matches']:>7}  {metrics['log_loss']:>8.4f}  "
+                f"{metrics['brier']:>7.4f}  {metrics['accuracy']:>8.1%}  {metrics['ties']:>5}")
+
+    print(f"\n📈 Prediction quality ({report['warmup_matches']} warm-up matches not scored)")
+    print(f"   {'':<12} {'Matches':>7}  {'Log-loss':>8}  {'Brier':>7}  {'Accuracy':>8}  {'Ties':>5}")
+    print(metrics_row('Overall', report['overall']))
+    for section in ('by_gender', 'by_division'):
+        for label, metrics in sorted(report.get(section, {}).items()):
+            print(metrics_row(label, metrics))
+
+    print("\n🎯 Calibration (team 1 expected score vs observed win rate)")
+    for bucket in report['calibration']:
+        print(f"   {bucket['low']:.1f}-{bucket['high']:.1f}: {bucket['matches']:>6} matches, "
+              f"expected {bucket['mean_expected']:.3f}, observed {bucket['observed']:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Evaluate how well pre-match ratings predict results')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help=f'Local season database (default: {DEFAULT_DB_PATH})')
+    parser.add_argument('--database', action='store_true', help='Load matches from Supabase instead of the local database')
+    parser.add_argument('--production', action='store_true', help='With --database, use the production database')
+    parser.add_argument('--warmup', type=float, default=0.1,
+                        help='Fraction of earliest matches not scored (default: 0.1)')
+    parser.add_argument('--buckets', type=int, default=10, help='Calibration buckets (default: 10)')
+    parser.add_argument('--report', help='Also write the report as JSON to this file')
+    args = parser.parse_args()
+
+    print("🏐 Sand Volleyball Rating Evaluation\n")
+    division_map = None
+    if args.database:
+        calc = RatingCalculator(use_production=args.production)
+        all_matches = calc.get_all_matches()
+        player_ids = list(calc.get_all_player_ratings().keys())
+        print("ℹ️  By-division breakdown unavailable with --database (divisions come from the local season database)")
+    else:
+        db = LocalSeasonDB(args.db)
+        try:
+            calc = LocalRatingCalculator(db)
+            all_matches = db.get_all_matches()
+            player_ids = db.player_ids()
+            division_map = db.match_divisions()
+        finally:
+            db.close()
+
+    store = RatingStore(player_ids, calc.default_rating, calc.default_rd)
+    encoded, skipped = encode_matches(all_matches, store, datetime.now(timezone.utc),
+                                      calc.half_life_days, calc.min_time_weight)
+    if not len(encoded):
+        print("❌ No matches to evaluate")
+        return
+
+    waves = build_match_waves(encoded.players, encoded.genders)
+    expected = replay_predictions(encoded, waves, store, calc.glicko_calc, calc.volatility)
+    divisions = None
+    if division_map is not None:
+        divisions = np.array([division_map.get(match_id) or 'Unknown' for match_id in encoded.match_ids])
+
+    print(f"📊 Replayed {len(encoded)} matches in {len(waves)} waves ({len(skipped)} skipped for missing players)")
+    report = evaluate_predictions(encoded, expected, divisions, args.warmup, args.buckets)
+    report['config'] = {'half_life_days': calc.half_life_days, 'min_time_weight': calc.min_time_weight,
+                        'volatility': calc.volatility}
+    print_report(report)
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Saved report to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
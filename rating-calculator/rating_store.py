@@ -0,0 +1,112 @@
+"""
+Rating Store
+Columnar, array-backed storage for in-memory player ratings
+"""
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# Row index of each rating pool in the store arrays
+MENS = 0
+WOMENS = 1
+
+
+def gender_code(match_type: str) -> int:
+    """Map a match type to the rating pool it updates (non-mens matches use womens ratings)."""
+    return MENS if match_type == 'mens' else WOMENS
+
+
+class RatingStore:
+    """
+    Player ratings held in contiguous float arrays.
+
+    Player UUIDs are interned to integer indices; ratings and RDs live in
+    (2, num_players) arrays where row MENS holds mens ratings and row WOMENS
+    holds womens ratings.
+    """
+
+    def __init__(self, player_ids: Iterable[str], default_rating: float = 1500, default_rd: float = 350):
+        """
+        Initialize the store with every player at the default rating.
+
+        Args:
+            player_ids: Player UUIDs to intern, in index order
+            default_rating: Starting rating for both pools
+            default_rd: Starting rating deviation for both pools
+        """
+        self.player_ids: List[str] = list(player_ids)
+        self.index: Dict[str, int] = {pid: idx for idx, pid in enumerate(self.player_ids)}
+        self.default_rating = default_rating
+        self.default_rd = default_rd
+
+        num_players = len(self.player_ids)
+        self.ratings = np.full((2, num_players), default_rating, dtype=np.float64)
+        self.rds = np.full((2, num_players), default_rd, dtype=np.float64)
+
+    @classmethod
+    def from_player_ratings(cls, player_ratings: Dict[str, Dict], default_rating: float = 1500,
+                            default_rd: float = 350) -> 'RatingStore':
+        """Build a store from the dict-of-dicts shape returned by get_all_player_ratings."""
+        store = cls(player_ratings.keys(), default_rating, default_rd)
+
+        for idx, ratings in enumerate(player_ratings.values()):
+            store.ratings[MENS, idx] = _value_or(ratings.get('mens_rating'), default_rating)
+            store.rds[MENS, idx] = _value_or(ratings.get('mens_rating_deviation'), default_rd)
+            store.ratings[WOMENS, idx] = _value_or(ratings.get('womens_rating'), default_rating)
+            store.rds[WOMENS, idx] = _value_or(ratings.get('womens_rating_deviation'), default_rd)
+
+        return store
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self.index
+
+    def indices(self, player_ids: Iterable[str]) -> np.ndarray:
+        """Get store indices for player UUIDs (raises KeyError for unknown players)."""
+        return np.array([self.index[pid] for pid in player_ids], dtype=np.int64)
+
+    def reset(self, rating: float = None, rd: float = None) -> None:
+        """Reset every player in both pools to the given (or default) rating and RD."""
+        self.ratings.fill(self.default_rating if rating is None else rating)
+        self.rds.fill(self.default_rd if rd is None else rd)
+
+    def reinflate_rds(self, amount: float, max_rd: float = None) -> None:
+        """Add amount to every RD in quadrature, rounded and capped at max_rd (default RD if None)."""
+        max_rd = self.default_rd if max_rd is None else max_rd
+        self.rds[:] = np.minimum(np.round(np.sqrt(self.rds * self.rds + amount * amount)), max_rd)
+
+    def get(self, player_id: str, gender: int) -> Tuple[float, float]:
+        """Get a player's (rating, rd) for a rating pool."""
+        idx = self.index[player_id]
+        return float(self.ratings[gender, idx]), float(self.rds[gender, idx])
+
+    def set(self, player_id: str, gender: int, rating: float, rd: float) -> None:
+        """Set a player's rating and RD for a rating pool."""
+        idx = self.index[player_id]
+        self.ratings[gender, idx] = rating
+        self.rds[gender, idx] = rd
+
+    def to_player_ratings(self) -> Dict[str, Dict]:
+        """Export to the dict-of-dicts shape used by save_ratings_csv and the database writer."""
+        mens_ratings = self.ratings[MENS].astype(np.int64).tolist()
+        mens_rds = self.rds[MENS].astype(np.int64).tolist()
+        womens_ratings = self.ratings[WOMENS].astype(np.int64).tolist()
+        womens_rds = self.rds[WOMENS].astype(np.int64).tolist()
+
+        return {
+            pid: {
+                'id': pid,
+                'mens_rating': mens_ratings[idx],
+                'mens_rating_deviation': mens_rds[idx],
+                'womens_rating': womens_ratings[idx],
+                'womens_rating_deviation': womens_rds[idx]
+            }
+            for idx, pid in enumerate(self.player_ids)
+        }
+
+
+def _value_or(value, default: float) -> float:
+    """Use default for missing (null) ratings."""
+    return default if value is None else value
@@ -7,17 +7,32 @@ Uses direct HTTP requests for reliable database access
 import os
 import sys
 import time
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 from datetime import datetime
 import logging
+import numpy as np
+import requests
 from dotenv import load_dotenv
 
+from http_session import create_session
 from glicko import (
     GlickoCalculator, 
     calculate_team_rating_change, 
     calculate_team_average_rating
 )
+from match_encoding import encode_matches
+from match_scheduler import build_match_waves
+from rating_checkpoint import (
+    save_checkpoint,
+    load_checkpoint,
+    checkpoint_age_days,
+    store_from_checkpoint,
+    matches_digest,
+    touched_players
+)
+from rating_engine import ENGINES, update_match, run_sequential_pass, run_wave_pass
+from rating_store import RatingStore, gender_code
 
 # Configure logging
 logging.basicConfig(
@@ -30,16 +45,55 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Full paged fetches attempted before giving up on a table that keeps changing
+FETCH_ATTEMPTS = 3
+
+# Postgres function the rating writes go through, and the migration that creates it
+RATINGS_RPC = 'bulk_update_profile_ratings'
+RATINGS_RPC_MIGRATION = 'sand-elo/supabase/migrations/20250101000041_add_bulk_update_profile_ratings.sql'
+
 
 class RatingCalculator:
     """Rating calculator using direct HTTP requests for reliable access."""
     
-    def __init__(self, use_production=False):
-        """Initialize the calculator."""
+    def __init__(self, use_production=False, connect=True):
+        """
+        Initialize the calculator.
+        
+        Args:
+            use_production: Connect to the production database instead of the local one
+            connect: Set up the database connection; without it only the in-memory
+                rating code can be used and database methods raise RuntimeError
+        """
         # Load environment variables from the Node.js project directory
         dotenv_path = os.path.join(os.path.dirname(__file__), '..', 'sand-elo', '.env.local')
         load_dotenv(dotenv_path)
         
+        # Shared connection-pooled session settings for all database I/O
+        self.http_pool_size = int(os.getenv('HTTP_POOL_SIZE', 10))
+        self.http_timeout = float(os.getenv('HTTP_TIMEOUT', 30))
+        self.fetch_workers = int(os.getenv('FETCH_WORKERS', 4))
+        self.page_size = 1000
+        self.base_url = None
+        self._session = None
+        
+        if connect:
+            self.connect(use_production)
+        
+        self.load_rating_config()
+        
+        logger.info("🏐 Rating Calculator initialized")
+        logger.info(f"📊 Batch size: {self.batch_size}")
+        logger.info(f"⏱️  Delay between batches: {self.delay_between_batches}s")
+        logger.info(f"📅 Rating half-life: {self.half_life_days} days")
+        logger.info(f"⚖️  Minimum time weight: {self.min_time_weight}")
+        logger.info(f"⚙️  Rating engine: {self.engine}")
+        if connect:
+            logger.info(f"🔌 HTTP pool size: {self.http_pool_size}, timeout: {self.http_timeout}s")
+        logger.info(f"🔁 Carry ratings between passes: {'Yes' if self.carry_over_passes else 'No'}")
+    
+    def connect(self, use_production=False) -> None:
+        """Resolve the Supabase credentials and open the pooled HTTP session."""
         if use_production:
             print("🌐 PRODUCTION MODE - Using production database")
             print("⚠️  WARNING: You are about to calculate ratings in your LIVE production database!")
@@ -85,12 +139,34 @@ class RatingCalculator:
             'Content-Type': 'application/json'
         }
         
+        self._session = create_session(
+            self.headers,
+            pool_size=max(self.http_pool_size, self.fetch_workers),
+            max_retries=int(os.getenv('HTTP_MAX_RETRIES', 3)),
+            backoff_factor=float(os.getenv('HTTP_BACKOFF', 0.5)),
+            timeout=self.http_timeout
+        )
+    
+    @property
+    def session(self):
+        """The pooled HTTP session; raises if the calculator was created without a connection."""
+        if self._session is None:
+            raise RuntimeError(f"{type(self).__name__} has no database connection "
+                               f"(created with connect=False)")
+        return self._session
+    
+    def load_rating_config(self) -> None:
+        """Load rating, engine and multi-pass settings from the environment."""
         # Rating configuration
         self.batch_size = int(os.getenv('BATCH_SIZE', 50))
         self.delay_between_batches = float(os.getenv('DELAY_BETWEEN_BATCHES', 0.1))
         self.default_rating = int(os.getenv('DEFAULT_RATING', 1500))
         self.default_rd = int(os.getenv('DEFAULT_RD', 350))
         self.volatility = float(os.getenv('VOLATILITY', 0.06))
+        self.write_retries = int(os.getenv('WRITE_RETRIES', 3))
+        
+        # Database statistics, cached until ratings are written
+        self._stats_cache = None
         
         # Initialize Glicko calculator
         self.glicko_calc = GlickoCalculator()
@@ -99,16 +175,25 @@ class RatingCalculator:
         self.half_life_days = int(os.getenv('RATING_HALF_LIFE_DAYS', 180))
         self.min_time_weight = float(os.getenv('MIN_TIME_WEIGHT', 0.1))
         
-        logger.info("🏐 Rating Calculator initialized")
-        logger.info(f"📊 Batch size: {self.batch_size}")
-        logger.info(f"⏱️  Delay between batches: {self.delay_between_batches}s")
-        logger.info(f"📅 Rating half-life: {self.half_life_days} days")
-        logger.info(f"⚖️  Minimum time weight: {self.min_time_weight}")
+        # Engine used for in-memory recomputes: 'wave' (batched) or 'sequential'
+        self.engine = os.getenv('RATING_ENGINE', 'wave')
+        if self.engine not in ENGINES:
+            print(f"❌ Unknown RATING_ENGINE '{self.engine}' (expected 'wave' or 'sequential')")
+            sys.exit(1)
+        
+        # Multi-pass configuration
+        self.carry_over_passes = os.getenv('CARRY_OVER_PASSES', 'false').lower() in ('1', 'true', 'yes')
+        self.pass_rd_reinflation = float(os.getenv('PASS_RD_REINFLATION', 0))
+        self.convergence_tolerance = float(os.getenv('CONVERGENCE_TOLERANCE', 1.0))
+        
+        # Incremental checkpoint configuration
+        self.checkpoint_file = os.getenv('RATING_CHECKPOINT_FILE', 'rating_checkpoint.json')
+        self.checkpoint_max_age_days = float(os.getenv('CHECKPOINT_MAX_AGE_DAYS', 7))
     
     def get_data(self, table: str, params: Dict = None) -> List[Dict]:
         """Get data from a table."""
         url = f"{self.base_url}/rest/v1/{table}"
-        response = requests.get(url, headers=self.headers, params=params or {})
+        response = self.session.get(url, params=params or {})
         response.raise_for_status()
         return response.json()
     
@@ -121,43 +206,85 @@ class RatingCalculator:
         for key, value in filter_params.items():
             params[key] = f"eq.{value}"
         
-        response = requests.patch(url, headers=self.headers, json=data, params=params)
+        response = self.session.patch(url, json=data, params=params)
         return response.status_code in [200, 204]
     
+    def call_rpc(self, function: str, payload: Dict):
+        """Call a Postgres function through PostgREST."""
+        url = f"{self.base_url}/rest/v1/rpc/{function}"
+        response = self.session.post(url, json=payload)
+        response.raise_for_status()
+        return response.json()
+    
+    def count_rows(self, table: str, params: Dict = None) -> int:
+        """Count rows matching filters using PostgREST's exact count header."""
+        url = f"{self.base_url}/rest/v1/{table}"
+        response = self.session.head(url, headers={'Prefer': 'count=exact'},
+                                     params={'select': 'id', **(params or {})})
+        response.raise_for_status()
+        
+        # Content-Range looks like "0-999/12345" or "*/0"
+        return int(response.headers['Content-Range'].split('/')[-1])
+    
+    def fetch_all_rows(self, table: str, params: Dict, order: str) -> List[Dict]:
+        """
+        Fetch every row matching params, pulling pages in parallel.
+        
+        The exact row count is fetched first so all page offsets are known up front;
+        pages are then requested concurrently (FETCH_WORKERS) and concatenated in
+        page order. order must be a total order so pages don't overlap.
+        
+        Rows inserted or deleted while paging shift every later offset, so pages
+        could then duplicate or drop rows. The table is re-counted after fetching
+        and the whole fetch is repeated (up to FETCH_ATTEMPTS times) if the count
+        changed or the pages don't add up to exactly the counted rows.
+        """
+        count_params = {k: v for k, v in params.items() if k != 'select'}
+        
+        def fetch_page(offset: int) -> List[Dict]:
+            return self.get_data(table, {
+                **params,
+                'order': order,
+                'offset': str(offset),
+                'limit': str(self.page_size)
+            })
+        
+        for attempt in range(1, FETCH_ATTEMPTS + 1):
+            total = self.count_rows(table, count_params)
+            offsets = list(range(0, total, self.page_size))
+            
+            logger.info(f"   Fetching {total} rows from {table} in {len(offsets)} pages "
+                       f"({self.fetch_workers} workers)")
+            
+            rows = []
+            with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+                for page in executor.map(fetch_page, offsets):
+                    rows.extend(page)
+            
+            recount = self.count_rows(table, count_params)
+            unique_rows = len({row.get('id') for row in rows})
+            if recount == total and len(rows) == total and unique_rows == total:
+                return rows
+            
+            logger.warning(f"⚠️  {table} changed while paging ({total} -> {recount} rows, fetched {len(rows)}, "
+                          f"{unique_rows} unique) - refetching (attempt {attempt}/{FETCH_ATTEMPTS})")
+        
+        raise RuntimeError(f"{table} kept changing while paging ({FETCH_ATTEMPTS} attempts)")
+    
     def get_all_matches(self) -> List[Dict]:
-        """Get all matches in chronological order using pagination."""
+        """Get all matches in chronological order."""
         try:
-            all_matches = []
-            offset = 0
-            page_size = 1000
-            
-            logger.info("📊 Fetching all matches using pagination...")
-            
-            while True:
-                params = {
-                    'deleted_at': 'is.null',
-                    'select': 'id,match_type,winning_team,played_at,'
-                             'team1_player1_id,team1_player2_id,'
-                             'team2_player1_id,team2_player2_id',
-                    'order': 'played_at.asc',
-                    'offset': str(offset),
-                    'limit': str(page_size)
-                }
-                
-                page_matches = self.get_data('matches', params)
-                
-                if not page_matches:
-                    break
-                    
-                all_matches.extend(page_matches)
-                logger.info(f"   Retrieved page with {len(page_matches)} matches "
-                           f"(total: {len(all_matches)})")
-                
-                # If we got fewer matches than page size, we're done
-                if len(page_matches) < page_size:
-                    break
-                    
-                offset += page_size
+            logger.info("📊 Fetching all matches using parallel pagination...")
+            
+            params = {
+                'deleted_at': 'is.null',
+                'select': 'id,match_type,winning_team,played_at,'
+                         'team1_player1_id,team1_player2_id,'
+                         'team2_player1_id,team2_player2_id'
+            }
+            
+            # Tie-break on id so offsets are stable across concurrent page requests
+            all_matches = self.fetch_all_rows('matches', params, 'played_at.asc,id.asc')
             
             logger.info(f"📊 Retrieved {len(all_matches)} total matches from database")
             return all_matches
@@ -309,10 +436,10 @@ class RatingCalculator:
             }
             
             # Use bulk update by updating all active profiles
+            self._stats_cache = None
             url = f"{self.base_url}/rest/v1/profiles"
             params = {'is_active': 'eq.true'}
-            response = requests.patch(url, headers=self.headers, 
-                                    json=update_data, params=params)
+            response = self.session.patch(url, json=update_data, params=params)
             
             if response.status_code in [200, 204]:
                 logger.info(f"✅ Reset {len(players)} player ratings to defaults")
@@ -342,9 +469,9 @@ class RatingCalculator:
         # Apply minimum weight to avoid completely ignoring old matches
         return max(weight, self.min_time_weight)
     
-    def process_match_memory(self, match: Dict, player_ratings: Dict[str, Dict], 
+    def process_match_memory(self, match: Dict, player_ratings: RatingStore, 
                            current_date: datetime = None) -> bool:
-        """Process a single match using in-memory ratings with time weighting."""
+        """Process a single match using the in-memory rating store with time weighting."""
         try:
             # Get player IDs
             player_ids = [
@@ -360,75 +487,21 @@ class RatingCalculator:
                     logger.warning(f"⚠️  Missing player {pid} for match {match['id']}")
                     return False
             
-            # Get player objects from memory
-            p1 = player_ratings[match['team1_player1_id']]
-            p2 = player_ratings[match['team1_player2_id']]
-            p3 = player_ratings[match['team2_player1_id']]
-            p4 = player_ratings[match['team2_player2_id']]
-            
-            # Determine which ratings to use
-            rating_field = ('mens_rating' if match['match_type'] == 'mens' 
-                          else 'womens_rating')
-            rd_field = ('mens_rating_deviation' if match['match_type'] == 'mens' 
-                       else 'womens_rating_deviation')
-            
-            # Calculate team averages
-            team1_rating, team1_rd = calculate_team_average_rating(
-                p1[rating_field], p1[rd_field], 
-                p2[rating_field], p2[rd_field]
-            )
-            team2_rating, team2_rd = calculate_team_average_rating(
-                p3[rating_field], p3[rd_field], 
-                p4[rating_field], p4[rd_field]
-            )
-            
             # Calculate time weight if current_date provided
             time_weight = 1.0
             if current_date:
                 time_weight = self.calculate_time_weight(match['played_at'], current_date)
             
-            # Determine weighted scores
-            team1_score = (1.0 if match['winning_team'] == 1 else 0.0)
-            team2_score = (1.0 if match['winning_team'] == 2 else 0.0)
-            
-            # Apply time weight to scores (moves them toward 0.5 for older matches)
-            weighted_team1_score = 0.5 + (team1_score - 0.5) * time_weight
-            weighted_team2_score = 0.5 + (team2_score - 0.5) * time_weight
-            
-            # Calculate new ratings for team 1 with weighted scores
-            (p1_new_rating, p1_new_rd), (p2_new_rating, p2_new_rd) = (
-                calculate_team_rating_change(
-                    p1[rating_field], p1[rd_field],
-                    p2[rating_field], p2[rd_field],
-                    team2_rating, team2_rd,
-                    weighted_team1_score,  # Use weighted score
-                    self.glicko_calc,
-                    self.volatility
-                )
-            )
-            
-            # Calculate new ratings for team 2 with weighted scores
-            (p3_new_rating, p3_new_rd), (p4_new_rating, p4_new_rd) = (
-                calculate_team_rating_change(
-                    p3[rating_field], p3[rd_field],
-                    p4[rating_field], p4[rd_field],
-                    team1_rating, team1_rd,
-                    weighted_team2_score,  # Use weighted score
-                    self.glicko_calc,
-                    self.volatility
-                )
+            update_match(
+                player_ratings,
+                player_ratings.indices(player_ids),
+                gender_code(match['match_type']),
+                match['winning_team'],
+                time_weight,
+                self.glicko_calc,
+                self.volatility
             )
             
-            # Update in-memory ratings
-            player_ratings[match['team1_player1_id']][rating_field] = p1_new_rating
-            player_ratings[match['team1_player1_id']][rd_field] = p1_new_rd
-            player_ratings[match['team1_player2_id']][rating_field] = p2_new_rating
-            player_ratings[match['team1_player2_id']][rd_field] = p2_new_rd
-            player_ratings[match['team2_player1_id']][rating_field] = p3_new_rating
-            player_ratings[match['team2_player1_id']][rd_field] = p3_new_rd
-            player_ratings[match['team2_player2_id']][rating_field] = p4_new_rating
-            player_ratings[match['team2_player2_id']][rd_field] = p4_new_rd
-            
             return True
             
         except Exception as e:
@@ -436,36 +509,14 @@ class RatingCalculator:
             return False
     
     def get_all_player_ratings(self) -> Dict[str, Dict]:
-        """Get all player ratings into memory using pagination."""
+        """Get all player ratings into memory using parallel pagination."""
         try:
-            all_players = []
-            offset = 0
-            page_size = 1000
-            
-            logger.info("📊 Fetching all player ratings using pagination...")
-            
-            while True:
-                params = {
-                    'is_active': 'eq.true',
-                    'select': 'id,mens_rating,mens_rating_deviation,womens_rating,womens_rating_deviation',
-                    'offset': str(offset),
-                    'limit': str(page_size)
-                }
-                
-                page_players = self.get_data('profiles', params)
-                
-                if not page_players:
-                    break
-                    
-                all_players.extend(page_players)
-                logger.info(f"   Retrieved page with {len(page_players)} players "
-                           f"(total: {len(all_players)})")
-                
-                # If we got fewer players than page size, we're done
-                if len(page_players) < page_size:
-                    break
-                    
-                offset += page_size
+            logger.info("📊 Fetching all player ratings using parallel pagination...")
+            
+            all_players = self.fetch_all_rows('profiles', {
+                'is_active': 'eq.true',
+                'select': 'id,mens_rating,mens_rating_deviation,womens_rating,womens_rating_deviation'
+            }, 'id.asc')
             
             logger.info(f"📊 Retrieved {len(all_players)} total active players from database")
             return {player['id']: player for player in all_players}
@@ -473,6 +524,22 @@ class RatingCalculator:
             logger.error(f"❌ Error fetching all player ratings: {e}")
             return {}
     
+    def get_usernames(self, player_ids: List[str]) -> Dict[str, str]:
+        """Map player IDs to profile usernames, in batches."""
+        batch_size = 100
+        username_map = {}
+        
+        for i in range(0, len(player_ids), batch_size):
+            batch = player_ids[i:i + batch_size]
+            players = self.get_data('profiles', {
+                'id': f'in.({",".join(batch)})',
+                'select': 'id,username'
+            })
+            for player in players:
+                username_map[player['id']] = player['username']
+        
+        return username_map
+    
     def save_ratings_csv(self, player_ratings: Dict[str, Dict], filename: str = "calculated_ratings.csv"):
         """Save calculated ratings to CSV for debugging."""
         try:
@@ -485,18 +552,7 @@ class RatingCalculator:
                 writer.writerow(['username', 'player_id', 'mens_rating', 'mens_rd', 'womens_rating', 'womens_rd'])
                 
                 # Get usernames for all players
-                all_player_ids = list(player_ratings.keys())
-                batch_size = 100
-                username_map = {}
-                
-                for i in range(0, len(all_player_ids), batch_size):
-                    batch = all_player_ids[i:i + batch_size]
-                    players = self.get_data('profiles', {
-                        'id': f'in.({",".join(batch)})',
-                        'select': 'id,username'
-                    })
-                    for player in players:
-                        username_map[player['id']] = player['username']
+                username_map = self.get_usernames(list(player_ratings.keys()))
                 
                 # Write ratings
                 for player_id, ratings in player_ratings.items():
@@ -517,64 +573,90 @@ class RatingCalculator:
             logger.error(f"❌ Error saving CSV: {e}")
             return False
 
-    def update_all_ratings_batch(self, player_ratings: Dict[str, Dict]) -> bool:
-        """Update all player ratings in the database in batch."""
+    def write_ratings_chunk(self, rows: List[Dict]) -> int:
+        """Write one chunk of ratings with a single bulk RPC, retrying with backoff."""
+        for attempt in range(1, self.write_retries + 1):
+            try:
+                return self.call_rpc(RATINGS_RPC, {'ratings': rows})
+            except Exception as e:
+                if attempt == self.write_retries:
+                    raise
+                delay = 0.5 * 2 ** (attempt - 1)
+                logger.warning(f"⚠️  Chunk write failed (attempt {attempt}/{self.write_retries}): {e} "
+                              f"- retrying in {delay:.1f}s")
+                time.sleep(delay)
+    
+    def check_ratings_rpc(self) -> bool:
+        """Call the bulk rating writer with no rows to confirm it is deployed and callable."""
+        try:
+            self.call_rpc(RATINGS_RPC, {'ratings': []})
+            return True
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                logger.error(f"❌ {RATINGS_RPC} does not exist - apply {RATINGS_RPC_MIGRATION}")
+            else:
+                logger.error(f"❌ {RATINGS_RPC} precheck failed: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"❌ {RATINGS_RPC} precheck failed: {e}")
+            return False
+    
+    def update_all_ratings_batch(self, player_ratings: Dict[str, Dict],
+                                 csv_ratings: Dict[str, Dict] = None) -> bool:
+        """
+        Update player ratings in the database in chunks of batch_size players.
+        
+        Args:
+            player_ratings: Ratings to write to the database
+            csv_ratings: Ratings for the debugging CSV when they differ from what is
+                written (incremental runs write only changed players but keep the
+                CSV complete); defaults to player_ratings
+        """
         try:
             logger.info("💾 Updating all player ratings in database...")
+            self._stats_cache = None
             
             # Save CSV first for debugging
-            self.save_ratings_csv(player_ratings)
-            
-            # Sample a few players to verify the update process
-            sample_players = list(player_ratings.keys())[:5]
-            logger.info(f"🔍 Testing database updates with {len(sample_players)} sample players...")
-            
-            sample_success = 0
-            for player_id in sample_players:
-                ratings = player_ratings[player_id]
-                
-                # Log what we're trying to update
-                logger.info(f"   Updating {player_id}: mens={ratings['mens_rating']}, womens={ratings['womens_rating']}")
-                
-                # Update both ratings
-                mens_success = self.update_player_rating(player_id, 'mens', 
-                                                       ratings['mens_rating'], 
-                                                       ratings['mens_rating_deviation'])
-                womens_success = self.update_player_rating(player_id, 'womens',
-                                                         ratings['womens_rating'],
-                                                         ratings['womens_rating_deviation'])
-                
-                if mens_success and womens_success:
-                    sample_success += 1
-                    logger.info(f"   ✅ Successfully updated {player_id}")
-                else:
-                    logger.error(f"   ❌ Failed to update {player_id} (mens: {mens_success}, womens: {womens_success})")
-            
-            logger.info(f"🧪 Sample update test: {sample_success}/{len(sample_players)} successful")
+            self.save_ratings_csv(player_ratings if csv_ratings is None else csv_ratings)
             
-            if sample_success < len(sample_players):
-                logger.error("❌ Sample updates failed - aborting full update")
+            # Fail once, clearly, if the writer is missing rather than once per chunk
+            if not self.check_ratings_rpc():
                 return False
             
-            # Proceed with full updates
-            logger.info("💾 Proceeding with full database update...")
+            # One row per player with both genders' ratings
+            rows = [
+                {
+                    'id': player_id,
+                    'mens_rating': ratings['mens_rating'],
+                    'mens_rating_deviation': ratings['mens_rating_deviation'],
+                    'womens_rating': ratings['womens_rating'],
+                    'womens_rating_deviation': ratings['womens_rating_deviation']
+                }
+                for player_id, ratings in player_ratings.items()
+            ]
+            chunks = [rows[i:i + self.batch_size] for i in range(0, len(rows), self.batch_size)]
+            logger.info(f"📦 Writing {len(rows)} players in {len(chunks)} chunks of up to {self.batch_size}")
+            
             success_count = 0
             error_count = 0
             
-            for player_id, ratings in player_ratings.items():
-                mens_success = self.update_player_rating(player_id, 'mens', 
-                                                       ratings['mens_rating'], 
-                                                       ratings['mens_rating_deviation'])
-                womens_success = self.update_player_rating(player_id, 'womens',
-                                                         ratings['womens_rating'],
-                                                         ratings['womens_rating_deviation'])
+            for chunk_num, chunk in enumerate(chunks, 1):
+                try:
+                    updated = self.write_ratings_chunk(chunk)
+                    success_count += len(chunk)
+                    if updated < len(chunk):
+                        logger.warning(f"⚠️  Chunk {chunk_num}: only {updated}/{len(chunk)} profiles matched")
+                except Exception as e:
+                    error_count += len(chunk)
+                    logger.error(f"❌ Failed to write chunk {chunk_num}/{len(chunks)} "
+                                f"({len(chunk)} players): {e}")
                 
-                if mens_success and womens_success:
-                    success_count += 1
-                else:
-                    error_count += 1
-                    if error_count <= 5:  # Log first 5 errors
-                        logger.error(f"❌ Failed to update {player_id}")
+                # Progress update every 10 chunks
+                if chunk_num % 10 == 0:
+                    logger.info(f"   Written {chunk_num}/{len(chunks)} chunks")
+                
+                if self.delay_between_batches and chunk_num < len(chunks):
+                    time.sleep(self.delay_between_batches)
             
             logger.info(f"✅ Database update complete: {success_count} success, {error_count} errors")
             return error_count == 0
@@ -583,9 +665,143 @@ class RatingCalculator:
             logger.error(f"❌ Error updating ratings: {e}")
             return False
     
-    def calculate_all_ratings_iterative(self, num_passes: int = 10) -> bool:
-        """Calculate ratings with multiple iterative passes."""
-        logger.info(f"🚀 Starting iterative rating calculation with {num_passes} passes...")
+    def rating_config(self) -> Dict:
+        """Settings that checkpointed ratings depend on."""
+        return {
+            'default_rating': self.default_rating,
+            'default_rd': self.default_rd,
+            'volatility': self.volatility,
+            'half_life_days': self.half_life_days,
+            'min_time_weight': self.min_time_weight,
+            'carry_over_passes': self.carry_over_passes
+        }
+    
+    def save_rating_checkpoint(self, checkpoint_path: str, player_ratings: RatingStore,
+                               processed_matches: List[Dict]) -> None:
+        """Save ratings and a digest of the matches they include."""
+        save_checkpoint(checkpoint_path, player_ratings, processed_matches, self.rating_config())
+        watermark = processed_matches[-1]['played_at'] if processed_matches else None
+        logger.info(f"📌 Saved rating checkpoint to {checkpoint_path} (watermark: {watermark})")
+    
+    def calculate_ratings_incremental(self, checkpoint_path: str = None, num_passes: int = 10) -> bool:
+        """
+        Apply only matches after the checkpointed ones on top of checkpointed ratings.
+        
+        The checkpoint covers the first processed_matches matches in (played_at, id)
+        order. If those rows no longer hash to the checkpoint's prefix digest - a
+        back-dated insert (including one at the watermark time that sorts before a
+        processed match), a deletion, or an edited result - or there is no usable
+        checkpoint, the rating settings changed, or the checkpoint is older than
+        CHECKPOINT_MAX_AGE_DAYS (time weights are anchored to the run date), this
+        falls back to a full iterative recompute, which writes a new checkpoint. It
+        also always falls back with CARRY_OVER_PASSES on: checkpointed ratings are
+        then the result of several carried-over passes, and a single pass of new
+        matches on top of them does not equal a full replay.
+        """
+        from datetime import timezone
+        checkpoint_path = checkpoint_path or self.checkpoint_file
+        current_date = datetime.now(timezone.utc)
+        
+        def full_replay(reason: str) -> bool:
+            logger.info(f"🔁 Full replay required: {reason}")
+            return self.calculate_all_ratings_iterative(num_passes=num_passes, checkpoint_path=checkpoint_path)
+        
+        checkpoint = load_checkpoint(checkpoint_path)
+        if not checkpoint or not checkpoint['processed_matches']:
+            return full_replay(f"no checkpoint at {checkpoint_path}")
+        
+        if checkpoint['config'] != self.rating_config():
+            return full_replay("rating settings changed since checkpoint")
+        
+        if self.carry_over_passes:
+            return full_replay("carried-over passes can't be extended incrementally")
+        
+        age_days = checkpoint_age_days(checkpoint, current_date)
+        if age_days > self.checkpoint_max_age_days:
+            return full_replay(f"checkpoint is {age_days:.1f} days old (max {self.checkpoint_max_age_days})")
+        
+        processed_count = checkpoint['processed_matches']
+        logger.info(f"📌 Loaded checkpoint with {processed_count} matches "
+                   f"(watermark: {checkpoint['watermark']})")
+        
+        # Any change to the processed prefix (inserted, deleted or edited matches) changes its digest
+        all_matches = self.get_all_matches()
+        if len(all_matches) < processed_count or \
+                matches_digest(all_matches[:processed_count]) != checkpoint['prefix_digest']:
+            return full_replay("matches covered by the checkpoint changed (back-dated, deleted or edited)")
+        
+        new_matches = all_matches[processed_count:]
+        
+        if not new_matches:
+            logger.info("✅ Ratings are up to date - no new matches since checkpoint")
+            return True
+        
+        logger.info(f"📊 Applying {len(new_matches)} new matches on top of checkpoint")
+        
+        profile_ratings = self.get_all_player_ratings()
+        if not profile_ratings:
+            logger.error("❌ Failed to get player ratings")
+            return False
+        
+        player_ratings = store_from_checkpoint(checkpoint, list(profile_ratings),
+                                               self.default_rating, self.default_rd)
+        new_players = [pid for pid in player_ratings.player_ids if pid not in checkpoint['ratings']]
+        
+        encoded, skipped_matches = encode_matches(
+            new_matches, player_ratings, current_date,
+            self.half_life_days, self.min_time_weight
+        )
+        if skipped_matches:
+            logger.info(f"⚠️  Skipping {len(skipped_matches)} matches with missing players")
+        
+        try:
+            if self.engine == 'wave':
+                run_wave_pass(encoded, build_match_waves(encoded.players, encoded.genders),
+                              player_ratings, self.glicko_calc, self.volatility)
+            else:
+                run_sequential_pass(encoded, player_ratings, self.glicko_calc, self.volatility)
+        except Exception as e:
+            logger.error(f"❌ Error applying new matches: {e}")
+            return False
+        
+        # Only players in new matches (and newly created players) changed
+        changed_ids = set(touched_players(player_ratings, encoded.players)) | set(new_players)
+        all_ratings = player_ratings.to_player_ratings()
+        changed_ratings = {pid: all_ratings[pid] for pid in all_ratings if pid in changed_ids}
+        logger.info(f"💾 Saving {len(changed_ratings)} changed player ratings to database...")
+        success = self.update_all_ratings_batch(changed_ratings, csv_ratings=all_ratings)
+        
+        if success:
+            self.save_rating_checkpoint(checkpoint_path, player_ratings, all_matches)
+        
+        return success
+    
+    def calculate_all_ratings_iterative(self, num_passes: int = 10, carry_over: bool = None,
+                                        rd_reinflation: float = None, tolerance: float = None,
+                                        checkpoint_path: str = None) -> bool:
+        """
+        Calculate ratings with multiple iterative passes.
+        
+        Args:
+            num_passes: Maximum number of passes over the match history
+            carry_over: Start each pass from the previous pass's ratings instead of
+                the defaults (defaults to CARRY_OVER_PASSES)
+            rd_reinflation: RD added back (in quadrature, capped at default_rd) before
+                each carried-over pass; 0 disables (defaults to PASS_RD_REINFLATION)
+            tolerance: Stop once no rating moves more than this in a pass
+                (defaults to CONVERGENCE_TOLERANCE)
+            checkpoint_path: If set, save a checkpoint for incremental runs on success
+        """
+        carry_over = self.carry_over_passes if carry_over is None else carry_over
+        rd_reinflation = self.pass_rd_reinflation if rd_reinflation is None else rd_reinflation
+        tolerance = self.convergence_tolerance if tolerance is None else tolerance
+        
+        if not carry_over and num_passes > 1:
+            # Every pass would restart from defaults and replay the same matches
+            logger.info(f"💡 Passes without carry-over are identical - running 1 pass instead of {num_passes}")
+            num_passes = 1
+        
+        logger.info(f"🚀 Starting iterative rating calculation with up to {num_passes} passes...")
         
         # Get all matches once
         all_matches = self.get_all_matches()
@@ -596,34 +812,41 @@ class RatingCalculator:
         logger.info(f"📊 Retrieved {len(all_matches)} total matches")
         
         # Initialize player ratings
-        player_ratings = self.get_all_player_ratings()
-        if not player_ratings:
+        profile_ratings = self.get_all_player_ratings()
+        if not profile_ratings:
             logger.error("❌ Failed to get player ratings")
             return False
         
-        # Filter matches to only include those with all players in our system
-        valid_matches = []
-        for match in all_matches:
-            player_ids = [
-                match['team1_player1_id'],
-                match['team1_player2_id'],
-                match['team2_player1_id'],
-                match['team2_player2_id']
-            ]
-            if all(pid in player_ratings for pid in player_ids):
-                valid_matches.append(match)
+        player_ratings = RatingStore.from_player_ratings(
+            profile_ratings, self.default_rating, self.default_rd
+        )
         
-        logger.info(f"📊 Found {len(valid_matches)} valid matches with all players in system")
-        logger.info(f"⚠️  Skipping {len(all_matches) - len(valid_matches)} matches with missing players")
+        # Get current date for time weighting (timezone-aware)
+        from datetime import timezone
+        current_date = datetime.now(timezone.utc)
         
-        matches = valid_matches
+        # Encode matches once: player indices, rating pool, winner and time weight.
+        # Matches with players missing from our system are skipped here.
+        encoded, skipped_matches = encode_matches(
+            all_matches, player_ratings, current_date,
+            self.half_life_days, self.min_time_weight
+        )
         
-        # Track convergence
+        logger.info(f"📊 Found {len(encoded)} valid matches with all players in system")
+        logger.info(f"⚠️  Skipping {len(skipped_matches)} matches with missing players")
+        
+        # Schedule matches into conflict-free waves for the batch engine
+        waves = []
+        if self.engine == 'wave':
+            waves = build_match_waves(encoded.players, encoded.genders)
+            logger.info(f"🌊 Scheduled {len(encoded)} matches into {len(waves)} conflict-free waves "
+                       f"(avg {len(encoded) / max(len(waves), 1):.1f} matches per wave)")
+        
+        # Track convergence over the rating slots that actually play matches
         pass_results = []
+        active_slots = np.zeros_like(player_ratings.ratings, dtype=bool)
+        active_slots[encoded.genders[:, None], encoded.players] = True
         
-        # Get current date for time weighting (timezone-aware)
-        from datetime import timezone
-        current_date = datetime.now(timezone.utc)
         logger.info(f"⏰ Using time weighting with {self.half_life_days}-day half-life from {current_date.strftime('%Y-%m-%d')}")
         
         # Show example weights for different time periods
@@ -638,124 +861,85 @@ class RatingCalculator:
         for days, weight in example_weights:
             logger.info(f"   • {days} days ago: {weight:.3f} weight")
         
+        if carry_over:
+            logger.info(f"🔁 Carrying ratings between passes (RD re-inflation: {rd_reinflation}, "
+                       f"tolerance: {tolerance})")
+        
         # Run multiple passes
         for pass_num in range(1, num_passes + 1):
             logger.info(f"\n🔄 PASS {pass_num}/{num_passes} starting...")
             
-            # Reset ratings to defaults at start of each pass
-            for player_id in player_ratings:
-                player_ratings[player_id]['mens_rating'] = self.default_rating
-                player_ratings[player_id]['mens_rating_deviation'] = self.default_rd
-                player_ratings[player_id]['womens_rating'] = self.default_rating
-                player_ratings[player_id]['womens_rating_deviation'] = self.default_rd
+            if pass_num == 1 or not carry_over:
+                # Start from default ratings
+                player_ratings.reset(self.default_rating, self.default_rd)
+            elif rd_reinflation > 0:
+                player_ratings.reinflate_rds(rd_reinflation, self.default_rd)
             
-            # Process all matches for this pass
-            pass_processed = 0
-            pass_errors = 0
+            previous_ratings = player_ratings.ratings.copy()
             
-            for idx, match in enumerate(matches):
-                if self.process_match_memory(match, player_ratings, current_date):
-                    pass_processed += 1
+            # Process all matches for this pass. A failed pass leaves ratings
+            # half-updated, so nothing is written and no checkpoint is saved.
+            try:
+                if self.engine == 'wave':
+                    pass_processed = run_wave_pass(encoded, waves, player_ratings,
+                                                   self.glicko_calc, self.volatility)
                 else:
-                    pass_errors += 1
-                
-                # Progress update every 1000 matches
-                if (idx + 1) % 1000 == 0:
-                    logger.info(f"   Pass {pass_num} progress: {idx + 1}/{len(matches)} "
-                               f"({(idx + 1)/len(matches)*100:.1f}%)")
+                    pass_processed = run_sequential_pass(encoded, player_ratings,
+                                                         self.glicko_calc, self.volatility)
+            except Exception as e:
+                logger.error(f"❌ Error in pass {pass_num}: {e} - no ratings were saved")
+                return False
+            
+            # Measure how far ratings moved during this pass
+            deltas = np.abs(player_ratings.ratings - previous_ratings)[active_slots]
+            max_delta = float(deltas.max()) if deltas.size else 0.0
+            mean_delta = float(deltas.mean()) if deltas.size else 0.0
+            converged = carry_over and pass_num > 1 and max_delta <= tolerance
             
             pass_results.append({
                 'pass': pass_num,
                 'processed': pass_processed,
-                'errors': pass_errors
+                'max_delta': max_delta,
+                'mean_delta': mean_delta,
+                'converged': converged
             })
             
-            logger.info(f"✅ Pass {pass_num} complete: {pass_processed} matches processed, {pass_errors} errors")
+            logger.info(f"✅ Pass {pass_num} complete: {pass_processed} matches processed "
+                       f"(max Δ {max_delta:.1f}, mean Δ {mean_delta:.2f})")
+            
+            if converged:
+                logger.info(f"🎯 Converged after {pass_num} passes (max Δ {max_delta:.1f} <= {tolerance})")
+                break
         
         # Update database with final ratings
         logger.info("\n💾 Saving final ratings to database...")
-        success = self.update_all_ratings_batch(player_ratings)
+        success = self.update_all_ratings_batch(player_ratings.to_player_ratings())
+        
+        if success and checkpoint_path:
+            self.save_rating_checkpoint(checkpoint_path, player_ratings, all_matches)
         
         # Show pass summary
         logger.info("\n📈 Pass Summary:")
         for result in pass_results:
-            logger.info(f"   Pass {result['pass']}: {result['processed']} matches processed, {result['errors']} errors")
+            logger.info(f"   Pass {result['pass']}: {result['processed']} matches processed, "
+                       f"max Δ {result['max_delta']:.1f}, mean Δ {result['mean_delta']:.2f}"
+                       f"{' (converged)' if result['converged'] else ''}")
         
         return success
     
-    def get_database_stats(self) -> Dict:
-        """Get database statistics with pagination to get accurate counts."""
+    def get_database_stats(self, refresh: bool = False) -> Dict:
+        """Get database statistics from exact-count requests, cached until ratings are written."""
+        if self._stats_cache is not None and not refresh:
+            return self._stats_cache
+        
         try:
-            # Get matches count with pagination
-            total_matches = 0
-            offset = 0
-            page_size = 1000
-            
-            while True:
-                params = {
-                    'deleted_at': 'is.null',
-                    'select': 'id',
-                    'offset': str(offset),
-                    'limit': str(page_size)
-                }
-                matches_page = self.get_data('matches', params)
-                
-                if not matches_page:
-                    break
-                    
-                total_matches += len(matches_page)
-                
-                if len(matches_page) < page_size:
-                    break
-                    
-                offset += page_size
-            
-            # Get active players count with pagination
-            total_players = 0
-            offset = 0
-            
-            while True:
-                params = {
-                    'is_active': 'eq.true',
-                    'select': 'id',
-                    'offset': str(offset),
-                    'limit': str(page_size)
-                }
-                players_page = self.get_data('profiles', params)
-                
-                if not players_page:
-                    break
-                    
-                total_players += len(players_page)
-                
-                if len(players_page) < page_size:
-                    break
-                    
-                offset += page_size
-            
-            # Get players with custom ratings with pagination
-            total_custom_players = 0
-            offset = 0
-            
-            while True:
-                params = {
-                    'is_active': 'eq.true',
-                    'mens_rating': f'neq.{self.default_rating}',
-                    'select': 'id',
-                    'offset': str(offset),
-                    'limit': str(page_size)
-                }
-                custom_page = self.get_data('profiles', params)
-                
-                if not custom_page:
-                    break
-                    
-                total_custom_players += len(custom_page)
-                
-                if len(custom_page) < page_size:
-                    break
-                    
-                offset += page_size
+            # Counts come from Content-Range headers - no rows are downloaded
+            total_matches = self.count_rows('matches', {'deleted_at': 'is.null'})
+            total_players = self.count_rows('profiles', {'is_active': 'eq.true'})
+            total_custom_players = self.count_rows('profiles', {
+                'is_active': 'eq.true',
+                'mens_rating': f'neq.{self.default_rating}'
+            })
             
             # Get date range (just first and last, no need for pagination)
             first_match = self.get_data('matches', {
@@ -775,13 +959,14 @@ class RatingCalculator:
             earliest_date = first_match[0]['played_at'] if first_match else None
             latest_date = last_match[0]['played_at'] if last_match else None
             
-            return {
+            self._stats_cache = {
                 'total_matches': total_matches,
                 'total_players': total_players, 
                 'players_with_custom_ratings': total_custom_players,
                 'earliest_match': earliest_date,
                 'latest_match': latest_date
             }
+            return self._stats_cache
         except Exception as e:
             logger.error(f"❌ Error getting stats: {e}")
             return {}
@@ -841,14 +1026,16 @@ class RatingCalculator:
 
 def main():
     """Main entry point."""
-    # Check for --production flag
+    # Check for --production and --incremental flags
     use_production = '--production' in sys.argv
+    incremental = '--incremental' in sys.argv
     
-    if len(sys.argv) > 1 and sys.argv[1] not in ['--production']:
-        print("Usage: python simple_rating_calc.py [--production]")
+    if any(arg not in ['--production', '--incremental'] for arg in sys.argv[1:]):
+        print("Usage: python simple_rating_calc.py [--production] [--incremental]")
         print("\nExamples:")
         print("  Development: python simple_rating_calc.py")
         print("  Production:  python simple_rating_calc.py --production")
+        print("  Incremental: python simple_rating_calc.py --incremental")
         return
     
     print("🏐 Sand Volleyball Rating Calculator (Iterative)\n")
@@ -862,12 +1049,18 @@ def main():
     # Show initial stats
     calc.print_stats("Initial Statistics")
     
-    # Don't reset ratings - the iterative method handles this internally
-    print("\n🔄 Starting 10-pass iterative rating calculation...")
-    print("💡 This will take some time but produce more accurate ratings\n")
-    
-    # Calculate all ratings with 10 passes
-    success = calc.calculate_all_ratings_iterative(num_passes=10)
+    if incremental:
+        # Apply only new matches on top of the last checkpoint
+        print("\n⚡ Starting incremental rating calculation from checkpoint...\n")
+        success = calc.calculate_ratings_incremental(calc.checkpoint_file, num_passes=10)
+    else:
+        # Don't reset ratings - the iterative method handles this internally
+        if calc.carry_over_passes:
+            print("\n🔄 Starting iterative rating calculation (up to 10 carried-over passes)...\n")
+        else:
+            print("\n🔄 Starting rating calculation (1 pass - set CARRY_OVER_PASSES for iterative passes)...\n")
+        
+        success = calc.calculate_all_ratings_iterative(num_passes=10, checkpoint_path=calc.checkpoint_file)
     
     # Show final stats
     calc.print_stats("Final Statistics")
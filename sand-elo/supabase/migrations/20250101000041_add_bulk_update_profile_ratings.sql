@@ -0,0 +1,36 @@
+-- Bulk rating writer for the Python rating calculator
+-- Updates mens and womens ratings for a chunk of players in one statement
+-- instead of one PATCH request per player and gender.
+
+CREATE OR REPLACE FUNCTION bulk_update_profile_ratings(ratings JSONB)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    UPDATE profiles p
+    SET
+        mens_rating = r.mens_rating,
+        mens_rating_deviation = r.mens_rating_deviation,
+        womens_rating = r.womens_rating,
+        womens_rating_deviation = r.womens_rating_deviation
+    FROM jsonb_to_recordset(ratings) AS r(
+        id UUID,
+        mens_rating INTEGER,
+        mens_rating_deviation INTEGER,
+        womens_rating INTEGER,
+        womens_rating_deviation INTEGER
+    )
+    WHERE p.id = r.id;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$;
+
+-- Only the service role (used by the rating calculator) may overwrite ratings
+REVOKE EXECUTE ON FUNCTION bulk_update_profile_ratings(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION bulk_update_profile_ratings(JSONB) TO service_role;